@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Performance benchmarks, run with `python -m benchmarks.run`.
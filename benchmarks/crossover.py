@@ -0,0 +1,75 @@
+# benchmarks/crossover.py
+# Measures each engine at growing line sizes and derives the tiers of the
+# auto engine (AUTO_ENGINE_THRESHOLDS in the DI container).
+import json
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+import typer
+
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.infrastructure.cli.processing import to_operation_dto
+from capital_gains_calculator.infrastructure.di_container import ENGINES
+
+from .generator import generate_operations
+
+SEED = 20250101
+
+DEFAULT_SIZES = [1, 4, 16, 64, 256, 1024, 4096, 16384, 65536, 262144]
+
+# Operations timed per size and engine, so small lines are repeated.
+OPERATIONS_PER_MEASUREMENT = 100_000
+
+app = typer.Typer()
+
+
+def time_engine(engine_factory: Callable, operations: List, repeat: int) -> float:
+    """Best time of a line, in seconds, with a fresh calculator per line."""
+    runs = max(1, OPERATIONS_PER_MEASUREMENT // len(operations))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(runs):
+            PortfolioTaxCalculatorService(engine_factory).process(operations)
+        best = min(best, (time.perf_counter() - start) / runs)
+    return best
+
+
+def thresholds(timings: Dict[int, Dict[str, float]]) -> List[Tuple[int, str]]:
+    """The fastest engine from each size on, merging sizes with the same winner."""
+    tiers: List[Tuple[int, str]] = []
+    for size, by_engine in sorted(timings.items()):
+        fastest = min(by_engine, key=by_engine.get)
+        if not tiers or tiers[-1][1] != fastest:
+            tiers.append((0 if not tiers else size, fastest))
+    return tiers
+
+
+@app.command()
+def main(
+    sizes: List[int] = typer.Option(DEFAULT_SIZES, "--size", help="Line sizes."),
+    repeat: int = typer.Option(3, "--repeat", min=1),
+):
+    """Prints the time per line of every engine and the resulting thresholds."""
+    timings: Dict[int, Dict[str, float]] = {}
+    for size in sizes:
+        operations = [
+            to_operation_dto(op)
+            for op in generate_operations(random.Random(SEED + size), size)
+        ]
+        timings[size] = {}
+        for name, engine_factory in ENGINES.items():
+            try:
+                timings[size][name] = time_engine(engine_factory, operations, repeat)
+            except ImportError:  # Optional dependency not installed
+                continue
+        typer.echo(
+            f"{size}: "
+            + ", ".join(f"{k}={v * 1e6:.1f}us" for k, v in timings[size].items())
+        )
+    typer.echo(json.dumps({"thresholds": thresholds(timings)}))
+
+
+if __name__ == "__main__":
+    app()
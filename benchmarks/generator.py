@@ -0,0 +1,113 @@
+# benchmarks/generator.py
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Sells whose total value is at or below this are exempt from tax.
+EXEMPTION_LIMIT = 20000.00
+
+
+@dataclass(frozen=True)
+class WorkloadMix:
+    """Probabilities that shape a synthetic operation stream."""
+
+    # Probability that an operation is a sell (when there are shares to sell).
+    sell_ratio: float = 0.4
+    # Probability that a sell is kept small enough to be tax exempt.
+    exempt_ratio: float = 0.5
+    # Probability, per operation, that the price enters a crash that produces
+    # a chain of loss-making sells carried into later profits.
+    crash_ratio: float = 0.02
+    # Probability that a sell liquidates the whole position, resetting the
+    # weighted average cost on the next buy.
+    liquidation_ratio: float = 0.05
+
+
+DEFAULT_MIX = WorkloadMix()
+
+
+def generate_operations(
+    rng: random.Random, count: int, mix: WorkloadMix = DEFAULT_MIX
+) -> List[Dict[str, Any]]:
+    """Generates a list of operations (see `iter_operations`)."""
+    return list(iter_operations(rng, count, mix))
+
+
+def iter_operations(
+    rng: random.Random, count: int, mix: WorkloadMix = DEFAULT_MIX
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generates a realistic stream of operations: the price follows a random
+    walk with occasional crashes, sells never exceed the position and their
+    size is chosen to be either exempt or taxable.
+    """
+    price = rng.uniform(5.0, 100.0)
+    shares = 0
+    crash_left = 0
+    for _ in range(count):
+        if crash_left:
+            price *= rng.uniform(0.85, 0.95)
+            crash_left -= 1
+        elif rng.random() < mix.crash_ratio:
+            crash_left = rng.randint(2, 6)
+        else:
+            price *= rng.uniform(0.97, 1.031)
+        price = min(max(price, 0.5), 50000.0)
+        unit_cost = round(price, 2)
+
+        if shares and (crash_left or rng.random() < mix.sell_ratio):
+            quantity = _sell_quantity(rng, shares, unit_cost, mix)
+            shares -= quantity
+            yield _operation("sell", unit_cost, quantity)
+        else:
+            quantity = rng.randint(1, max(1, int(100000 / unit_cost)))
+            shares += quantity
+            yield _operation("buy", unit_cost, quantity)
+
+
+def _sell_quantity(
+    rng: random.Random, shares: int, unit_cost: float, mix: WorkloadMix
+) -> int:
+    if rng.random() < mix.liquidation_ratio:
+        return shares
+    exempt_max = int(EXEMPTION_LIMIT / unit_cost)
+    if rng.random() < mix.exempt_ratio and exempt_max >= 1:
+        return rng.randint(1, min(shares, exempt_max))
+    return rng.randint(min(shares, exempt_max + 1), shares)
+
+
+def _operation(operation: str, unit_cost: float, quantity: int) -> Dict[str, Any]:
+    return {"operation": operation, "unit-cost": unit_cost, "quantity": quantity}
+
+
+def generate_lines(
+    seed: int, line_count: int, operations_per_line: int, mix: WorkloadMix = DEFAULT_MIX
+) -> Iterator[str]:
+    """Yields JSON input lines; the same seed always yields the same lines."""
+    rng = random.Random(seed)
+    for _ in range(line_count):
+        yield json.dumps(generate_operations(rng, operations_per_line, mix))
+
+
+def write_input(
+    path: Path,
+    seed: int,
+    line_count: int,
+    operations_per_line: int,
+    mix: WorkloadMix = DEFAULT_MIX,
+):
+    """
+    Writes an input file in the stdin format, ending with an empty line. Lines
+    are written one operation at a time, so very long lines fit in memory.
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        for _ in range(line_count):
+            separator = "["
+            for operation in iter_operations(rng, operations_per_line, mix):
+                file.write(separator + json.dumps(operation))
+                separator = ", "
+            file.write("]\n" if separator == ", " else "[]\n")
+        file.write("\n")
@@ -0,0 +1,100 @@
+# benchmarks/load_client.py
+# Load-test client for `python -m capital_gains_calculator serve`.
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+
+from .generator import generate_lines
+
+app = typer.Typer()
+
+
+async def _open(socket_path: Optional[Path], host: str, port: int):
+    if socket_path is not None:
+        return await asyncio.open_unix_connection(str(socket_path))
+    return await asyncio.open_connection(host, port)
+
+
+async def _run_connection(
+    socket_path: Optional[Path],
+    host: str,
+    port: int,
+    lines: List[str],
+    latencies: List[float],
+):
+    """Sends the lines one request at a time, timing each round trip."""
+    reader, writer = await _open(socket_path, host, port)
+    for line in lines:
+        start = time.perf_counter()
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"\n")
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(
+    socket_path: Optional[Path],
+    host: str,
+    port: int,
+    connections: int,
+    requests: int,
+    operations: int,
+    seed: int = 1,
+) -> Dict[str, float]:
+    """Runs concurrent connections and returns throughput and latency figures."""
+    lines = list(generate_lines(seed, requests, operations))
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _run_connection(socket_path, host, port, lines, latencies)
+            for _ in range(connections)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p90": _percentile(latencies, 90),
+        "latency_p99": _percentile(latencies, 99),
+    }
+
+
+def _percentile(sorted_values: List[float], percent: int) -> float:
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+@app.command()
+def main(
+    socket_path: Optional[Path] = typer.Option(None, "--socket"),
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(8765, "--port"),
+    connections: int = typer.Option(8, "--connections", min=1),
+    requests: int = typer.Option(
+        1000, "--requests", min=1, help="Requests sent by each connection."
+    ),
+    operations: int = typer.Option(
+        10, "--operations", min=1, help="Operations per request line."
+    ),
+):
+    """Measures requests per second and latency percentiles of a running server."""
+    report = asyncio.run(
+        run_load(socket_path, host, port, connections, requests, operations)
+    )
+    typer.echo(json.dumps(report))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,218 @@
+# benchmarks/run.py
+# Times each stage of the CLI pipeline on synthetic workloads and compares
+# the results with a stored baseline.
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import typer
+
+from capital_gains_calculator.infrastructure.cli.encoding import encode_results
+from capital_gains_calculator.infrastructure.cli.processing import (
+    parse_line,
+    read_lines,
+)
+from capital_gains_calculator.infrastructure.di_container import AppContainer, Engine
+
+from .generator import write_input
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baseline.json"
+DATA_DIR = BENCHMARKS_DIR / ".data"
+
+SEED = 20250101
+
+# Scenario name -> (line count, operations per line).
+SUITES: Dict[str, Dict[str, Tuple[int, int]]] = {
+    "quick": {
+        "1-line-1-op": (1, 1),
+        "1000-lines-10-ops": (1000, 10),
+        "10000-lines-10-ops": (10_000, 10),
+        "1-line-100k-ops": (1, 100_000),
+    },
+    "full": {
+        "1-line-1-op": (1, 1),
+        "1000-lines-10-ops": (1000, 10),
+        "100k-lines-10-ops": (100_000, 10),
+        "1m-lines-10-ops": (1_000_000, 10),
+        "1-line-100k-ops": (1, 100_000),
+        "1-line-1m-ops": (1, 1_000_000),
+        "1-line-10m-ops": (1, 10_000_000),
+    },
+}
+
+# Timed stages, plus "memory": the peak traced memory of parse and execute.
+STAGES = ("parse", "execute", "format", "cli", "memory")
+
+# Differences below these are measurement noise and never count as regressions.
+MIN_REGRESSION_SECONDS = 0.005
+MIN_REGRESSION_BYTES = 1024 * 1024
+
+app = typer.Typer()
+
+
+def input_file(scenario: str, line_count: int, operations_per_line: int) -> Path:
+    """Returns the generated input of a scenario, generating it on first use."""
+    path = DATA_DIR / f"{scenario}-{SEED}.txt"
+    if not path.exists():
+        DATA_DIR.mkdir(exist_ok=True)
+        write_input(path, SEED, line_count, operations_per_line)
+    return path
+
+
+def time_in_process_stages(path: Path, engine: Engine) -> Dict[str, float]:
+    """Runs the pipeline line by line, accumulating the time of each stage."""
+    container = AppContainer()
+    container.config.engine.from_value(engine.value)
+    clock = time.perf_counter
+    totals = {"parse": 0.0, "execute": 0.0, "format": 0.0}
+    with open(path) as file:
+        for line in read_lines(file):
+            start = clock()
+            operations_dto = parse_line(line)
+            parsed = clock()
+            tax_results_dto = container.calculate_taxes_use_case().execute(
+                operations_dto
+            )
+            executed = clock()
+            encode_results(tax_results_dto)
+            formatted = clock()
+            totals["parse"] += parsed - start
+            totals["execute"] += executed - parsed
+            totals["format"] += formatted - executed
+    return totals
+
+
+def measure_peak_memory(path: Path, engine: Engine) -> int:
+    """Peak memory traced while parsing and executing the lines, in bytes."""
+    container = AppContainer()
+    container.config.engine.from_value(engine.value)
+    tracemalloc.start()
+    try:
+        with open(path) as file:
+            for line in read_lines(file):
+                operations_dto = parse_line(line)
+                container.calculate_taxes_use_case().execute(operations_dto)
+                del operations_dto
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_cli(path: Path, engine: Engine) -> float:
+    """Times a full run of the CLI in a subprocess."""
+    args = [] if engine is Engine.REFERENCE else ["--engine", engine.value]
+    with open(path) as stdin:
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "capital_gains_calculator", *args],
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        return time.perf_counter() - start
+
+
+def best_of(repeat: int, measure: Callable[[], Dict[str, float]]) -> Dict[str, float]:
+    """Keeps the fastest time of each stage over several repetitions."""
+    measure()  # Warm-up run: first-use imports and caches are not timed.
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        for stage, seconds in measure().items():
+            best[stage] = min(seconds, best.get(stage, seconds))
+    return best
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """Returns a description of every stage worse than baseline * (1 + tolerance)."""
+    regressions = []
+    for scenario, stages in results.items():
+        for stage, value in stages.items():
+            reference = baseline.get(scenario, {}).get(stage)
+            if stage not in STAGES or not reference:
+                continue
+            unit, noise = (
+                ("B", MIN_REGRESSION_BYTES)
+                if stage == "memory"
+                else (
+                    "s",
+                    MIN_REGRESSION_SECONDS,
+                )
+            )
+            if value > reference * (1 + tolerance) and value - reference > noise:
+                regressions.append(
+                    f"{scenario} {stage}: {value:.4g}{unit} vs {reference:.4g}{unit} "
+                    f"baseline (+{value / reference - 1:.0%})"
+                )
+    return regressions
+
+
+@app.command()
+def main(
+    suite: str = typer.Option("quick", "--suite", help="quick or full."),
+    engine: Engine = typer.Option(Engine.REFERENCE, "--engine"),
+    stages: List[str] = typer.Option(list(STAGES), "--stage", help="Stages to time."),
+    repeat: int = typer.Option(3, "--repeat", min=1),
+    baseline_path: Path = typer.Option(DEFAULT_BASELINE, "--baseline"),
+    tolerance: float = typer.Option(
+        0.25, "--tolerance", help="Allowed slowdown over the baseline (0.25 = 25%)."
+    ),
+    update_baseline: bool = typer.Option(
+        False, "--update-baseline", help="Stores the results as the new baseline."
+    ),
+    output: Optional[Path] = typer.Option(None, "--output", help="Writes the results."),
+):
+    """Benchmarks the pipeline stages and checks them against the baseline."""
+    if suite not in SUITES:
+        raise typer.BadParameter(f"Unknown suite {suite!r}.")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for scenario, (line_count, operations_per_line) in SUITES[suite].items():
+        path = input_file(scenario, line_count, operations_per_line)
+        measured: Dict[str, float] = {}
+        if {"parse", "execute", "format"} & set(stages):
+            in_process = best_of(repeat, lambda: time_in_process_stages(path, engine))
+            measured.update({s: in_process[s] for s in stages if s in in_process})
+        if "cli" in stages:
+            measured.update(best_of(repeat, lambda: {"cli": time_cli(path, engine)}))
+        in_process_seconds = sum(v for s, v in measured.items() if s != "cli")
+        total_seconds = in_process_seconds or measured.get("cli", 0.0)
+        if total_seconds:
+            operations = line_count * operations_per_line
+            measured["operations_per_second"] = operations / total_seconds
+        if "memory" in stages:
+            measured["memory"] = measure_peak_memory(path, engine)
+        results[scenario] = measured
+        typer.echo(
+            f"{scenario}: " + ", ".join(f"{k}={v:.4g}" for k, v in measured.items())
+        )
+
+    if output:
+        output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        typer.echo(f"Baseline written to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        typer.echo(f"No baseline at {baseline_path}; run with --update-baseline.")
+        return
+    regressions = compare(results, json.loads(baseline_path.read_text()), tolerance)
+    for regression in regressions:
+        typer.echo(f"REGRESSION {regression}", err=True)
+    if regressions:
+        raise typer.Exit(code=1)
+    typer.echo("No regressions.")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,15 +1,52 @@
 # src/capital_gains_calculator/__main__.py
-from .infrastructure.cli import main as cli_main
-from .infrastructure.di_container import AppContainer
+import os
+import sys
+
+# Mirrors infrastructure.profiling.PROFILE_ENV_VAR, without importing it.
+_PROFILE_ENV_VAR = "CAPITAL_GAINS_PROFILE"
 
 
 def main():
-    """Entry point that initializes the container and the CLI application."""
+    """
+    Entry point of the application.
+
+    A plain run (no command-line arguments) takes a lean path that builds the
+    use case directly. The CLI framework and the DI container are only
+    imported when arguments are given, since importing and wiring them costs
+    more than processing a typical input.
+    """
+    if len(sys.argv) > 1 or os.environ.get(_PROFILE_ENV_VAR, "") not in ("", "0"):
+        _run_cli()
+    else:
+        _run_lean()
+
+
+def _run_cli():
+    """Initializes the container and the CLI application."""
+    from .infrastructure.cli import main as cli_main
+    from .infrastructure.di_container import AppContainer
+
     container = AppContainer()
     container.wire(modules=[cli_main])
 
     cli_main.app()
 
 
+def _run_lean():
+    """Processes stdin with the default engine, without Typer or the container."""
+    from .application.use_cases import CalculateTaxesFromOperationsUseCase
+    from .domain.portfolio import PortfolioTaxCalculatorService
+    from .domain.services import TaxCalculatorService
+    from .infrastructure.cli.encoding import OutputEncoder
+    from .infrastructure.cli.processing import process_line_into, read_lines
+
+    with OutputEncoder(sys.stdout.buffer) as encoder:
+        for line in read_lines(sys.stdin):
+            use_case = CalculateTaxesFromOperationsUseCase(
+                PortfolioTaxCalculatorService(TaxCalculatorService)
+            )
+            process_line_into(line, use_case, encoder)
+
+
 if __name__ == "__main__":
     main()
@@ -1,19 +1,16 @@
 # src/capital_gains_calculator/application/dtos.py
-from dataclasses import dataclass
-from decimal import Decimal
+from ..domain.models import Operation, PositionSnapshot, TaxResult, TaxSummary
 
+# DTO for a single operation coming from the infrastructure layer. The domain
+# record is immutable and slotted, so it crosses the application boundary as is
+# rather than being copied field by field into a twin class.
+OperationDTO = Operation
 
-@dataclass(frozen=True)
-class OperationDTO:
-    """DTO for a single operation coming from the infrastructure layer."""
+# DTO for a single tax result to be sent to the infrastructure layer.
+TaxResultDTO = TaxResult
 
-    operation: str
-    unit_cost: Decimal
-    quantity: int
+# DTO for the state of one stock, exported and restored between sessions.
+PositionSnapshotDTO = PositionSnapshot
 
-
-@dataclass(frozen=True)
-class TaxResultDTO:
-    """DTO for a single tax result to be sent to the infrastructure layer."""
-
-    tax: Decimal
+# DTO for the totals of a list of operations (summary output).
+TaxSummaryDTO = TaxSummary
@@ -1,7 +1,7 @@
 # src/capital_gains_calculator/application/use_cases/__init__.py
 
 # Exposes use case classes so they can be imported from the package
-from .calculate_taxes_from_operations import \
-    CalculateTaxesFromOperationsUseCase
+from .calculate_taxes_from_operations import CalculateTaxesFromOperationsUseCase
+from .evaluate_tax_scenarios import EvaluateTaxScenariosUseCase
 
-__all__ = ["CalculateTaxesFromOperationsUseCase"]
+__all__ = ["CalculateTaxesFromOperationsUseCase", "EvaluateTaxScenariosUseCase"]
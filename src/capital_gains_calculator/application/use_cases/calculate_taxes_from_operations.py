@@ -1,8 +1,7 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from ...domain.models import Operation
 from ...domain.services import TaxCalculatorService
-from ..dtos import OperationDTO, TaxResultDTO
+from ..dtos import OperationDTO, PositionSnapshotDTO, TaxResultDTO, TaxSummaryDTO
 
 
 class CalculateTaxesFromOperationsUseCase:
@@ -14,14 +13,33 @@ class CalculateTaxesFromOperationsUseCase:
         """
         Orchestrates data conversion and calls the domain service.
         """
-        # 1. Converts application DTOs to domain Models
-        operations_domain = [
-            Operation(op.operation, op.unit_cost, op.quantity) for op in operations_dto
-        ]
+        # The DTOs are the (immutable) domain records themselves, so they are
+        # handed to the domain service and returned without being copied.
+        return self.tax_calculator.process(operations_dto)
 
-        # 2. Calls the domain service for the ACTUAL business logic
-        tax_results_domain = self.tax_calculator.process(operations_domain)
+    def execute_stream(
+        self, operations_dto: Iterable[OperationDTO]
+    ) -> Iterator[TaxResultDTO]:
+        """
+        Streaming variant of `execute`: operations are processed one at a time,
+        so no intermediate list is built.
+        """
+        return self.tax_calculator.iter_process(operations_dto)
+
+    def execute_summary(self, operations_dto: Iterable[OperationDTO]) -> TaxSummaryDTO:
+        """
+        Summary variant of `execute`: the taxes are added up as they are
+        computed and only the totals and final positions are returned.
+        """
+        return self.tax_calculator.summarize(operations_dto)
+
+    def snapshot(self) -> Dict[Optional[str], PositionSnapshotDTO]:
+        """
+        Exports the state reached so far (one position per ticker), so a later
+        session can resume from it and only process new operations.
+        """
+        return self.tax_calculator.snapshot()
 
-        # 3. Converts domain results back to DTOs
-        tax_results_dto = [TaxResultDTO(tax=res.tax) for res in tax_results_domain]
-        return tax_results_dto
+    def restore(self, snapshot: Dict[Optional[str], PositionSnapshotDTO]):
+        """Resumes a session from the state exported by `snapshot`."""
+        self.tax_calculator.restore(snapshot)
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING, List, Tuple
+
+from ..dtos import OperationDTO
+
+if TYPE_CHECKING:  # Not imported at run time, to keep start-up lean
+    from ...domain.scenarios import np, ScenarioTaxCalculatorService
+
+
+class EvaluateTaxScenariosUseCase:
+    def __init__(self, scenario_calculator: "ScenarioTaxCalculatorService"):
+        # Receives the domain service as a dependency
+        self.scenario_calculator = scenario_calculator
+
+    def execute(
+        self, operations_dto: List[OperationDTO], unit_costs: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Returns the tax matrix of the operations: one row per unit-cost
+        scenario, one column per operation.
+        """
+        return self.scenario_calculator.process(operations_dto, unit_costs)
+
+    def execute_summary(
+        self, operations_dto: List[OperationDTO], unit_costs: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Returns the total tax and the number of taxed sells of each scenario."""
+        return self.scenario_calculator.summarize(operations_dto, unit_costs)
@@ -0,0 +1,82 @@
+# src/capital_gains_calculator/domain/auto.py
+from collections.abc import Sized
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import PositionSnapshot
+
+
+def _operation_count(operations: Iterable) -> int:
+    """Streamed operations have no length; they count as a small line."""
+    return len(operations) if isinstance(operations, Sized) else 0
+
+
+def tier_engines(
+    operation_count: int, thresholds: Sequence[Tuple[int, str]]
+) -> List[str]:
+    """The engines of the tiers a line reaches, from the largest tier down."""
+    return [
+        engine
+        for minimum, engine in sorted(thresholds, reverse=True)
+        if operation_count >= minimum
+    ]
+
+
+class AutoTaxCalculatorService:
+    """
+    Calculator that picks the engine of a line from its number of operations.
+    `thresholds` lists (minimum operations, engine name) pairs: a line uses
+    the engine with the largest minimum it reaches. Every line gets its own
+    calculator, so the engine is picked on the first call and kept for the
+    rest of the line. Engines that cannot be created (e.g. a missing optional
+    dependency) give way to the engine of the next smaller tier.
+    """
+
+    def __init__(
+        self,
+        calculator_factories: Dict[str, Callable[[], Any]],
+        thresholds: Sequence[Tuple[int, str]],
+    ):
+        self._calculator_factories = calculator_factories
+        self._thresholds = thresholds
+        self._calculator = None
+        self._restored: Optional[Dict[Optional[str], PositionSnapshot]] = None
+        self.engine: Optional[str] = None
+
+    def process(self, operations):
+        """Processes a list of operations on the engine for its size."""
+        return self._select(len(operations)).process(operations)
+
+    def iter_process(self, operations):
+        """Lazily yields the results, on the engine of the smallest lines."""
+        return self._select(_operation_count(operations)).iter_process(operations)
+
+    def summarize(self, operations):
+        """Folds the operations into totals on the engine for their size."""
+        return self._select(_operation_count(operations)).summarize(operations)
+
+    def snapshot(self) -> Dict[Optional[str], PositionSnapshot]:
+        """Returns the position of every symbol seen so far, by ticker."""
+        return self._select(0).snapshot()
+
+    def restore(self, snapshots: Dict[Optional[str], PositionSnapshot]):
+        """Continues the calculation from the positions of a snapshot."""
+        if self._calculator is None:  # Applied once the engine is picked
+            self._restored = snapshots
+        else:
+            self._calculator.restore(snapshots)
+
+    def _select(self, operation_count: int):
+        if self._calculator is not None:
+            return self._calculator
+        error: Optional[ImportError] = None
+        for engine in tier_engines(operation_count, self._thresholds):
+            try:
+                self._calculator = self._calculator_factories[engine]()
+            except ImportError as import_error:
+                error = import_error
+                continue
+            self.engine = engine
+            if self._restored is not None:
+                self._calculator.restore(self._restored)
+            return self._calculator
+        raise error or ValueError(f"No engine for {operation_count} operations.")
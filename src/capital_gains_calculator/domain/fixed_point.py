@@ -0,0 +1,183 @@
+# src/capital_gains_calculator/domain/fixed_point.py
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import Operation, PositionSnapshot, TaxResult, TaxSummary
+from .services import TAX_EXEMPTION_LIMIT, TAX_RATE, ZERO_TAX
+
+# Amounts are kept as ints scaled to cents plus extra digits of precision, so
+# the weighted average cost can be stored without a Decimal division. The extra
+# digits keep the rounding of the weighted average well below what is visible
+# in the float output, as with the 28 significant digits of the Decimal context.
+CENTS_DIGITS = 2
+EXTRA_PRECISION_DIGITS = 24
+SCALE_DIGITS = CENTS_DIGITS + EXTRA_PRECISION_DIGITS
+SCALE = 10**SCALE_DIGITS
+CENTS_SCALE = 10**EXTRA_PRECISION_DIGITS  # Scaled value of one cent
+
+TAX_EXEMPTION_LIMIT_SCALED = int(TAX_EXEMPTION_LIMIT * SCALE)
+TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR = TAX_RATE.as_integer_ratio()
+
+
+@lru_cache(maxsize=4096)
+def to_scaled(value: Decimal) -> int:
+    """Converts a Decimal amount into a scaled int (rounded half to even)."""
+    return int((value * SCALE).to_integral_value())
+
+
+def from_scaled(value: int) -> Decimal:
+    """Converts a scaled int back into a Decimal amount."""
+    return Decimal(value).scaleb(-SCALE_DIGITS)
+
+
+def to_exact_decimal(value: int) -> Decimal:
+    """Converts a scaled int into a Decimal with all of its digits."""
+    return Decimal(f"{value}E-{SCALE_DIGITS}")
+
+
+def from_exact_decimal(value: Decimal) -> int:
+    """Converts a Decimal of any precision into a scaled int."""
+    numerator, denominator = value.as_integer_ratio()
+    return divide(numerator * SCALE, denominator)
+
+
+def divide(numerator: int, denominator: int) -> int:
+    """Integer division rounded half to even, like the Decimal context."""
+    quotient, remainder = divmod(numerator, denominator)
+    doubled_remainder = 2 * remainder
+    if doubled_remainder > denominator or (
+        doubled_remainder == denominator and quotient % 2
+    ):
+        quotient += 1
+    return quotient
+
+
+class FixedPointTaxCalculatorService:
+    """
+    Drop-in replacement for TaxCalculatorService that does its arithmetic on
+    scaled ints instead of Decimals. Amounts are only converted to Decimal
+    when a non-zero tax is returned.
+    """
+
+    def __init__(self):
+        self.total_shares = 0
+        self.weighted_average_cost = 0
+        self.accumulated_loss = 0
+
+        # Handlers return the scaled tax of the operation, or None without one.
+        self._handlers: Dict[str, Callable[[Operation], Optional[int]]] = {
+            "buy": self._handle_buy,
+            "sell": self._handle_sell,
+        }
+
+    def _update_weighted_average_cost(self, bought_shares: int, buy_price: int):
+        current_total_cost = self.total_shares * self.weighted_average_cost
+        new_total_cost = bought_shares * buy_price
+        self.total_shares += bought_shares
+        if self.total_shares > 0:
+            self.weighted_average_cost = divide(
+                current_total_cost + new_total_cost, self.total_shares
+            )
+
+    def _handle_buy(self, op: Operation) -> None:
+        """Handles the logic for a buy operation."""
+        self._update_weighted_average_cost(op.quantity, to_scaled(op.unit_cost))
+
+    def _process_loss(self, loss: int) -> None:
+        """Processes a loss, adding it to the accumulated total."""
+        self.accumulated_loss -= loss
+
+    def _process_profit(self, profit: int, total_value: int) -> Optional[int]:
+        """Processes a profit, considering tax exemption and accumulated losses."""
+        if total_value <= TAX_EXEMPTION_LIMIT_SCALED:
+            return None
+
+        taxable_profit = profit - self.accumulated_loss
+        if taxable_profit <= 0:
+            self.accumulated_loss -= profit
+            return None
+
+        tax = divide(taxable_profit * TAX_RATE_NUMERATOR, TAX_RATE_DENOMINATOR)
+        self.accumulated_loss = 0
+        return tax
+
+    def _handle_sell(self, op: Operation) -> Optional[int]:
+        """Handles a sell operation, delegating to the profit/loss methods."""
+        return self._sell(to_scaled(op.unit_cost), op.quantity)
+
+    def _sell(self, unit_cost: int, quantity: int) -> Optional[int]:
+        profit_or_loss = (unit_cost - self.weighted_average_cost) * quantity
+        self.total_shares -= quantity
+
+        if profit_or_loss < 0:
+            return self._process_loss(profit_or_loss)
+        else:
+            return self._process_profit(profit_or_loss, unit_cost * quantity)
+
+    def snapshot(self) -> PositionSnapshot:
+        """Returns the current state, to resume the calculation later."""
+        return PositionSnapshot(
+            self.total_shares,
+            to_exact_decimal(self.weighted_average_cost),
+            to_exact_decimal(self.accumulated_loss),
+        )
+
+    def restore(self, snapshot: PositionSnapshot):
+        """Continues the calculation from a snapshot."""
+        self.total_shares = snapshot.total_shares
+        self.weighted_average_cost = from_exact_decimal(snapshot.weighted_average_cost)
+        self.accumulated_loss = from_exact_decimal(snapshot.accumulated_loss)
+
+    def process(self, operations: List[Operation]) -> List[TaxResult]:
+        """Processes a list of operations using the dispatcher to call the correct handler."""
+        return list(self.iter_process(operations))
+
+    def iter_process(self, operations: Iterable[Operation]) -> Iterator[TaxResult]:
+        """Lazily yields the result of each operation as it is consumed."""
+        for op in operations:
+            handler = self._handlers.get(op.operation)
+            if handler:
+                tax = handler(op)
+                yield ZERO_TAX if tax is None else TaxResult(tax=from_scaled(tax))
+
+    def iter_scaled_taxes(
+        self, operations: Iterable[Operation]
+    ) -> Iterator[Optional[int]]:
+        """Yields the scaled tax of each buy or sell (None without one)."""
+        for op in operations:
+            handler = self._handlers.get(op.operation)
+            if handler:
+                yield handler(op)
+
+    def process_records(
+        self, records: Iterable[Tuple[int, int, int]]
+    ) -> List[TaxResult]:
+        """
+        Processes (is_sell, unit cost in cents, quantity) records, such as the
+        ones of the binary input format, without building an Operation each.
+        """
+        results = []
+        append = results.append
+        for is_sell, unit_cost_cents, quantity in records:
+            unit_cost = unit_cost_cents * CENTS_SCALE
+            if is_sell:
+                tax = self._sell(unit_cost, quantity)
+                append(ZERO_TAX if tax is None else TaxResult(tax=from_scaled(tax)))
+            else:
+                self._update_weighted_average_cost(quantity, unit_cost)
+                append(ZERO_TAX)
+        return results
+
+    def summarize(self, operations: Iterable[Operation]) -> TaxSummary:
+        """Folds the operations into totals, without a result per operation."""
+        total_tax = 0
+        taxable_sells = 0
+        for op in operations:
+            handler = self._handlers.get(op.operation)
+            if handler and (tax := handler(op)) is not None:
+                total_tax += tax
+                taxable_sells += 1
+        return TaxSummary(
+            from_scaled(total_tax), taxable_sells, {None: self.snapshot()}
+        )
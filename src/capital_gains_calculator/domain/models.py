@@ -1,19 +1,50 @@
 # src/capital_gains_calculator/domain/models.py
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Dict, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Operation:
-    """Represents a single buy or sell stock operation in the domain."""
+    """
+    Represents a single buy or sell stock operation in the domain.
+
+    Records are slotted and immutable, so the same instances are shared with
+    the application layer instead of being copied.
+    """
 
     operation: str
     unit_cost: Decimal
     quantity: int
+    # Symbol of the stock; operations without one all belong to the same stock.
+    ticker: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TaxResult:
     """Represents the tax calculation result for an operation in the domain."""
 
     tax: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class PositionSnapshot:
+    """
+    State of a calculation for one stock after some operations, independent of
+    the engine that computed it. A later calculation can resume from it.
+    """
+
+    total_shares: int = 0
+    weighted_average_cost: Decimal = Decimal("0.00")
+    accumulated_loss: Decimal = Decimal("0.00")
+
+
+@dataclass(frozen=True, slots=True)
+class TaxSummary:
+    """Totals of a list of operations, in place of a result per operation."""
+
+    total_tax: Decimal
+    # Sells that paid a tax
+    taxable_sells: int
+    # Final position of every stock, by ticker (None for operations without one)
+    positions: Dict[Optional[str], PositionSnapshot]
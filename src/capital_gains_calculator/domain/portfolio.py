@@ -0,0 +1,194 @@
+# src/capital_gains_calculator/domain/portfolio.py
+from decimal import Decimal
+from itertools import groupby
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .models import Operation, PositionSnapshot, TaxResult, TaxSummary
+
+if TYPE_CHECKING:  # Not imported at run time, to keep start-up lean
+    from concurrent.futures import Executor
+
+# Operation types that produce a result; any other operation is skipped.
+HANDLED_OPERATIONS = frozenset(("buy", "sell"))
+
+# Lines with fewer operations than this are never split across workers.
+DEFAULT_PARALLEL_THRESHOLD = 50_000
+
+# (total_shares, weighted_average_cost, accumulated_loss) of one symbol, in the
+# engine's own representation.
+PositionState = Tuple[Any, Any, Any]
+
+
+def _save_state(engine) -> PositionState:
+    return (engine.total_shares, engine.weighted_average_cost, engine.accumulated_loss)
+
+
+def _load_state(engine, state: PositionState):
+    (
+        engine.total_shares,
+        engine.weighted_average_cost,
+        engine.accumulated_loss,
+    ) = state
+
+
+def _process_position(
+    engine, state: PositionState, operations: List[Operation]
+) -> Tuple[List[TaxResult], PositionState]:
+    """Runs the operations of one symbol on the engine, from the given state."""
+    _load_state(engine, state)
+    results = engine.process(operations)
+    return results, _save_state(engine)
+
+
+def _process_position_in_worker(
+    engine_class: type, state: PositionState, operations: List[Operation]
+) -> Tuple[List[TaxResult], PositionState]:
+    return _process_position(engine_class(), state, operations)
+
+
+class PortfolioTaxCalculatorService:
+    """
+    Calculates taxes for operations on several stocks, each identified by the
+    operation's `ticker`. Every symbol has its own shares, weighted average
+    cost and accumulated loss, kept in a compact state table, and a single
+    calculation engine is switched between them.
+
+    A line is partitioned by symbol, each symbol is computed as one batch
+    (in parallel when an executor is given and the line is large enough) and
+    the results are merged back into the original operation order. Lines
+    without tickers go straight to the engine, unchanged.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Any],
+        executor: Optional["Executor"] = None,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+    ):
+        self._engine = engine_factory()
+        self._initial_state = _save_state(self._engine)
+        self._executor = executor
+        self._parallel_threshold = parallel_threshold
+
+        # The engine holds the state of `_current_ticker`; the table holds
+        # the state of every other symbol seen so far.
+        self._current_ticker: Optional[str] = None
+        self._positions: Dict[Optional[str], PositionState] = {}
+
+    def process(self, operations: List[Operation]) -> List[TaxResult]:
+        """Processes a list of operations, returning the results in input order."""
+        if self._current_ticker is None and all(op.ticker is None for op in operations):
+            return self._engine.process(operations)
+
+        partitions: Dict[Optional[str], Tuple[List[int], List[Operation]]] = {}
+        handled = 0
+        for op in operations:
+            if op.operation not in HANDLED_OPERATIONS:
+                continue
+            indices, symbol_operations = partitions.setdefault(op.ticker, ([], []))
+            indices.append(handled)
+            symbol_operations.append(op)
+            handled += 1
+
+        self._positions[self._current_ticker] = _save_state(self._engine)
+        if (
+            self._executor is not None
+            and len(partitions) > 1
+            and handled >= self._parallel_threshold
+        ):
+            symbol_results = self._process_in_parallel(partitions)
+        else:
+            symbol_results = self._process_sequentially(partitions)
+        _load_state(self._engine, self._positions.pop(self._current_ticker))
+
+        results: List[TaxResult] = [None] * handled
+        for ticker, tax_results in symbol_results.items():
+            for index, tax_result in zip(partitions[ticker][0], tax_results):
+                results[index] = tax_result
+        return results
+
+    def iter_process(self, operations: Iterable[Operation]) -> Iterator[TaxResult]:
+        """Lazily yields the results, switching symbols as the ticker changes."""
+        for ticker, symbol_operations in groupby(operations, lambda op: op.ticker):
+            self._switch_to(ticker)
+            yield from self._engine.iter_process(symbol_operations)
+
+    def summarize(self, operations: Iterable[Operation]) -> TaxSummary:
+        """
+        Folds the operations into totals, switching symbols as the ticker
+        changes, and reports the final position of every symbol.
+        """
+        total_tax = Decimal("0.00")
+        taxable_sells = 0
+        for ticker, symbol_operations in groupby(operations, lambda op: op.ticker):
+            self._switch_to(ticker)
+            summary = self._engine.summarize(symbol_operations)
+            total_tax += summary.total_tax
+            taxable_sells += summary.taxable_sells
+        return TaxSummary(total_tax, taxable_sells, self.snapshot())
+
+    def snapshot(self) -> Dict[Optional[str], PositionSnapshot]:
+        """Returns the position of every symbol seen so far, by ticker."""
+        current_state = _save_state(self._engine)
+        snapshots = {self._current_ticker: self._engine.snapshot()}
+        for ticker, state in self._positions.items():
+            _load_state(self._engine, state)
+            snapshots[ticker] = self._engine.snapshot()
+        _load_state(self._engine, current_state)
+        return snapshots
+
+    def restore(self, snapshots: Dict[Optional[str], PositionSnapshot]):
+        """Continues the calculation from the positions of a snapshot."""
+        self._positions = {}
+        for ticker, snapshot in snapshots.items():
+            self._engine.restore(snapshot)
+            self._positions[ticker] = _save_state(self._engine)
+        self._current_ticker = None
+        _load_state(self._engine, self._positions.pop(None, self._initial_state))
+
+    def _state_of(self, ticker: Optional[str]) -> PositionState:
+        return self._positions.get(ticker, self._initial_state)
+
+    def _switch_to(self, ticker: Optional[str]):
+        if ticker != self._current_ticker:
+            self._positions[self._current_ticker] = _save_state(self._engine)
+            _load_state(self._engine, self._positions.pop(ticker, self._initial_state))
+            self._current_ticker = ticker
+
+    def _process_sequentially(
+        self, partitions: Dict[Optional[str], Tuple[List[int], List[Operation]]]
+    ) -> Dict[Optional[str], List[TaxResult]]:
+        symbol_results = {}
+        for ticker, (_, symbol_operations) in partitions.items():
+            symbol_results[ticker], self._positions[ticker] = _process_position(
+                self._engine, self._state_of(ticker), symbol_operations
+            )
+        return symbol_results
+
+    def _process_in_parallel(
+        self, partitions: Dict[Optional[str], Tuple[List[int], List[Operation]]]
+    ) -> Dict[Optional[str], List[TaxResult]]:
+        engine_class = type(self._engine)
+        futures = {
+            ticker: self._executor.submit(
+                _process_position_in_worker,
+                engine_class,
+                self._state_of(ticker),
+                symbol_operations,
+            )
+            for ticker, (_, symbol_operations) in partitions.items()
+        }
+        symbol_results = {}
+        for ticker, future in futures.items():
+            symbol_results[ticker], self._positions[ticker] = future.result()
+        return symbol_results
@@ -0,0 +1,178 @@
+# src/capital_gains_calculator/domain/prefix_scan.py
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from .fixed_point import (
+    divide,
+    FixedPointTaxCalculatorService,
+    TAX_EXEMPTION_LIMIT_SCALED,
+    to_scaled,
+)
+from .models import Operation
+
+# (total_shares, weighted_average_cost, accumulated_loss) in the scaled ints of
+# the fixed-point engine, whose results are the ones reproduced here.
+PositionState = Tuple[int, int, int]
+
+INITIAL_STATE: PositionState = (0, 0, 0)
+
+# An operation replayed in order: (is_buy, shares_before, quantity, unit_cost).
+ReplayedOperation = Tuple[bool, int, int, int]
+
+
+@dataclass(frozen=True)
+class LossTransition:
+    """
+    Effect of a run of sells on the accumulated loss: `L -> max(L + shift,
+    floor)`. A loss adds to L and a taxable profit takes L down to zero at
+    most, so every sell is `(-profit, 0)`; exempt profits leave L unchanged.
+    Transitions compose associatively, so runs can be summarized apart and
+    combined in order. (0, 0) is the identity, since L is never negative.
+    """
+
+    shift: int = 0
+    floor: int = 0
+
+    def apply(self, loss: int) -> int:
+        return max(loss + self.shift, self.floor)
+
+    def then(self, other: "LossTransition") -> "LossTransition":
+        """The transition of this run followed by `other`."""
+        return LossTransition(
+            self.shift + other.shift, max(self.floor + other.shift, other.floor)
+        )
+
+
+@dataclass(frozen=True)
+class ChunkTransition:
+    """
+    Summary of how a chunk of operations changes the state it starts from,
+    once its starting share count is known.
+
+    The weighted average cost is rounded at every buy, so it has no exact
+    summary; but a buy made with no shares held sets it to the buy price,
+    whatever came before. The operations before that first reset depend on
+    the incoming average and are kept to be replayed in order; from the reset
+    on, the chunk's final average and its effect on the loss are known.
+    """
+
+    share_delta: int
+    replayed: List[ReplayedOperation] = field(default_factory=list)
+    reset_weighted_average_cost: Optional[int] = None
+    loss_after_reset: LossTransition = LossTransition()
+
+
+def _sell_transition(profit: int, unit_cost: int, quantity: int) -> LossTransition:
+    if profit >= 0 and unit_cost * quantity <= TAX_EXEMPTION_LIMIT_SCALED:
+        return LossTransition()
+    return LossTransition(-profit, 0)
+
+
+def _buy(
+    shares_before: int, weighted_average_cost: int, quantity: int, unit_cost: int
+) -> int:
+    """The weighted average cost after a buy, rounded like the fixed-point engine."""
+    shares_after = shares_before + quantity
+    if shares_after <= 0:
+        return weighted_average_cost
+    return divide(
+        shares_before * weighted_average_cost + quantity * unit_cost, shares_after
+    )
+
+
+def share_delta(operations: Iterable[Operation]) -> int:
+    """Change in the share count over a chunk (first pass of the scan)."""
+    delta = 0
+    for op in operations:
+        if op.operation == "buy":
+            delta += op.quantity
+        elif op.operation == "sell":
+            delta -= op.quantity
+    return delta
+
+
+def chunk_transition(operations: Iterable[Operation], shares: int) -> ChunkTransition:
+    """Summarizes a chunk that starts with `shares` (second pass of the scan)."""
+    total_shares = shares
+    weighted_average_cost = 0  # Only read after a reset has set it
+    replayed: List[ReplayedOperation] = []
+    reset = False
+    loss = LossTransition()
+    for op in operations:
+        if op.operation == "buy":
+            unit_cost = to_scaled(op.unit_cost)
+            if not reset and total_shares == 0 and op.quantity > 0:
+                reset = True
+            if not reset:
+                replayed.append((True, total_shares, op.quantity, unit_cost))
+            weighted_average_cost = _buy(
+                total_shares, weighted_average_cost, op.quantity, unit_cost
+            )
+            total_shares += op.quantity
+        elif op.operation == "sell":
+            unit_cost = to_scaled(op.unit_cost)
+            if reset:
+                profit = (unit_cost - weighted_average_cost) * op.quantity
+                loss = loss.then(_sell_transition(profit, unit_cost, op.quantity))
+            else:
+                replayed.append((False, total_shares, op.quantity, unit_cost))
+            total_shares -= op.quantity
+    return ChunkTransition(
+        share_delta=total_shares - shares,
+        replayed=replayed,
+        reset_weighted_average_cost=weighted_average_cost if reset else None,
+        loss_after_reset=loss,
+    )
+
+
+def resolve_start_states(
+    transitions: Iterable[ChunkTransition], state: PositionState = INITIAL_STATE
+) -> List[PositionState]:
+    """
+    Scans the chunk transitions in order and returns the state each chunk
+    starts from. Only the operations before each chunk's first reset are
+    replayed; the rest of each chunk is applied through its summary.
+    """
+    total_shares, weighted_average_cost, accumulated_loss = state
+    start_states = []
+    for transition in transitions:
+        start_states.append((total_shares, weighted_average_cost, accumulated_loss))
+        for is_buy, shares_before, quantity, unit_cost in transition.replayed:
+            if is_buy:
+                weighted_average_cost = _buy(
+                    shares_before, weighted_average_cost, quantity, unit_cost
+                )
+            else:
+                profit = (unit_cost - weighted_average_cost) * quantity
+                accumulated_loss = _sell_transition(profit, unit_cost, quantity).apply(
+                    accumulated_loss
+                )
+        if transition.reset_weighted_average_cost is not None:
+            weighted_average_cost = transition.reset_weighted_average_cost
+            accumulated_loss = transition.loss_after_reset.apply(accumulated_loss)
+        total_shares += transition.share_delta
+    return start_states
+
+
+def chunk_taxes(
+    operations: Iterable[Operation], state: PositionState
+) -> Tuple[int, List[int], List[int]]:
+    """
+    Computes the taxes of a chunk from its resolved starting state (last
+    pass of the scan). Returns the number of results and the positions and
+    scaled values of the non-zero taxes, which is all a chunk needs to send.
+    """
+    engine = FixedPointTaxCalculatorService()
+    (
+        engine.total_shares,
+        engine.weighted_average_cost,
+        engine.accumulated_loss,
+    ) = state
+    count = 0
+    taxed_positions = []
+    taxes = []
+    for count, tax in enumerate(engine.iter_scaled_taxes(operations), 1):
+        if tax is not None:
+            taxed_positions.append(count - 1)
+            taxes.append(tax)
+    return count, taxed_positions, taxes
@@ -0,0 +1,125 @@
+# src/capital_gains_calculator/domain/scenarios.py
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Operation
+from .vectorized import np, TAX_EXEMPTION_LIMIT_CENTS, TAX_RATE_RECIPROCAL
+
+
+class ScenarioTaxCalculatorService:
+    """
+    Evaluates one list of operations under many unit-cost scenarios at once
+    (what-if analysis over alternative price paths). The buys, sells and
+    quantities are the same in every scenario, so the share count is tracked
+    once; the weighted average cost and the accumulated loss are arrays with
+    one entry per scenario, and the weighted-average, exemption and loss-carry
+    rules are applied to all the scenarios with each operation.
+
+    Unit costs are rounded to cents, like the amounts of the input, and the
+    arithmetic is float64 as in the vectorized engine.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("The scenario engine requires numpy: pip install .[fast]")
+
+    def process(
+        self, operations: Sequence[Operation], unit_costs: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Returns the tax of every operation in every scenario. `unit_costs` has
+        one row per scenario and one column per operation (the unit costs of
+        the operations themselves are ignored); so does the result.
+        """
+        unit_costs_cents = self._to_cents(operations, unit_costs)
+        # Filled one operation at a time, so each operation is a row.
+        taxes = np.zeros(unit_costs_cents.shape)
+        for column, tax in self._iter_taxes(operations, unit_costs_cents):
+            taxes[column] = tax
+        return taxes.T
+
+    def summarize(
+        self, operations: Sequence[Operation], unit_costs: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Returns the total tax and the number of taxed sells of each scenario,
+        without keeping the tax of every operation.
+        """
+        unit_costs_cents = self._to_cents(operations, unit_costs)
+        scenario_count = unit_costs_cents.shape[1]
+        total_tax = np.zeros(scenario_count)
+        taxable_sells = np.zeros(scenario_count, dtype=np.int64)
+        for _, tax in self._iter_taxes(operations, unit_costs_cents):
+            total_tax += tax
+            taxable_sells += tax > 0
+        return total_tax, taxable_sells
+
+    @staticmethod
+    def _to_cents(
+        operations: Sequence[Operation], unit_costs: "np.ndarray"
+    ) -> "np.ndarray":
+        """Checks the shape of the scenarios and transposes them to rows of cents."""
+        unit_costs = np.asarray(unit_costs, dtype=np.float64)
+        if unit_costs.ndim != 2 or unit_costs.shape[1] != len(operations):
+            raise ValueError(
+                f"Expected a matrix with one column per operation ({len(operations)}),"
+                f" got shape {unit_costs.shape}."
+            )
+        # Every operation reads the costs of all the scenarios at once, so
+        # they are laid out contiguously.
+        return np.ascontiguousarray(np.rint(unit_costs.T * 100))
+
+    def _iter_taxes(
+        self, operations: Sequence[Operation], unit_costs_cents: "np.ndarray"
+    ) -> Iterator[Tuple[int, "np.ndarray"]]:
+        """Yields (column, tax in every scenario) for each sell taxed anywhere."""
+        for columns in self._group_by_ticker(operations).values():
+            yield from self._iter_position_taxes(operations, columns, unit_costs_cents)
+
+    @staticmethod
+    def _group_by_ticker(
+        operations: Sequence[Operation],
+    ) -> Dict[Optional[str], List[int]]:
+        """Each ticker keeps its own position, as in the portfolio engine."""
+        columns: Dict[Optional[str], List[int]] = {}
+        for column, op in enumerate(operations):
+            if op.operation in ("buy", "sell"):
+                columns.setdefault(op.ticker, []).append(column)
+        return columns
+
+    @staticmethod
+    def _iter_position_taxes(
+        operations: Sequence[Operation],
+        columns: List[int],
+        unit_costs_cents: "np.ndarray",
+    ) -> Iterator[Tuple[int, "np.ndarray"]]:
+        scenario_count = unit_costs_cents.shape[1]
+        total_shares = 0
+        weighted_average_cost = np.zeros(scenario_count)
+        accumulated_loss = np.zeros(scenario_count)
+        for column in columns:
+            quantity = operations[column].quantity
+            cents = unit_costs_cents[column]
+            if operations[column].operation == "buy":
+                shares_after = total_shares + quantity
+                if shares_after > 0:
+                    weighted_average_cost = (
+                        total_shares * weighted_average_cost + quantity * cents / 100
+                    ) / shares_after
+                total_shares = shares_after
+                continue
+
+            total_shares -= quantity
+            profit = (cents / 100 - weighted_average_cost) * quantity
+            taxable_profit = profit - accumulated_loss
+            not_exempt = cents * quantity > TAX_EXEMPTION_LIMIT_CENTS
+            taxed = not_exempt & (taxable_profit > 0)
+            # Losses (exempt or not) and profits that do not exceed the
+            # accumulated loss both change it by the (negative) profit.
+            carried = (profit < 0) | (not_exempt & ~taxed)
+            accumulated_loss = np.where(
+                taxed,
+                0.0,
+                np.where(carried, accumulated_loss - profit, accumulated_loss),
+            )
+            if taxed.any():
+                yield column, np.where(taxed, taxable_profit / TAX_RATE_RECIPROCAL, 0.0)
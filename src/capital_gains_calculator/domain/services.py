@@ -1,12 +1,15 @@
 # src/capital_gains_calculator/domain/services.py
 from decimal import Decimal
-from typing import Callable, Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
-from .models import Operation, TaxResult
+from .models import Operation, PositionSnapshot, TaxResult, TaxSummary
 
 TAX_EXEMPTION_LIMIT = Decimal("20000.00")
 TAX_RATE = Decimal("0.20")
 
+# Results are immutable, so every zero tax shares the same instance.
+ZERO_TAX = TaxResult(tax=Decimal("0.00"))
+
 
 class TaxCalculatorService:
     def __init__(self):
@@ -14,7 +17,9 @@ class TaxCalculatorService:
         self.weighted_average_cost = Decimal("0.00")
         self.accumulated_loss = Decimal("0.00")
 
-        self._handlers: Dict[str, Callable[[Operation], TaxResult]] = {
+        # Handlers return the tax of the operation, or None when there is none,
+        # so summaries can add taxes up without building TaxResults.
+        self._handlers: Dict[str, Callable[[Operation], Optional[Decimal]]] = {
             "buy": self._handle_buy,
             "sell": self._handle_sell,
         }
@@ -28,32 +33,30 @@ class TaxCalculatorService:
                 current_total_cost + new_total_cost
             ) / self.total_shares
 
-    def _handle_buy(self, op: Operation) -> TaxResult:
+    def _handle_buy(self, op: Operation) -> None:
         """Handles the logic for a buy operation."""
         self._update_weighted_average_cost(op.quantity, op.unit_cost)
-        return TaxResult(tax=Decimal("0.00"))
 
-    def _process_loss(self, loss: Decimal) -> TaxResult:
+    def _process_loss(self, loss: Decimal) -> None:
         """Processes a loss, adding it to the accumulated total."""
         self.accumulated_loss += abs(loss)
-        return TaxResult(tax=Decimal("0.00"))
 
-    def _process_profit(self, profit: Decimal, op: Operation) -> TaxResult:
+    def _process_profit(self, profit: Decimal, op: Operation) -> Optional[Decimal]:
         """Processes a profit, considering tax exemption and accumulated losses."""
         total_value = op.unit_cost * op.quantity
         if total_value <= TAX_EXEMPTION_LIMIT:
-            return TaxResult(tax=Decimal("0.00"))
+            return None
 
         taxable_profit = profit - self.accumulated_loss
         if taxable_profit <= 0:
             self.accumulated_loss -= profit
-            return TaxResult(tax=Decimal("0.00"))
+            return None
 
         tax = taxable_profit * TAX_RATE
         self.accumulated_loss = Decimal("0.00")
-        return TaxResult(tax=tax)
+        return tax
 
-    def _handle_sell(self, op: Operation) -> TaxResult:
+    def _handle_sell(self, op: Operation) -> Optional[Decimal]:
         """Handles a sell operation, delegating to the profit/loss methods."""
         profit_or_loss = (op.unit_cost - self.weighted_average_cost) * op.quantity
         self.total_shares -= op.quantity
@@ -63,12 +66,37 @@ class TaxCalculatorService:
         else:
             return self._process_profit(profit_or_loss, op)
 
+    def snapshot(self) -> PositionSnapshot:
+        """Returns the current state, to resume the calculation later."""
+        return PositionSnapshot(
+            self.total_shares, self.weighted_average_cost, self.accumulated_loss
+        )
+
+    def restore(self, snapshot: PositionSnapshot):
+        """Continues the calculation from a snapshot."""
+        self.total_shares = snapshot.total_shares
+        self.weighted_average_cost = snapshot.weighted_average_cost
+        self.accumulated_loss = snapshot.accumulated_loss
+
     def process(self, operations: List[Operation]) -> List[TaxResult]:
         """Processes a list of operations using the dispatcher to call the correct handler."""
-        results = []
+        return list(self.iter_process(operations))
+
+    def iter_process(self, operations: Iterable[Operation]) -> Iterator[TaxResult]:
+        """Lazily yields the result of each operation as it is consumed."""
         for op in operations:
             handler = self._handlers.get(op.operation)
             if handler:
-                tax_result = handler(op)
-                results.append(tax_result)
-        return results
+                tax = handler(op)
+                yield ZERO_TAX if tax is None else TaxResult(tax=tax)
+
+    def summarize(self, operations: Iterable[Operation]) -> TaxSummary:
+        """Folds the operations into totals, without a result per operation."""
+        total_tax = Decimal("0.00")
+        taxable_sells = 0
+        for op in operations:
+            handler = self._handlers.get(op.operation)
+            if handler and (tax := handler(op)) is not None:
+                total_tax += tax
+                taxable_sells += 1
+        return TaxSummary(total_tax, taxable_sells, {None: self.snapshot()})
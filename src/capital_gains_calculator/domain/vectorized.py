@@ -0,0 +1,330 @@
+# src/capital_gains_calculator/domain/vectorized.py
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (the "fast" extra)
+    np = None
+
+from .models import Operation, PositionSnapshot, TaxResult, TaxSummary
+from .services import TAX_EXEMPTION_LIMIT, TAX_RATE, TaxCalculatorService, ZERO_TAX
+
+TAX_EXEMPTION_LIMIT_CENTS = int(TAX_EXEMPTION_LIMIT * 100)
+TAX_RATE_RECIPROCAL = float(1 / TAX_RATE)
+
+# Products and running sums of cents and quantities must stay below this to
+# be computed on int64 columns.
+_INT64_LIMIT = 2**63
+
+# Float rounding leaves profits of about 1e-12 on a sell at exactly the
+# weighted average; amounts this small relative to the value of the sale are
+# rounding noise, and are taken as zero like the exact engines do.
+_PROFIT_EPSILON = 1e-11
+
+
+def _to_cents(unit_cost: Decimal) -> Optional[int]:
+    """Converts a unit cost into cents, or None if it has fractions of a cent."""
+    cents = unit_cost * 100
+    whole_cents = cents.to_integral_value()
+    return int(whole_cents) if cents == whole_cents else None
+
+
+class VectorizedTaxCalculatorService:
+    """
+    Array-backed engine for long operation lists. The operations are turned
+    into columns and the shares and weighted average cost are computed with
+    cumulative sums over each run of consecutive buys. Only the propagation of
+    the weighted average between runs and the accumulated-loss carry are
+    scanned in Python, on plain floats.
+
+    Amounts are float64, so the output is not byte-identical to the Decimal
+    engine's: taxes differ in the last digits whenever the weighted average is
+    not a round number of cents, which is the case on most long lines. Lines
+    with unit costs in fractions of a cent are computed by the Decimal engine
+    instead, and a line is computed as a single batch, so streaming it does
+    not keep memory use constant.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError(
+                "The vectorized engine requires numpy: pip install .[fast]"
+            )
+        self.total_shares = 0
+        self.weighted_average_cost = 0.0
+        self.accumulated_loss = 0.0
+
+    def snapshot(self) -> PositionSnapshot:
+        """Returns the current state, to resume the calculation later."""
+        # repr gives the shortest digits that read back as the same float.
+        return PositionSnapshot(
+            self.total_shares,
+            Decimal(repr(self.weighted_average_cost)),
+            Decimal(repr(self.accumulated_loss)),
+        )
+
+    def restore(self, snapshot: PositionSnapshot):
+        """Continues the calculation from a snapshot."""
+        self.total_shares = snapshot.total_shares
+        self.weighted_average_cost = float(snapshot.weighted_average_cost)
+        self.accumulated_loss = float(snapshot.accumulated_loss)
+
+    def process(self, operations: List[Operation]) -> List[TaxResult]:
+        """Processes a list of operations, returning one result per buy or sell."""
+        return self._to_results(self._compute_operations(operations))
+
+    def process_columns(
+        self,
+        is_sell: "np.ndarray",
+        unit_cost_cents: "np.ndarray",
+        quantity: "np.ndarray",
+    ) -> List[TaxResult]:
+        """
+        Processes operations that are already columns of buys and sells, such
+        as the records of the binary input format.
+        """
+        return self._to_results(self.compute_taxes(is_sell, unit_cost_cents, quantity))
+
+    @staticmethod
+    def _to_results(taxes: "np.ndarray") -> List[TaxResult]:
+        return [
+            TaxResult(tax=Decimal(tax)) if tax else ZERO_TAX for tax in taxes.tolist()
+        ]
+
+    def summarize(self, operations: Iterable[Operation]) -> TaxSummary:
+        """Folds the operations into totals, without a result per operation."""
+        taxes = self._compute_operations(list(operations))
+        return TaxSummary(
+            Decimal(repr(float(taxes.sum()))),
+            int(np.count_nonzero(taxes)),
+            {None: self.snapshot()},
+        )
+
+    def _compute_operations(self, operations: List[Operation]) -> "np.ndarray":
+        """Turns the buys and sells into columns and computes their taxes."""
+        operations = [op for op in operations if op.operation in ("buy", "sell")]
+        if not operations:
+            return np.zeros(0)
+
+        cents = [_to_cents(op.unit_cost) for op in operations]
+        if None in cents:
+            return self._compute_with_decimals(operations)
+
+        is_sell = np.fromiter(
+            (op.operation == "sell" for op in operations), bool, len(operations)
+        )
+        unit_cost_cents = np.array(cents, dtype=np.int64)
+        quantity = np.fromiter(
+            (op.quantity for op in operations), np.int64, len(operations)
+        )
+
+        return self.compute_taxes(is_sell, unit_cost_cents, quantity)
+
+    def _compute_with_decimals(self, operations: List[Operation]) -> "np.ndarray":
+        """Computes a line the cents columns cannot hold with the Decimal engine."""
+        engine = TaxCalculatorService()
+        engine.restore(self.snapshot())
+        taxes = np.array([float(result.tax) for result in engine.process(operations)])
+        self.restore(engine.snapshot())
+        return taxes
+
+    def iter_process(self, operations: Iterable[Operation]) -> Iterator[TaxResult]:
+        """
+        Yields the results of the operations, which are still computed as a
+        single batch (all of them are read first).
+        """
+        yield from self.process(list(operations))
+
+    def compute_taxes(
+        self,
+        is_sell: "np.ndarray",
+        unit_cost_cents: "np.ndarray",
+        quantity: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        Computes the tax of each operation from columnar arrays, starting from
+        (and updating) the current state of the service.
+        """
+        if not len(is_sell):
+            return np.zeros(0)
+        if self._may_overflow(unit_cost_cents, quantity):
+            return self._compute_taxes_sequentially(is_sell, unit_cost_cents, quantity)
+
+        signed_quantity = np.where(is_sell, -quantity, quantity)
+        shares_after = self.total_shares + np.cumsum(signed_quantity)
+        shares_before = shares_after - signed_quantity
+
+        is_buy = ~is_sell
+        if np.any(shares_after[is_buy] <= 0):
+            # Buying into a short position does not follow the run formula.
+            return self._compute_taxes_sequentially(is_sell, unit_cost_cents, quantity)
+
+        weighted_average_cost = self._weighted_average_costs(
+            is_buy, unit_cost_cents, quantity, shares_before
+        )
+        taxes = self._carry_losses(
+            is_sell, unit_cost_cents, quantity, weighted_average_cost
+        )
+        self.total_shares = int(shares_after[-1])
+        return taxes
+
+    @staticmethod
+    def _may_overflow(unit_cost_cents: "np.ndarray", quantity: "np.ndarray") -> bool:
+        """
+        Tells whether the costs (cents times quantities), or their running sums,
+        could go past int64; such lines are computed on Python ints instead.
+        """
+        largest_cents = max(int(np.abs(unit_cost_cents).max()), 1)
+        largest_quantity = int(np.abs(quantity).max())
+        return largest_cents * largest_quantity * len(quantity) >= _INT64_LIMIT
+
+    def _weighted_average_costs(
+        self,
+        is_buy: "np.ndarray",
+        unit_cost_cents: "np.ndarray",
+        quantity: "np.ndarray",
+        shares_before: "np.ndarray",
+    ) -> "np.ndarray":
+        """Returns the weighted average cost in effect after each operation."""
+        count = len(is_buy)
+        buy_index = np.flatnonzero(is_buy)
+        if not buy_index.size:
+            return np.full(count, self.weighted_average_cost)
+
+        # Consecutive buys form a run; within a run the average is the
+        # cost carried into the run plus the cumulative cost of its buys.
+        run_starts = np.ones(buy_index.size, dtype=bool)
+        run_starts[1:] = np.diff(buy_index) != 1
+        run_id = np.cumsum(run_starts) - 1
+        run_start_positions = np.flatnonzero(run_starts)
+
+        bought = quantity[buy_index]
+        cost_cents = bought * unit_cost_cents[buy_index]
+        cumulative_bought = np.cumsum(bought)
+        cumulative_cost_cents = np.cumsum(cost_cents)
+        run_bought = (
+            cumulative_bought
+            - (cumulative_bought - bought)[run_start_positions][run_id]
+        )
+        run_cost_cents = (
+            cumulative_cost_cents
+            - (cumulative_cost_cents - cost_cents)[run_start_positions][run_id]
+        )
+
+        run_shares_before = shares_before[buy_index[run_start_positions]]
+        run_ends = np.append(run_start_positions[1:], buy_index.size) - 1
+        run_carried_cost = self._propagate_between_runs(
+            run_shares_before.tolist(),
+            (run_shares_before + run_bought[run_ends]).tolist(),
+            (run_cost_cents[run_ends] / 100).tolist(),
+        )
+
+        buy_average = (
+            run_shares_before[run_id] * run_carried_cost[run_id] + run_cost_cents / 100
+        ) / (run_shares_before[run_id] + run_bought)
+        self.weighted_average_cost = float(buy_average[-1])
+
+        # Sells keep the average of the latest buy before them.
+        last_buy = np.maximum.accumulate(np.where(is_buy, np.arange(count), -1))
+        average_by_operation = np.empty(count)
+        average_by_operation[buy_index] = buy_average
+        initial_average = run_carried_cost[0]
+        return np.where(
+            last_buy >= 0,
+            average_by_operation[np.maximum(last_buy, 0)],
+            initial_average,
+        )
+
+    def _propagate_between_runs(
+        self, shares_before: List[int], shares_after: List[int], run_cost: List[float]
+    ) -> "np.ndarray":
+        """Returns the weighted average cost carried into each run of buys."""
+        carried = []
+        average = self.weighted_average_cost
+        for before, after, cost in zip(shares_before, shares_after, run_cost):
+            carried.append(average)
+            average = (before * average + cost) / after
+        return np.array(carried)
+
+    def _carry_losses(
+        self,
+        is_sell: "np.ndarray",
+        unit_cost_cents: "np.ndarray",
+        quantity: "np.ndarray",
+        weighted_average_cost: "np.ndarray",
+    ) -> "np.ndarray":
+        """Applies the exemption and accumulated-loss rules to every sell."""
+        profit = (unit_cost_cents / 100 - weighted_average_cost) * quantity
+        noise = _PROFIT_EPSILON * (unit_cost_cents / 100 * quantity)
+        profit[np.abs(profit) <= noise] = 0.0
+        exempt = unit_cost_cents * quantity <= TAX_EXEMPTION_LIMIT_CENTS
+
+        # Exempt profits neither pay tax nor offset losses, so they are skipped.
+        relevant = np.flatnonzero(is_sell & ((profit < 0) | ~exempt))
+        taxed_index, taxed_values = self._scan_losses(
+            relevant.tolist(), profit[relevant].tolist(), noise[relevant].tolist()
+        )
+
+        taxes = np.zeros(len(is_sell))
+        taxes[taxed_index] = taxed_values
+        return taxes
+
+    def _scan_losses(
+        self, index: List[int], profit: List[float], noise: List[float]
+    ) -> Tuple[List[int], List[float]]:
+        accumulated_loss = self.accumulated_loss
+        taxed_index = []
+        taxed_values = []
+        for position, value, value_noise in zip(index, profit, noise):
+            if value < 0:
+                accumulated_loss -= value
+                continue
+            taxable_profit = value - accumulated_loss
+            if taxable_profit <= value_noise:
+                accumulated_loss = max(accumulated_loss - value, 0.0)
+            else:
+                taxed_index.append(position)
+                taxed_values.append(taxable_profit / TAX_RATE_RECIPROCAL)
+                accumulated_loss = 0.0
+        self.accumulated_loss = accumulated_loss
+        return taxed_index, taxed_values
+
+    def _compute_taxes_sequentially(
+        self,
+        is_sell: "np.ndarray",
+        unit_cost_cents: "np.ndarray",
+        quantity: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        Operation-by-operation fallback for inputs that sell more than held, or
+        whose amounts do not fit in int64 columns.
+        """
+        taxes = np.zeros(len(is_sell))
+        for position, (sell, cents, bought) in enumerate(
+            zip(is_sell.tolist(), unit_cost_cents.tolist(), quantity.tolist())
+        ):
+            unit_cost = cents / 100
+            if not sell:
+                current_total_cost = self.total_shares * self.weighted_average_cost
+                self.total_shares += bought
+                if self.total_shares > 0:
+                    self.weighted_average_cost = (
+                        current_total_cost + bought * unit_cost
+                    ) / self.total_shares
+                continue
+            profit = (unit_cost - self.weighted_average_cost) * bought
+            noise = _PROFIT_EPSILON * unit_cost * bought
+            if abs(profit) <= noise:
+                profit = 0.0
+            self.total_shares -= bought
+            if profit < 0:
+                self.accumulated_loss -= profit
+            elif cents * bought > TAX_EXEMPTION_LIMIT_CENTS:
+                taxable_profit = profit - self.accumulated_loss
+                if taxable_profit <= noise:
+                    self.accumulated_loss = max(self.accumulated_loss - profit, 0.0)
+                else:
+                    taxes[position] = taxable_profit / TAX_RATE_RECIPROCAL
+                    self.accumulated_loss = 0.0
+        return taxes
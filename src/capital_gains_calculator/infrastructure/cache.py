@@ -0,0 +1,133 @@
+# src/capital_gains_calculator/infrastructure/cache.py
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Rough per-entry bookkeeping cost (key, node in the ordered dict, str header).
+_ENTRY_OVERHEAD_BYTES = 150
+
+# Version of the cached outputs. Bump it whenever the output of a line can
+# change, so cache files written by older code are not reused.
+CACHE_FORMAT_VERSION = 2
+_FILE_HEADER = f"# capital-gains-calculator result cache v{CACHE_FORMAT_VERSION}"
+
+# A JSON string (with its escapes) or a run of whitespace outside of one.
+_STRING_OR_WHITESPACE = re.compile(r'("(?:[^"\\]|\\.)*")|\s+')
+
+
+def normalize_line(line: str) -> str:
+    """Removes the whitespace of a JSON line, except inside its strings."""
+    if "\\" in line:  # Escaped quotes would break the split below
+        return _STRING_OR_WHITESPACE.sub(lambda match: match.group(1) or "", line)
+    # Splitting on quotes leaves the text outside of strings at even indexes.
+    parts = line.split('"')
+    parts[::2] = ["".join(part.split()) for part in parts[::2]]
+    return '"'.join(parts)
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by the result cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LineResultCache:
+    """
+    Bounded LRU cache of serialized outputs, keyed by a hash of the normalized
+    input line. Entries are evicted, least recently used first, when either the
+    number of entries or their estimated memory goes over its limit.
+
+    When a path is given the cache is loaded from it on creation and written
+    back by `save`, so warm runs can skip the computation entirely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: Optional[Path] = None,
+        namespace: str = "",
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.stats = CacheStats()
+        # Keys also depend on the version, so old outputs never match.
+        self._namespace = f"v{CACHE_FORMAT_VERSION}:{namespace}".encode()
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+
+        if path is not None and path.exists():
+            self._load(path)
+
+    def key(self, line: str) -> bytes:
+        """Hashes the line with the whitespace outside of its strings removed."""
+        normalized = normalize_line(line).encode()
+        return hashlib.blake2b(
+            normalized, digest_size=16, person=self._namespace[:16]
+        ).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Returns the cached output for the key, if any, and marks it as recent."""
+        output = self._entries.get(key)
+        if output is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return output
+
+    def put(self, key: bytes, output: str):
+        """Stores an output, evicting the least recently used entries if needed."""
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = output
+        self.stats.entries += 1
+        self.stats.bytes += self._size(output)
+        while self.stats.entries > self.max_entries or (
+            self.stats.bytes > self.max_bytes and self.stats.entries > 1
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def save(self):
+        """Writes the entries (oldest first) to the cache file, if there is one."""
+        if self.path is None:
+            return
+        temporary_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(_FILE_HEADER + "\n")
+            for key, output in self._entries.items():
+                file.write(f"{key.hex()}\t{output}\n")
+        os.replace(temporary_path, self.path)
+
+    def _load(self, path: Path):
+        with open(path, encoding="utf-8") as file:
+            if file.readline().rstrip("\n") != _FILE_HEADER:
+                return  # Written by another version: its outputs may be stale
+            for record in file:
+                key, _, output = record.rstrip("\n").partition("\t")
+                self.put(bytes.fromhex(key), output)
+
+    def _remove(self, key: bytes):
+        output = self._entries.pop(key)
+        self.stats.entries -= 1
+        self.stats.bytes -= self._size(output)
+
+    @staticmethod
+    def _size(output: str) -> int:
+        return len(output) + _ENTRY_OVERHEAD_BYTES
@@ -0,0 +1,47 @@
+# src/capital_gains_calculator/infrastructure/cli/decoding.py
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+
+from ...application.dtos import OperationDTO
+
+
+def to_operation_dto(fields: Dict[str, Any]) -> OperationDTO:
+    """
+    Builds the DTO of an operation object decoded with `parse_float=Decimal`
+    (as soon as the scanner has read it, when used as an object hook).
+    """
+    unit_cost = fields["unit-cost"]
+    if unit_cost.__class__ is not Decimal:  # Integer costs are read as ints
+        unit_cost = Decimal(str(unit_cost))
+    return OperationDTO(
+        fields["operation"], unit_cost, fields["quantity"], fields.get("ticker")
+    )
+
+
+# Decoder specialized for the input schema: numbers with a fraction or an
+# exponent go from their source digits straight to Decimal (no float round
+# trip, so no loss of precision), and every object becomes an OperationDTO
+# while the line is scanned, without an intermediate list of dicts.
+_OPERATIONS_DECODER = json.JSONDecoder(
+    parse_float=Decimal, object_hook=to_operation_dto
+)
+
+
+def decode_operations(line: Union[str, bytes]) -> Optional[List[OperationDTO]]:
+    """
+    Decodes a line that follows the input schema. Returns None when the JSON
+    is valid but has another shape, so the generic decoder can handle it (and
+    report the error); malformed JSON raises JSONDecodeError right away.
+    """
+    if isinstance(line, bytes):
+        line = line.decode()
+    try:
+        operations = _OPERATIONS_DECODER.decode(line)
+    except (KeyError, TypeError):  # An object that is not an operation
+        return None
+    if operations.__class__ is not list or not all(
+        op.__class__ is OperationDTO for op in operations
+    ):
+        return None
+    return operations
@@ -0,0 +1,103 @@
+# src/capital_gains_calculator/infrastructure/cli/differential.py
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...application.dtos import OperationDTO, TaxResultDTO
+from ...application.use_cases import CalculateTaxesFromOperationsUseCase
+from ..di_container import AUTO_ENGINE_THRESHOLDS, Engine
+from .encoding import encode_results
+
+# Line numbers of mismatches kept in the report; the count includes all.
+MAX_REPORTED_LINES = 20
+
+# (relative, absolute) tolerance of the taxes of an engine whose output is
+# not byte-identical to the reference. Engines without one must write the
+# same bytes; the float engine differs in the last digits on long lines.
+ENGINE_TOLERANCES: Dict[Engine, Tuple[float, float]] = {
+    Engine.VECTORIZED: (1e-9, 1e-6),
+}
+
+
+def engine_tolerance(engine: Engine) -> Optional[Tuple[float, float]]:
+    """
+    The tolerance of an engine's taxes, if it has one. The auto engine gets
+    the loosest tolerance of the engines in its tiers.
+    """
+    if engine == Engine.AUTO:
+        return max(
+            (
+                ENGINE_TOLERANCES[Engine(name)]
+                for _, name in AUTO_ENGINE_THRESHOLDS
+                if Engine(name) in ENGINE_TOLERANCES
+            ),
+            default=None,
+        )
+    return ENGINE_TOLERANCES.get(engine)
+
+
+@dataclass
+class DifferentialCheckStats:
+    """Counters reported by the differential check (lines are 1-based)."""
+
+    lines: int = 0
+    checked: int = 0
+    mismatches: int = 0
+    mismatched_lines: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def same_taxes(
+    expected: List[TaxResultDTO],
+    actual: List[TaxResultDTO],
+    tolerance: Optional[Tuple[float, float]] = None,
+) -> bool:
+    """
+    Whether two lists of results give the same output bytes or, with a
+    (relative, absolute) tolerance, the same taxes up to that tolerance. A tax
+    where the reference has none (or none where it has one) is a mismatch
+    whatever the tolerance, since it changes whether the sale is taxed.
+    """
+    if tolerance is None:
+        return encode_results(expected) == encode_results(actual)
+    relative, absolute = tolerance
+    return len(expected) == len(actual) and all(
+        (left.tax == 0) == (right.tax == 0)
+        and math.isclose(
+            float(left.tax), float(right.tax), rel_tol=relative, abs_tol=absolute
+        )
+        for left, right in zip(expected, actual)
+    )
+
+
+class DifferentialCheck:
+    """
+    Runs one line out of every `every` through the reference engine as well
+    and compares its output with that of the selected engine, so that a
+    faster engine can be checked against the reference in production.
+    """
+
+    def __init__(
+        self,
+        reference_factory: Callable[[], CalculateTaxesFromOperationsUseCase],
+        every: int,
+        tolerance: Optional[Tuple[float, float]] = None,
+    ):
+        self.stats = DifferentialCheckStats()
+        self._reference_factory = reference_factory
+        self._every = every
+        self._tolerance = tolerance
+
+    def check(self, operations_dto: List[OperationDTO], results: List[TaxResultDTO]):
+        """Counts a computed line, comparing it when it is part of the sample."""
+        self.stats.lines += 1
+        if (self.stats.lines - 1) % self._every:
+            return
+        self.stats.checked += 1
+        expected = self._reference_factory().execute(operations_dto)
+        if not same_taxes(expected, results, self._tolerance):
+            self.stats.mismatches += 1
+            if len(self.stats.mismatched_lines) < MAX_REPORTED_LINES:
+                self.stats.mismatched_lines.append(self.stats.lines)
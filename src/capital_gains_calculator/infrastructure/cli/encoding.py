@@ -0,0 +1,83 @@
+# src/capital_gains_calculator/infrastructure/cli/encoding.py
+import json
+from decimal import Decimal
+from typing import BinaryIO, Dict, Iterable, Optional
+
+from ...application.dtos import TaxResultDTO
+from ...domain.services import ZERO_TAX
+
+# Output bytes buffered before they are written out.
+DEFAULT_FLUSH_BYTES = 1024 * 1024
+
+# Distinct taxes whose encoding is kept; the cache is cleared when it is full.
+_MAX_CACHED_FRAGMENTS = 4096
+
+_ZERO_FRAGMENT = b'{"tax": 0.0}'
+_fragments: Dict[Decimal, bytes] = {}
+
+
+def _fragment(result: TaxResultDTO) -> bytes:
+    """Encodes one result exactly as `json.dumps({"tax": float(tax)})` does."""
+    if result is ZERO_TAX:  # Shared by every engine for zero taxes
+        return _ZERO_FRAGMENT
+    fragment = _fragments.get(result.tax)
+    if fragment is None:
+        if len(_fragments) >= _MAX_CACHED_FRAGMENTS:
+            _fragments.clear()
+        fragment = b'{"tax": ' + json.dumps(float(result.tax)).encode() + b"}"
+        _fragments[result.tax] = fragment
+    return fragment
+
+
+def encode_results(results: Iterable[TaxResultDTO]) -> bytes:
+    """Encodes the results of one line as its JSON output, without the newline."""
+    return b"[" + b", ".join([_fragment(result) for result in results]) + b"]"
+
+
+class OutputEncoder:
+    """
+    Writes the output lines into a reusable buffer and hands it to a binary
+    stream (normally `sys.stdout.buffer`) in large batches, bypassing the text
+    layer. The buffer is written out once it holds `flush_bytes` bytes; with
+    0 every line is written (and flushed) as soon as it is complete. By
+    default, terminals get every line at once and other outputs get batches.
+    """
+
+    def __init__(self, out: BinaryIO, flush_bytes: Optional[int] = None):
+        if flush_bytes is None:
+            flush_bytes = 0 if out.isatty() else DEFAULT_FLUSH_BYTES
+        self._out = out
+        self._flush_bytes = flush_bytes
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "OutputEncoder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def write_results(self, results: Iterable[TaxResultDTO]):
+        """Appends the output line of a list of results."""
+        self.write_encoded(encode_results(results))
+
+    def write_encoded(self, line: bytes):
+        """Appends an output line already encoded by `encode_results`."""
+        self._buffer += line
+        self._end_line()
+
+    def write_output(self, output: str):
+        """Appends an output line that is already formatted."""
+        self._buffer += output.encode()
+        self._end_line()
+
+    def flush(self):
+        """Writes out the buffered lines."""
+        if self._buffer:
+            self._out.write(self._buffer)
+            self._buffer.clear()
+        self._out.flush()
+
+    def _end_line(self):
+        self._buffer += b"\n"
+        if len(self._buffer) >= self._flush_bytes:
+            self.flush()
@@ -0,0 +1,127 @@
+# src/capital_gains_calculator/infrastructure/cli/line_scan.py
+import re
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple, Union
+
+from ...application.dtos import OperationDTO, TaxResultDTO
+from ...domain.fixed_point import from_scaled
+from ...domain.prefix_scan import (
+    chunk_taxes,
+    chunk_transition,
+    ChunkTransition,
+    PositionState,
+    resolve_start_states,
+    share_delta,
+)
+from ...domain.services import ZERO_TAX
+from .processing import parse_line
+
+# Approximate size of the slice of a line computed by a worker at a time.
+DEFAULT_SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+
+# The first pass only needs the type and quantity of each operation, so it
+# reads them straight from the bytes instead of decoding the whole slice.
+_OPERATION_FIELD = re.compile(rb'"operation"\s*:\s*"([^"]*)"')
+_QUANTITY_FIELD = re.compile(rb'"quantity"\s*:\s*(-?\d+)\s*[,}]')
+
+
+def split_operations(line: bytes, chunk_bytes: int) -> List[bytes]:
+    """
+    Splits the JSON array of a line into slices of about `chunk_bytes`, each
+    a comma-separated run of whole operation objects, without the brackets.
+    Operations are flat objects, so every "}" ends one (ticker strings may
+    not contain braces).
+    """
+    start = line.index(b"[") + 1
+    end = line.rindex(b"]")
+    chunks = []
+    while start < end:
+        cut = line.find(b"}", min(start + chunk_bytes, end) - 1, end)
+        cut = end if cut == -1 else cut + 1
+        chunk = line[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        comma = line.find(b",", cut, end)
+        start = end if comma == -1 else comma + 1
+    return chunks
+
+
+def _decode_chunk(chunk: bytes) -> List[OperationDTO]:
+    return parse_line(b"[" + chunk + b"]")
+
+
+# Tasks run in the workers. Each one reads its slice again, so only bytes
+# and a few ints cross the process boundary.
+
+
+def share_delta_task(chunk: bytes) -> int:
+    operations = _OPERATION_FIELD.findall(chunk)
+    quantities = _QUANTITY_FIELD.findall(chunk)
+    if not len(operations) == len(quantities) == chunk.count(b"}"):
+        return share_delta(_decode_chunk(chunk))  # Not one of each per object
+    delta = 0
+    for operation, quantity in zip(operations, quantities):
+        if operation == b"buy":
+            delta += int(quantity)
+        elif operation == b"sell":
+            delta -= int(quantity)
+    return delta
+
+
+def chunk_transition_task(chunk: bytes, shares: int) -> ChunkTransition:
+    return chunk_transition(_decode_chunk(chunk), shares)
+
+
+def chunk_taxes_task(
+    chunk: bytes, state: PositionState
+) -> Tuple[int, List[int], List[int]]:
+    return chunk_taxes(_decode_chunk(chunk), state)
+
+
+class LineScanner:
+    """
+    Computes a single very long line across the workers of an executor,
+    with the same results as the sequential fixed-point (and reference)
+    engine. The line is cut into slices and computed in three passes: the
+    share change of every slice, then the summary of how each slice changes
+    the weighted average cost and the accumulated loss, then the taxes of
+    each slice from its starting state. Between the passes, the parent
+    scans the summaries in order to resolve the state each slice starts from.
+
+    Lines that fit in fewer than two slices, and lines with tickers (which
+    keep one position per stock), are left to the regular engines.
+    """
+
+    def __init__(self, executor: Executor, chunk_bytes: int = DEFAULT_SCAN_CHUNK_BYTES):
+        self._executor = executor
+        self._chunk_bytes = chunk_bytes
+
+    def process(self, line: Union[str, bytes]) -> Optional[List[TaxResultDTO]]:
+        """Returns the results of the line, or None when it is not scanned."""
+        if len(line) < 2 * self._chunk_bytes:
+            return None
+        if isinstance(line, str):
+            line = line.encode()
+        if b'"ticker"' in line:
+            return None
+        chunks = split_operations(line, self._chunk_bytes)
+        if len(chunks) < 2:
+            return None
+
+        start_shares = []
+        shares = 0
+        for delta in self._executor.map(share_delta_task, chunks):
+            start_shares.append(shares)
+            shares += delta
+        transitions = self._executor.map(chunk_transition_task, chunks, start_shares)
+        start_states = resolve_start_states(transitions)
+
+        results: List[TaxResultDTO] = []
+        for count, taxed_positions, taxes in self._executor.map(
+            chunk_taxes_task, chunks, start_states
+        ):
+            offset = len(results)
+            results.extend([ZERO_TAX] * count)
+            for position, tax in zip(taxed_positions, taxes):
+                results[offset + position] = TaxResultDTO(tax=from_scaled(tax))
+        return results
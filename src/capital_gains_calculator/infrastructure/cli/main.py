@@ -1,60 +1,764 @@
 # src/capital_gains_calculator/infrastructure/cli/main.py
+import asyncio
 import json
+import os
+import struct
 import sys
-from decimal import Decimal
-from typing import Any, Dict, List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, List, Optional, TYPE_CHECKING, Union
 
 import typer
-from dependency_injector.wiring import inject, Provide
+from click.core import ParameterSource
+from dependency_injector import providers
+from dependency_injector.wiring import inject, Provide, Provider
 
-from ..di_container import AppContainer
+from ..cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, LineResultCache
+from ..di_container import AppContainer, Engine
+from ..prefix_cache import (
+    DEFAULT_CHECKPOINT_BYTES,
+    DEFAULT_MAX_BYTES as DEFAULT_PREFIX_CACHE_MAX_BYTES,
+    PrefixStateCache,
+)
+from ..profiling import profiling_requested, StageProfiler, TimedTaxCalculator
+from ..server import DEFAULT_HOST, DEFAULT_PORT, TaxServer
+from ..sessions import read_session_states, write_session_states
 from ...application.dtos import OperationDTO
-from ...application.use_cases import CalculateTaxesFromOperationsUseCase
+from ...application.use_cases import (
+    CalculateTaxesFromOperationsUseCase,
+    EvaluateTaxScenariosUseCase,
+)
+from ...domain.portfolio import PortfolioTaxCalculatorService
+from .binary_format import (
+    compute_records,
+    encode_line,
+    InputFormat,
+    read_binary_lines,
+)
+from .differential import DifferentialCheck, engine_tolerance
+from .encoding import DEFAULT_FLUSH_BYTES, OutputEncoder
+from .line_scan import DEFAULT_SCAN_CHUNK_BYTES, LineScanner
+from .mapped_input import iter_mapped_lines, map_file
+from .modes import select_mode
+from .parallel import (
+    DEFAULT_CHUNK_SIZE,
+    execute_file_in_parallel,
+    execute_in_parallel,
+)
+from .pipeline import DEFAULT_QUEUE_DEPTH, LinePipeline
+from .processing import (
+    format_summary,
+    parse_line,
+    process_line_cached,
+    process_line_from_prefix,
+    process_line_into,
+    process_line_profiled,
+    read_lines,
+    summarize_line,
+    to_operation_dto,
+)
+from .result_store import (
+    index_path,
+    IndexedOutputEncoder,
+    parse_line_ranges,
+    ResultStore,
+    totals_path,
+)
+from .streaming import JsonArrayLineReader, write_streamed_output
+
+if TYPE_CHECKING:  # Not imported at run time, to keep start-up lean
+    from ...domain.scenarios import np
 
 app = typer.Typer(invoke_without_command=True)
 
 
-@app.command()
-def main():
+@app.callback()
+def main(
+    ctx: typer.Context,
+    engine: Engine = typer.Option(
+        Engine.REFERENCE,
+        "--engine",
+        help="Calculation engine used for every line; auto picks one per line "
+        "from its number of operations.",
+    ),
+    check_every: Optional[int] = typer.Option(
+        None,
+        "--check-every",
+        min=1,
+        help="Also runs one line out of every N through the reference engine and "
+        "writes the number of mismatches to stderr at exit.",
+    ),
+    input_path: Optional[Path] = typer.Option(
+        None,
+        "--input",
+        exists=True,
+        dir_okay=False,
+        help="Memory-maps this file and reads it instead of stdin.",
+    ),
+    input_format: InputFormat = typer.Option(
+        InputFormat.JSON,
+        "--input-format",
+        help="Format of the input: JSON lines, or the binary records written by "
+        "the convert command.",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", min=1, help="Number of worker processes used to process lines."
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE,
+        "--chunk-size",
+        min=1,
+        help="Number of lines sent to a worker at a time (only with --workers > 1).",
+    ),
+    ticker_workers: int = typer.Option(
+        1,
+        "--ticker-workers",
+        min=1,
+        help="Number of worker processes computing the stocks of a large "
+        "multi-ticker line in parallel.",
+    ),
+    scan_workers: int = typer.Option(
+        1,
+        "--scan-workers",
+        min=1,
+        help="Number of worker processes computing the slices of a very long "
+        "single-stock line in parallel (needs --engine fixed-point). The "
+        "operations before the first sale of every share in a slice are "
+        "replayed in order, so a history that never sells out gets no speedup.",
+    ),
+    scan_chunk_bytes: int = typer.Option(
+        DEFAULT_SCAN_CHUNK_BYTES,
+        "--scan-chunk-bytes",
+        min=1,
+        help="Approximate size of the slices of a line computed by a worker "
+        "(only with --scan-workers > 1); shorter lines are not split.",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Reads, computes and writes each line incrementally, for very long lines.",
+    ),
+    cache_size: Optional[int] = typer.Option(
+        None,
+        "--cache-size",
+        min=0,
+        help="Caches the output of up to N distinct lines (0 disables the cache).",
+    ),
+    cache_memory: int = typer.Option(
+        DEFAULT_MAX_BYTES // (1024 * 1024),
+        "--cache-memory",
+        min=1,
+        help="Memory limit of the cache, in MB.",
+    ),
+    cache_file: Optional[Path] = typer.Option(
+        None,
+        "--cache-file",
+        dir_okay=False,
+        help="Loads the cache from this file and saves it back at exit.",
+    ),
+    cache_stats: bool = typer.Option(
+        False, "--cache-stats", help="Writes the cache counters to stderr at exit."
+    ),
+    prefix_cache_size: int = typer.Option(
+        0,
+        "--prefix-cache-size",
+        min=0,
+        help="Keeps the state reached at up to N checkpoints of the lines, so "
+        "lines starting with the same operations resume from the deepest one "
+        "they share (0 disables the prefix cache).",
+    ),
+    prefix_cache_memory: int = typer.Option(
+        DEFAULT_PREFIX_CACHE_MAX_BYTES // (1024 * 1024),
+        "--prefix-cache-memory",
+        min=1,
+        help="Memory limit of the prefix cache, in MB.",
+    ),
+    checkpoint_bytes: int = typer.Option(
+        DEFAULT_CHECKPOINT_BYTES,
+        "--checkpoint-bytes",
+        min=1,
+        help="Approximate spacing of the prefix cache checkpoints in a line, "
+        "in bytes.",
+    ),
+    prefix_cache_stats: bool = typer.Option(
+        False,
+        "--prefix-cache-stats",
+        help="Writes the prefix cache counters, including how deep the lines "
+        "resumed, to stderr at exit.",
+    ),
+    resume_from: Optional[Path] = typer.Option(
+        None,
+        "--resume-from",
+        exists=True,
+        dir_okay=False,
+        help="Starts each line from the state saved for it by --save-state.",
+    ),
+    save_state: Optional[Path] = typer.Option(
+        None,
+        "--save-state",
+        dir_okay=False,
+        help="Saves the state reached by each line, to resume it later.",
+    ),
+    pipeline_enabled: bool = typer.Option(
+        False,
+        "--pipeline",
+        help="Reads, computes and writes in separate stages connected by "
+        "bounded queues, so input and output latency overlap the computation.",
+    ),
+    queue_depth: int = typer.Option(
+        DEFAULT_QUEUE_DEPTH,
+        "--queue-depth",
+        min=1,
+        help="Batches of lines each pipeline queue may hold before the stage "
+        "feeding it waits (only with --pipeline).",
+    ),
+    pipeline_stats: bool = typer.Option(
+        False,
+        "--pipeline-stats",
+        help="Writes the queue depths and stall times to stderr at exit.",
+    ),
+    summary: bool = typer.Option(
+        False,
+        "--summary",
+        help="Writes one record of totals per line (total tax, taxable sells and "
+        "final position) instead of a tax per operation.",
+    ),
+    results_file: Optional[Path] = typer.Option(
+        None,
+        "--results-file",
+        dir_okay=False,
+        help="Writes the output to this file instead of stdout, with an index of "
+        "where each line starts (FILE.idx), for the query command.",
+    ),
+    results_totals: bool = typer.Option(
+        False,
+        "--results-totals",
+        help="Also writes the total tax and taxed sells of every line to "
+        "FILE.totals (only with --results-file).",
+    ),
+    flush_bytes: Optional[int] = typer.Option(
+        None,
+        "--flush-bytes",
+        min=0,
+        help="Writes the output in batches of about this many bytes; 0 writes "
+        "every line as soon as it is computed. [default: 0 on a terminal, "
+        f"{DEFAULT_FLUSH_BYTES} otherwise]",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Writes a JSON report with the time spent in each stage to stderr at "
+        "exit (also enabled by CAPITAL_GAINS_PROFILE=1).",
+    ),
+):
     """
     Processes capital gains operations from standard input (stdin).
     """
-    _execute_process()
+    if ctx.invoked_subcommand is not None:
+        return
+
+    if cache_size is None:
+        cache_size = DEFAULT_MAX_ENTRIES if cache_file else 0
+    profile = profile or profiling_requested()
+    binary = input_format == InputFormat.BINARY
+    resumable = resume_from is not None or save_state is not None
+    options = {
+        "--input-format binary": binary,
+        "--profile": profile,
+        "--resume-from": resume_from is not None,
+        "--save-state": save_state is not None,
+        "--stream": stream,
+        "--workers": workers > 1,
+        "--cache-size": bool(cache_size),
+        "--summary": summary,
+        "--check-every": check_every is not None,
+        "--scan-workers": scan_workers > 1,
+        "--prefix-cache-size": bool(prefix_cache_size),
+        "--input": input_path is not None,
+        "--ticker-workers": ticker_workers > 1,
+        "--pipeline": pipeline_enabled,
+        "--results-file": results_file is not None,
+        "--results-totals": results_totals,
+        "--flush-bytes": flush_bytes is not None,
+        "--cache-file": cache_file is not None,
+        "--cache-stats": cache_stats,
+        "--prefix-cache-stats": prefix_cache_stats,
+        "--pipeline-stats": pipeline_stats,
+        # Tuning options with a default count when given on the command line
+        **{
+            f"--{name.replace('_', '-')}": ctx.get_parameter_source(name)
+            != ParameterSource.DEFAULT
+            for name in (
+                "chunk_size",
+                "scan_chunk_bytes",
+                "cache_memory",
+                "prefix_cache_memory",
+                "checkpoint_bytes",
+                "queue_depth",
+            )
+        },
+    }
+    try:
+        select_mode([option for option, given in options.items() if given], engine)
+    except ValueError as error:
+        raise typer.BadParameter(str(error))
+
+    check = _create_differential_check(check_every, engine) if check_every else None
+
+    prefix_cache = None
+    if prefix_cache_size:
+        prefix_cache = PrefixStateCache(
+            max_entries=prefix_cache_size,
+            max_bytes=prefix_cache_memory * 1024 * 1024,
+            checkpoint_bytes=checkpoint_bytes,
+        )
+
+    pipeline = LinePipeline(queue_depth, queue_depth) if pipeline_enabled else None
+
+    _select_engine(engine)
+
+    with ExitStack() as resources:
+        if ticker_workers > 1:
+            _select_portfolio_executor(
+                resources.enter_context(ProcessPoolExecutor(max_workers=ticker_workers))
+            )
+        scanner = None
+        if scan_workers > 1:
+            scanner = LineScanner(
+                resources.enter_context(ProcessPoolExecutor(max_workers=scan_workers)),
+                scan_chunk_bytes,
+            )
+        if results_file is not None:
+            totals_out = None
+            if results_totals:
+                totals_out = resources.enter_context(
+                    open(totals_path(results_file), "wb")
+                )
+            else:  # The totals of an earlier run would not match the new lines
+                totals_path(results_file).unlink(missing_ok=True)
+            encoder = resources.enter_context(
+                IndexedOutputEncoder(
+                    resources.enter_context(open(results_file, "wb")),
+                    resources.enter_context(open(index_path(results_file), "wb")),
+                    totals_out,
+                    flush_bytes,
+                )
+            )
+        else:
+            encoder = resources.enter_context(
+                OutputEncoder(sys.stdout.buffer, flush_bytes)
+            )
+
+        if binary:
+            stream_in = (
+                resources.enter_context(open(input_path, "rb"))
+                if input_path is not None
+                else sys.stdin.buffer
+            )
+            _execute_binary_process(encoder, stream_in, engine, pipeline)
+        elif profile:
+            profiler = StageProfiler()
+            _execute_profiled_process(encoder, profiler)
+            profiler.emit(sys.stderr)
+        elif resumable:
+            _execute_resumable_process(encoder, resume_from, save_state)
+        elif stream:
+            _execute_streaming_process(summary)
+        elif workers > 1:
+            _execute_parallel_process(encoder, workers, chunk_size, engine, input_path)
+        elif cache_size:
+            cache = LineResultCache(
+                max_entries=cache_size,
+                max_bytes=cache_memory * 1024 * 1024,
+                path=cache_file,
+                namespace=engine.value,
+            )
+            _execute_process(
+                encoder, read_lines(sys.stdin), cache=cache, pipeline=pipeline
+            )
+            cache.save()
+            if cache_stats:
+                print(json.dumps({"cache": cache.stats.to_dict()}), file=sys.stderr)
+        elif input_path is not None:
+            with map_file(input_path) as buffer:
+                _execute_process(
+                    encoder,
+                    iter_mapped_lines(buffer),
+                    pipeline=pipeline,
+                    summary=summary,
+                    check=check,
+                    scanner=scanner,
+                    prefix_cache=prefix_cache,
+                )
+        else:
+            _execute_process(
+                encoder,
+                read_lines(sys.stdin),
+                pipeline=pipeline,
+                summary=summary,
+                check=check,
+                scanner=scanner,
+                prefix_cache=prefix_cache,
+            )
+
+    if check is not None:
+        print(json.dumps({"check": check.stats.to_dict()}), file=sys.stderr)
+    if prefix_cache is not None and prefix_cache_stats:
+        print(
+            json.dumps({"prefix_cache": prefix_cache.stats.to_dict()}),
+            file=sys.stderr,
+        )
+    if pipeline is not None and pipeline_stats:
+        print(json.dumps({"pipeline": pipeline.stats.to_dict()}), file=sys.stderr)
+
+
+@app.command()
+def serve(
+    engine: Engine = typer.Option(
+        Engine.REFERENCE, "--engine", help="Calculation engine used for every line."
+    ),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "--workers",
+        min=1,
+        help="Number of worker processes computing the requests.",
+    ),
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket", dir_okay=False, help="Listens on this Unix domain socket."
+    ),
+    host: str = typer.Option(
+        DEFAULT_HOST, "--host", help="TCP host (without --socket)."
+    ),
+    port: int = typer.Option(
+        DEFAULT_PORT, "--port", help="TCP port (without --socket)."
+    ),
+):
+    """
+    Serves newline-delimited operation lists over a socket, replying with the
+    same output as standard input processing.
+    """
+    server = TaxServer(engine, workers)
+    asyncio.run(server.serve(socket_path=socket_path, host=host, port=port))
+
+
+@app.command()
+def scenarios(
+    prices: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="Unit-cost scenarios: a .npy matrix or a CSV file, with one row per "
+        "scenario and one column per operation.",
+    ),
+    per_operation: bool = typer.Option(
+        False,
+        "--per-operation",
+        help="Writes the tax of every operation of each scenario instead of its "
+        "totals.",
+    ),
+):
+    """
+    Evaluates the first line of operations from stdin under every unit-cost
+    scenario at once, writing one output line per scenario.
+    """
+    from .scenarios import load_unit_costs  # Imports numpy
+
+    unit_costs = load_unit_costs(prices)
+    line = next(read_lines(sys.stdin), None)
+    if line is None:
+        return
+    with OutputEncoder(sys.stdout.buffer) as encoder:
+        try:
+            _execute_scenarios(encoder, parse_line(line), unit_costs, per_operation)
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint="PRICES")
+
+
+@app.command()
+def convert():
+    """
+    Converts the JSON operation lines from stdin into the binary input format
+    (read with --input-format binary), written to stdout.
+    """
+    out = sys.stdout.buffer
+    for number, line in enumerate(read_lines(sys.stdin), 1):
+        try:
+            out.write(encode_line(parse_line(line)))
+        except (ValueError, struct.error) as error:
+            raise typer.BadParameter(f"Line {number}: {error}", param_hint="stdin")
+    out.flush()
+
+
+@app.command()
+def query(
+    results_file: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="Results file written with --results-file.",
+    ),
+    lines: List[str] = typer.Argument(
+        ..., help="Line numbers (from 1) or inclusive ranges such as 10-20."
+    ),
+    totals: bool = typer.Option(
+        False,
+        "--totals",
+        help="Writes the totals of each line (from --results-totals) instead of "
+        "its results.",
+    ),
+):
+    """
+    Writes the output of the given input lines from a results file, reading
+    only those lines through the index.
+    """
+    try:
+        line_ranges = parse_line_ranges(lines)
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="LINES")
+    try:
+        store = ResultStore(results_file)
+    except FileNotFoundError as error:
+        raise typer.BadParameter(
+            f"{error.filename} does not exist: write the results file with "
+            "--results-file.",
+            param_hint="RESULTS_FILE",
+        )
+    out = sys.stdout.buffer
+    with store:
+        try:
+            for first, last in line_ranges:
+                if not totals:
+                    out.write(store.read_lines(first, last))
+                    continue
+                for line in range(first, last + 1):
+                    total_tax, taxable_sells = store.read_totals(line)
+                    record = {"total-tax": total_tax, "taxable-sells": taxable_sells}
+                    out.write(json.dumps(record).encode() + b"\n")
+        except ValueError as error:
+            raise typer.BadParameter(str(error), param_hint="LINES")
+    out.flush()
+
+
+@inject
+def _select_engine(
+    engine: Engine, config: providers.Configuration = Provider[AppContainer.config]
+):
+    """Configures which calculation engine the container provides."""
+    config.engine.from_value(engine.value)
+
+
+@inject
+def _create_differential_check(
+    every: int,
+    engine: Engine,
+    reference_factory: Callable[[], CalculateTaxesFromOperationsUseCase] = Provide[
+        AppContainer.reference_use_case.provider
+    ],
+) -> DifferentialCheck:
+    """Checks a sample of the lines against the reference engine."""
+    return DifferentialCheck(reference_factory, every, engine_tolerance(engine))
+
+
+@inject
+def _select_portfolio_executor(
+    executor: ProcessPoolExecutor,
+    portfolio_executor: providers.Object = Provider[AppContainer.portfolio_executor],
+):
+    """Lets the portfolio service compute the stocks of large lines in parallel."""
+    portfolio_executor.override(providers.Object(executor))
 
 
 @inject
 def _execute_process(
-    use_case: CalculateTaxesFromOperationsUseCase = Provide[
-        AppContainer.calculate_taxes_use_case
+    encoder: OutputEncoder,
+    lines: Iterable[Union[str, bytes]],
+    cache: Optional[LineResultCache] = None,
+    pipeline: Optional[LinePipeline] = None,
+    summary: bool = False,
+    check: Optional[DifferentialCheck] = None,
+    scanner: Optional[LineScanner] = None,
+    prefix_cache: Optional[PrefixStateCache] = None,
+    use_case_factory: Callable[[], CalculateTaxesFromOperationsUseCase] = Provide[
+        AppContainer.calculate_taxes_use_case.provider
     ],
 ):
     """Contains the actual logic and receives the injected dependency."""
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            break
-
-        operations_dto = _parse_line(line)
-        tax_results_dto = use_case.execute(operations_dto)
-
-        output_data = [{"tax": float(result.tax)} for result in tax_results_dto]
-        json_output = _format_output(output_data)
-        print(json_output)
-
-
-def _parse_line(line: str) -> List[OperationDTO]:
-    """Converts a JSON string line into a list of OperationDTOs."""
-    operations_raw = json.loads(line)
-    return [
-        OperationDTO(
-            operation=op["operation"],
-            unit_cost=Decimal(str(op["unit-cost"])),
-            quantity=op["quantity"],
+    # Each line is an independent simulation, so it gets a fresh use case
+    # (and therefore a fresh TaxCalculatorService).
+    if summary:
+
+        def compute(line):
+            return summarize_line(line, use_case_factory())
+
+        write = encoder.write_output
+    elif check is not None:
+
+        def compute(line):
+            operations_dto = parse_line(line)
+            tax_results_dto = use_case_factory().execute(operations_dto)
+            check.check(operations_dto, tax_results_dto)
+            return tax_results_dto
+
+        write = encoder.write_results
+    elif scanner is not None:
+
+        def compute(line):
+            tax_results_dto = scanner.process(line)
+            if tax_results_dto is None:  # Not long enough to split
+                tax_results_dto = use_case_factory().execute(parse_line(line))
+            return tax_results_dto
+
+        write = encoder.write_results
+    elif prefix_cache is not None:
+
+        def compute(line):
+            return process_line_from_prefix(line, use_case_factory, prefix_cache)
+
+        write = encoder.write_results
+    elif cache is None:
+
+        def compute(line):
+            return use_case_factory().execute(parse_line(line))
+
+        write = encoder.write_results
+    else:
+
+        def compute(line):
+            return process_line_cached(line, use_case_factory, cache)
+
+        write = encoder.write_output
+
+    if pipeline is not None:
+        pipeline.run(lines, compute, write)
+    else:
+        for line in lines:
+            write(compute(line))
+
+
+@inject
+def _execute_resumable_process(
+    encoder: OutputEncoder,
+    resume_from: Optional[Path],
+    save_state: Optional[Path],
+    use_case_factory: Callable[[], CalculateTaxesFromOperationsUseCase] = Provide[
+        AppContainer.calculate_taxes_use_case.provider
+    ],
+):
+    """
+    Sequential processing where line N starts from the N-th saved state (lines
+    past the end of the file start empty) and its final state is saved. Saved
+    states past the end of the input are kept as they are.
+    """
+    saved_states = read_session_states(resume_from) if resume_from else iter(())
+    final_states = []
+    for line in read_lines(sys.stdin):
+        use_case = use_case_factory()
+        saved_state = next(saved_states, None)
+        if saved_state is not None:
+            use_case.restore(saved_state)
+        process_line_into(line, use_case, encoder)
+        final_states.append(use_case.snapshot())
+    if save_state is not None:
+        final_states.extend(saved_states)
+        write_session_states(save_state, final_states)
+
+
+@inject
+def _execute_profiled_process(
+    encoder: OutputEncoder,
+    profiler: StageProfiler,
+    tax_calculator_factory: Callable[[], PortfolioTaxCalculatorService] = Provide[
+        AppContainer.portfolio_tax_calculator_service.provider
+    ],
+):
+    """Sequential processing with timing hooks around every stage."""
+    for line in read_lines(sys.stdin):
+        use_case = CalculateTaxesFromOperationsUseCase(
+            TimedTaxCalculator(tax_calculator_factory(), profiler)
         )
-        for op in operations_raw
-    ]
+        process_line_profiled(line, use_case, profiler, encoder)
+    # The last batch is written out here, not after the report
+    wall, cpu = time.perf_counter(), time.process_time()
+    encoder.flush()
+    profiler.add("write", time.perf_counter() - wall, time.process_time() - cpu)
+
 
+@inject
+def _execute_streaming_process(
+    summary: bool = False,
+    use_case_factory: Callable[[], CalculateTaxesFromOperationsUseCase] = Provide[
+        AppContainer.calculate_taxes_use_case.provider
+    ],
+):
+    """Streams every line through the use case, keeping memory use constant."""
+    for operations_raw in JsonArrayLineReader(sys.stdin):
+        operations_dto = (to_operation_dto(op) for op in operations_raw)
+        if summary:
+            totals = use_case_factory().execute_summary(operations_dto)
+            sys.stdout.write(format_summary(totals) + "\n")
+        else:
+            write_streamed_output(
+                use_case_factory().execute_stream(operations_dto), sys.stdout
+            )
 
-def _format_output(results: List[Dict[str, Any]]) -> str:
-    """Formats the list of dictionaries back into a JSON string."""
-    return json.dumps(results)
\ No newline at end of file
+
+@inject
+def _execute_scenarios(
+    encoder: OutputEncoder,
+    operations_dto: List[OperationDTO],
+    unit_costs: "np.ndarray",
+    per_operation: bool,
+    use_case: EvaluateTaxScenariosUseCase = Provide[
+        AppContainer.evaluate_tax_scenarios_use_case
+    ],
+):
+    """Computes the scenarios in one batch and writes a line for each of them."""
+    from .scenarios import format_scenario_taxes, format_scenario_totals
+
+    if per_operation:
+        outputs = format_scenario_taxes(use_case.execute(operations_dto, unit_costs))
+    else:
+        outputs = format_scenario_totals(
+            *use_case.execute_summary(operations_dto, unit_costs)
+        )
+    for output in outputs:
+        encoder.write_output(output)
+
+
+def _execute_binary_process(
+    encoder: OutputEncoder,
+    stream: BinaryIO,
+    engine: Engine,
+    pipeline: Optional[LinePipeline] = None,
+):
+    """Computes the records of each binary line straight from its bytes."""
+    lines = read_binary_lines(stream)
+
+    def compute(records):
+        return compute_records(records, engine)
+
+    if pipeline is not None:
+        pipeline.run(lines, compute, encoder.write_results)
+    else:
+        for records in lines:
+            encoder.write_results(compute(records))
+
+
+def _execute_parallel_process(
+    encoder: OutputEncoder,
+    workers: int,
+    chunk_size: int,
+    engine: Engine,
+    input_path: Optional[Path] = None,
+):
+    """Processes the lines in a process pool, writing the output in input order."""
+    if input_path is not None:
+        results = execute_file_in_parallel(input_path, workers, engine=engine)
+    else:
+        lines = read_lines(sys.stdin)
+        results = execute_in_parallel(lines, workers, chunk_size, engine)
+    for outputs in results:
+        for output in outputs:
+            encoder.write_output(output)
@@ -0,0 +1,76 @@
+# src/capital_gains_calculator/infrastructure/cli/mapped_input.py
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+# Approximate size of the byte range sent to a worker at a time.
+DEFAULT_RANGE_BYTES = 4 * 1024 * 1024
+
+Buffer = Union[mmap.mmap, bytes]
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[Buffer]:
+    """
+    Maps an input file into memory, read-only. Pages are loaded on demand and
+    can be dropped by the OS at any time, so memory use does not grow with the
+    size of the file.
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            yield b""
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def split_byte_ranges(
+    buffer: Buffer, range_bytes: int = DEFAULT_RANGE_BYTES
+) -> Iterator[Tuple[int, int]]:
+    """
+    Splits the buffer into (start, end) ranges of about `range_bytes`, each
+    ending right after a newline so that no line is cut in two.
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        newline = buffer.find(b"\n", min(start + range_bytes, size) - 1)
+        end = size if newline == -1 else newline + 1
+        yield start, end
+        start = end
+
+
+def read_range(buffer: Buffer, start: int, end: int) -> Tuple[List[bytes], bool]:
+    """
+    Returns the stripped lines of buffer[start:end] up to the first empty
+    line, and whether that empty line (the end of the input) was reached.
+    Only the bytes of each line are copied out of the buffer. They skip the
+    text layer of a file read (its buffering and newline translation), but
+    each line is still decoded to text by the parser.
+    """
+    lines = []
+    position = start
+    while position < end:
+        newline = buffer.find(b"\n", position, end)
+        if newline == -1:
+            newline = end
+        line = buffer[position:newline].strip()
+        if not line:
+            return lines, True
+        lines.append(line)
+        position = newline + 1
+    return lines, False
+
+
+def iter_mapped_lines(buffer: Buffer) -> Iterator[bytes]:
+    """Yields the lines of the buffer until the first empty line, like `read_lines`."""
+    for start, end in split_byte_ranges(buffer):
+        lines, ended = read_range(buffer, start, end)
+        yield from lines
+        if ended:
+            return
@@ -0,0 +1,103 @@
+# src/capital_gains_calculator/infrastructure/cli/modes.py
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from ..di_container import Engine
+
+# Options that change how the output is written, supported by every mode that
+# writes through the output encoder.
+_ENCODER_OPTIONS = frozenset({"--results-file", "--results-totals", "--flush-bytes"})
+
+_PIPELINE_OPTIONS = frozenset({"--pipeline", "--queue-depth", "--pipeline-stats"})
+
+# Options of the sequential modes, which compute the lines one at a time with
+# a fresh use case each.
+_SEQUENTIAL_OPTIONS = (
+    _ENCODER_OPTIONS | _PIPELINE_OPTIONS | {"--input", "--ticker-workers"}
+)
+
+
+@dataclass(frozen=True)
+class Mode:
+    """
+    A way of processing the input, selected by `option` (None for the default
+    sequential mode), with the other options and the engines it supports.
+    """
+
+    option: Optional[str]
+    options: FrozenSet[str]
+    engines: FrozenSet[Engine] = frozenset(Engine)
+
+
+# Processing modes, in the order the command picks them: a run is in the first
+# mode whose option is given. Any other option given must be supported by that
+# mode, so that no option is silently ignored.
+MODES: Tuple[Mode, ...] = (
+    Mode("--input-format binary", _ENCODER_OPTIONS | _PIPELINE_OPTIONS | {"--input"}),
+    Mode("--profile", frozenset({"--ticker-workers", "--flush-bytes"})),
+    Mode("--resume-from", _ENCODER_OPTIONS | {"--save-state", "--ticker-workers"}),
+    Mode("--save-state", _ENCODER_OPTIONS | {"--ticker-workers"}),
+    # Each line is written while it is computed, straight to stdout
+    Mode(
+        "--stream",
+        frozenset({"--summary"}),
+        frozenset(Engine) - {Engine.VECTORIZED},  # Computes a line as one batch
+    ),
+    Mode("--workers", _ENCODER_OPTIONS | {"--input", "--chunk-size"}),
+    Mode(
+        "--cache-size",
+        (_SEQUENTIAL_OPTIONS - {"--input"})
+        | {"--cache-memory", "--cache-file", "--cache-stats"},
+    ),
+    # Totals are computed from the whole results, not from the positions
+    Mode("--summary", _SEQUENTIAL_OPTIONS - {"--ticker-workers", "--results-totals"}),
+    Mode("--check-every", _SEQUENTIAL_OPTIONS),
+    # Slices are computed with the fixed-point engine's integers
+    Mode(
+        "--scan-workers",
+        _SEQUENTIAL_OPTIONS | {"--scan-chunk-bytes"},
+        frozenset({Engine.FIXED_POINT}),
+    ),
+    Mode(
+        "--prefix-cache-size",
+        _SEQUENTIAL_OPTIONS
+        | {"--prefix-cache-memory", "--checkpoint-bytes", "--prefix-cache-stats"},
+    ),
+    Mode(None, _SEQUENTIAL_OPTIONS),
+)
+
+# Options that only tune another one, and mean nothing without it.
+OPTION_REQUIREMENTS: Dict[str, str] = {
+    "--chunk-size": "--workers",
+    "--scan-chunk-bytes": "--scan-workers",
+    "--cache-memory": "--cache-size",
+    "--cache-file": "--cache-size",
+    "--cache-stats": "--cache-size",
+    "--prefix-cache-memory": "--prefix-cache-size",
+    "--checkpoint-bytes": "--prefix-cache-size",
+    "--prefix-cache-stats": "--prefix-cache-size",
+    "--queue-depth": "--pipeline",
+    "--pipeline-stats": "--pipeline",
+    "--results-totals": "--results-file",
+}
+
+
+def select_mode(options: Iterable[str], engine: Engine) -> Mode:
+    """
+    Returns the mode of a run given its options, raising ValueError for any
+    option or engine the mode does not support.
+    """
+    options = set(options)
+    for option, required in OPTION_REQUIREMENTS.items():
+        if option in options and required not in options:
+            raise ValueError(f"{option} requires {required}.")
+
+    mode = next(mode for mode in MODES if mode.option in options or not mode.option)
+    unsupported = sorted(options - mode.options - {mode.option})
+    if unsupported:
+        raise ValueError(f"{unsupported[0]} cannot be combined with {mode.option}.")
+    if engine not in mode.engines:
+        raise ValueError(
+            f"--engine {engine.value} cannot be combined with {mode.option}."
+        )
+    return mode
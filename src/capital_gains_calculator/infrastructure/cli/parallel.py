@@ -0,0 +1,114 @@
+# src/capital_gains_calculator/infrastructure/cli/parallel.py
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from ..di_container import AppContainer, Engine
+from ...application.use_cases import CalculateTaxesFromOperationsUseCase
+from .mapped_input import DEFAULT_RANGE_BYTES, map_file, read_range, split_byte_ranges
+from .processing import process_line
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Number of chunks each worker may have queued ahead of the writer.
+_IN_FLIGHT_PER_WORKER = 2
+
+# Set once per worker process by `init_worker`.
+_use_case_factory: Optional[Callable[[], CalculateTaxesFromOperationsUseCase]] = None
+
+
+def init_worker(engine: Engine):
+    """Builds the worker's own container, so no state is shared with the parent."""
+    global _use_case_factory
+    container = AppContainer()
+    container.config.engine.from_value(engine.value)
+    _use_case_factory = container.calculate_taxes_use_case
+
+
+def process_chunk(lines: List[str]) -> List[str]:
+    """Processes a chunk of lines inside a worker, one fresh use case per line."""
+    return [process_line(line, _use_case_factory()) for line in lines]
+
+
+def process_byte_range(path: Path, start: int, end: int) -> Tuple[List[str], bool]:
+    """
+    Maps the input file inside a worker and processes the lines of one byte
+    range. Also tells whether the range holds the empty line ending the input.
+    """
+    with map_file(path) as buffer:
+        lines, ended = read_range(buffer, start, end)
+    return [process_line(line, _use_case_factory()) for line in lines], ended
+
+
+def _chunked(lines: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    iterator = iter(lines)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def execute_in_parallel(
+    lines: Iterable[str],
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    engine: Engine = Engine.REFERENCE,
+) -> Iterator[List[str]]:
+    """
+    Sends chunks of lines to a process pool and yields the output of each
+    chunk in input order. Only a bounded number of chunks is in flight at a
+    time, so the input is consumed lazily.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(engine,)
+    ) as executor:
+        yield from _results_in_order(
+            executor,
+            ((process_chunk, (chunk,)) for chunk in _chunked(lines, chunk_size)),
+            workers * _IN_FLIGHT_PER_WORKER,
+        )
+
+
+def execute_file_in_parallel(
+    path: Path,
+    workers: int,
+    range_bytes: int = DEFAULT_RANGE_BYTES,
+    engine: Engine = Engine.REFERENCE,
+) -> Iterator[List[str]]:
+    """
+    Splits a memory-mapped input file into byte ranges at newline boundaries
+    and yields the output of each range in file order. Workers map the file
+    themselves, so only the range offsets are sent to them.
+    """
+    with map_file(path) as buffer:
+        ranges = list(split_byte_ranges(buffer, range_bytes))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(engine,)
+    ) as executor:
+        for outputs, ended in _results_in_order(
+            executor,
+            ((process_byte_range, (path, start, end)) for start, end in ranges),
+            workers * _IN_FLIGHT_PER_WORKER,
+        ):
+            yield outputs
+            if ended:
+                executor.shutdown(cancel_futures=True)
+                return
+
+
+def _results_in_order(
+    executor: Executor,
+    calls: Iterable[Tuple[Callable[..., Any], Tuple[Any, ...]]],
+    max_in_flight: int,
+) -> Iterator[Any]:
+    """
+    Submits the (function, arguments) calls lazily, keeping at most `max_in_flight` of them running,
+    and yields their results in submission order.
+    """
+    pending: Deque[Future] = deque()
+    for function, arguments in calls:
+        pending.append(executor.submit(function, *arguments))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,180 @@
+# src/capital_gains_calculator/infrastructure/cli/pipeline.py
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+DEFAULT_QUEUE_DEPTH = 64
+
+# Lines handed to the next stage at once while it is busy; an idle stage gets
+# every line as soon as it is available.
+MAX_BATCH_LINES = 64
+
+# How often a blocked stage checks whether the pipeline was stopped.
+_POLL_SECONDS = 0.1
+
+_END = object()
+
+Line = TypeVar("Line")
+Output = TypeVar("Output")
+
+
+class _Stopped(Exception):
+    """Raised in a stage when another stage failed."""
+
+
+@dataclass
+class PipelineStats:
+    """
+    Counters reported by the pipeline. Stall times are the seconds a stage
+    spent blocked: the reader and the compute stage on a full queue
+    (backpressure), the compute stage and the writer on an empty one.
+    """
+
+    lines: int = 0
+    input_queue_max_depth: int = 0
+    output_queue_max_depth: int = 0
+    reader_stall_seconds: float = 0.0
+    compute_input_stall_seconds: float = 0.0
+    compute_output_stall_seconds: float = 0.0
+    writer_stall_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LinePipeline(Generic[Line, Output]):
+    """
+    Runs the lines through three stages connected by bounded queues: a reader
+    thread consumes the input, the calling thread computes each line and a
+    writer thread writes the outputs, in input order. When a stage falls
+    behind, the queue before it fills up and the stages upstream wait, so at
+    most `input_depth + output_depth` batches of lines are held in memory.
+    """
+
+    def __init__(
+        self,
+        input_depth: int = DEFAULT_QUEUE_DEPTH,
+        output_depth: int = DEFAULT_QUEUE_DEPTH,
+    ):
+        self.stats = PipelineStats()
+        self._inputs: queue.Queue = queue.Queue(maxsize=input_depth)
+        self._outputs: queue.Queue = queue.Queue(maxsize=output_depth)
+        self._stopped = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(
+        self,
+        lines: Iterable[Line],
+        compute: Callable[[Line], Output],
+        write: Callable[[Output], None],
+    ):
+        """
+        Computes and writes every line (the iterable decides where the input
+        ends, e.g. `read_lines` stops at the first empty line). The first error
+        raised by any stage is raised again here, once the outputs computed
+        before it have been written.
+        """
+        reader = threading.Thread(target=self._read, args=(lines,), daemon=True)
+        writer = threading.Thread(
+            target=self._write_outputs, args=(write,), daemon=True
+        )
+        reader.start()
+        writer.start()
+        try:
+            while (batch := self._get(self._inputs, "compute_input")) is not _END:
+                outputs = []
+                try:
+                    for line in batch:
+                        outputs.append(compute(line))
+                finally:  # Lines computed before an error are still written
+                    self._put(self._outputs, outputs, "compute_output")
+                    self.stats.lines += len(outputs)
+            self._put(self._outputs, _END, "compute_output")
+        except _Stopped:
+            pass
+        except BaseException as error:
+            self._fail(error)
+        writer.join()
+        if self._error is not None:
+            # The reader may be blocked on its input; it is a daemon thread.
+            raise self._error
+        reader.join()
+
+    def _read(self, lines: Iterable[Line]):
+        try:
+            batch = []
+            for line in lines:
+                batch.append(line)
+                if len(batch) >= MAX_BATCH_LINES or self._inputs.empty():
+                    self._put(self._inputs, batch, "reader")
+                    batch = []
+            if batch:
+                self._put(self._inputs, batch, "reader")
+            self._put(self._inputs, _END, "reader")
+        except _Stopped:
+            pass
+        except BaseException as error:
+            self._fail(error)
+
+    def _write_outputs(self, write: Callable[[Output], None]):
+        try:
+            while (batch := self._get(self._outputs, "writer")) is not _END:
+                for output in batch:
+                    write(output)
+        except _Stopped:
+            pass
+        except BaseException as error:
+            self._fail(error)
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stopped.set()
+
+    def _put(self, target: queue.Queue, item: Any, stage: str):
+        """Blocks while the queue is full, unless the pipeline is stopped."""
+        try:
+            target.put_nowait(item)
+        except queue.Full:
+            started = time.perf_counter()
+            while True:
+                try:
+                    target.put(item, timeout=_POLL_SECONDS)
+                    break
+                except queue.Full:
+                    if self._stopped.is_set():
+                        raise _Stopped()
+            self._add_stall(stage, time.perf_counter() - started)
+        depth_field = (
+            "input_queue_max_depth"
+            if target is self._inputs
+            else "output_queue_max_depth"
+        )
+        setattr(
+            self.stats,
+            depth_field,
+            max(getattr(self.stats, depth_field), target.qsize()),
+        )
+
+    def _get(self, source: queue.Queue, stage: str) -> Any:
+        """Blocks while the queue is empty; a stopped pipeline is drained first."""
+        try:
+            return source.get_nowait()
+        except queue.Empty:
+            pass
+        started = time.perf_counter()
+        while True:
+            try:
+                item = source.get(timeout=_POLL_SECONDS)
+                break
+            except queue.Empty:
+                if self._stopped.is_set():
+                    raise _Stopped()
+        self._add_stall(stage, time.perf_counter() - started)
+        return item
+
+    def _add_stall(self, stage: str, seconds: float):
+        name = f"{stage}_stall_seconds"
+        setattr(self.stats, name, getattr(self.stats, name) + seconds)
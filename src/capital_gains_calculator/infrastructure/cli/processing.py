@@ -0,0 +1,177 @@
+# src/capital_gains_calculator/infrastructure/cli/processing.py
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union
+
+from ...application.dtos import (
+    OperationDTO,
+    PositionSnapshotDTO,
+    TaxResultDTO,
+    TaxSummaryDTO,
+)
+from ...application.use_cases import CalculateTaxesFromOperationsUseCase
+from ..cache import LineResultCache
+from ..prefix_cache import PrefixEntry, PrefixStateCache
+from ..profiling import StageProfiler
+from .decoding import decode_operations, to_operation_dto
+from .encoding import encode_results, OutputEncoder
+
+
+def read_lines(stream: Iterable[str]) -> Iterator[str]:
+    """Yields the stripped input lines until the first empty line."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            break
+        yield line
+
+
+def process_line(
+    line: Union[str, bytes], use_case: CalculateTaxesFromOperationsUseCase
+) -> str:
+    """Runs a single input line through the use case and returns its JSON output."""
+    operations_dto = parse_line(line)
+    tax_results_dto = use_case.execute(operations_dto)
+    return encode_results(tax_results_dto).decode()
+
+
+def summarize_line(
+    line: Union[str, bytes], use_case: CalculateTaxesFromOperationsUseCase
+) -> str:
+    """Runs a single input line through the use case and returns its summary."""
+    return format_summary(use_case.execute_summary(parse_line(line)))
+
+
+def process_line_into(
+    line: Union[str, bytes],
+    use_case: CalculateTaxesFromOperationsUseCase,
+    encoder: OutputEncoder,
+):
+    """Same as `process_line`, appending the output to the encoder's buffer."""
+    encoder.write_results(use_case.execute(parse_line(line)))
+
+
+def process_line_cached(
+    line: str,
+    use_case_factory: Callable[[], CalculateTaxesFromOperationsUseCase],
+    cache: LineResultCache,
+) -> str:
+    """Returns the cached output of the line, computing and storing it on a miss."""
+    key = cache.key(line)
+    output = cache.get(key)
+    if output is None:
+        output = process_line(line, use_case_factory())
+        cache.put(key, output)
+    return output
+
+
+def process_line_from_prefix(
+    line: Union[str, bytes],
+    use_case_factory: Callable[[], CalculateTaxesFromOperationsUseCase],
+    cache: PrefixStateCache,
+) -> List[TaxResultDTO]:
+    """
+    Resumes the line from its deepest cached checkpoint, then decodes and
+    computes the rest of it one checkpoint at a time, caching each of them.
+    """
+    if isinstance(line, str):
+        line = line.encode()
+    checkpoints = cache.checkpoints(line)
+    entries = cache.resume(checkpoints)
+
+    use_case = use_case_factory()
+    results: List[TaxResultDTO] = []
+    offset = line.index(b"[") + 1
+    for entry in entries:
+        results.extend(entry.results)
+    if entries:
+        use_case.restore(entries[-1].snapshot)
+        offset = checkpoints[len(entries) - 1].offset
+
+    for checkpoint in checkpoints[len(entries) :]:
+        segment_results = use_case.execute(
+            _parse_segment(line[offset : checkpoint.offset])
+        )
+        entries.append(PrefixEntry(use_case.snapshot(), tuple(segment_results)))
+        results.extend(segment_results)
+        offset = checkpoint.offset
+    cache.record(checkpoints, entries)
+
+    results.extend(use_case.execute(_parse_segment(line[offset : line.rindex(b"]")])))
+    return results
+
+
+def _parse_segment(segment: bytes) -> List[OperationDTO]:
+    """Parses a run of operation objects cut from a line between checkpoints."""
+    return parse_line(b"[" + segment.lstrip(b" \t\r\n,") + b"]")
+
+
+def process_line_profiled(
+    line: str,
+    use_case: CalculateTaxesFromOperationsUseCase,
+    profiler: StageProfiler,
+    encoder: OutputEncoder,
+):
+    """
+    Same as `process_line_into`, recording the time of every stage: parsing,
+    the use case (whose domain service time is charged to "compute" by a
+    TimedTaxCalculator), encoding the output line and handing it to the
+    encoder's buffer, which writes out the batches.
+    """
+    clock, cpu_clock = time.perf_counter, time.process_time
+    start_wall, start_cpu = clock(), cpu_clock()
+
+    operations_dto = parse_line(line)
+    parsed_wall, parsed_cpu = clock(), cpu_clock()
+    profiler.add("parse", parsed_wall - start_wall, parsed_cpu - start_cpu)
+
+    tax_results_dto = use_case.execute(operations_dto)
+    executed_wall, executed_cpu = clock(), cpu_clock()
+
+    output_line = encode_results(tax_results_dto)
+    formatted_wall, formatted_cpu = clock(), cpu_clock()
+    profiler.add("format", formatted_wall - executed_wall, formatted_cpu - executed_cpu)
+
+    encoder.write_encoded(output_line)
+    written_wall, written_cpu = clock(), cpu_clock()
+    profiler.add("write", written_wall - formatted_wall, written_cpu - formatted_cpu)
+
+    profiler.add_line(len(operations_dto), written_wall - start_wall)
+
+
+def parse_line(line: Union[str, bytes]) -> List[OperationDTO]:
+    """Converts a JSON line (text, or UTF-8 bytes) into a list of OperationDTOs."""
+    operations_dto = decode_operations(line)
+    if operations_dto is not None:
+        return operations_dto
+    # Any other shape (or malformed input, which raises here) takes the
+    # generic path.
+    operations_raw = json.loads(line, parse_float=Decimal)
+    return [to_operation_dto(op) for op in operations_raw]
+
+
+def format_summary(summary: TaxSummaryDTO) -> str:
+    """
+    Formats the totals of a line as a single JSON object. The position of the
+    operations without a ticker is inlined; other stocks go under "positions".
+    """
+    positions = dict(summary.positions)
+    record = {
+        "total-tax": float(summary.total_tax),
+        "taxable-sells": summary.taxable_sells,
+        **_position_fields(positions.pop(None, PositionSnapshotDTO())),
+    }
+    if positions:
+        record["positions"] = {
+            ticker: _position_fields(position) for ticker, position in positions.items()
+        }
+    return json.dumps(record)
+
+
+def _position_fields(position: PositionSnapshotDTO) -> Dict[str, Any]:
+    return {
+        "total-shares": position.total_shares,
+        "weighted-average-cost": float(position.weighted_average_cost),
+        "accumulated-loss": float(position.accumulated_loss),
+    }
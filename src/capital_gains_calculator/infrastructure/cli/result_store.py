@@ -0,0 +1,160 @@
+# src/capital_gains_calculator/infrastructure/cli/result_store.py
+import json
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+
+from ...application.dtos import TaxResultDTO
+from .encoding import OutputEncoder
+
+# A results file holds the output lines as written to stdout. Its index has
+# the byte offset where every line starts, plus the end of the file, as
+# little-endian uint64s; the optional totals file has one record per line
+# with the total tax (float64) and the number of taxed sells (int64).
+INDEX_ENTRY = struct.Struct("<Q")
+TOTALS_RECORD = struct.Struct("<dq")
+
+
+def index_path(results_path: Path) -> Path:
+    return results_path.with_name(results_path.name + ".idx")
+
+
+def totals_path(results_path: Path) -> Path:
+    return results_path.with_name(results_path.name + ".totals")
+
+
+def parse_line_ranges(specs: Iterable[str]) -> List[Tuple[int, int]]:
+    """Parses line numbers ("7") and inclusive ranges ("10-20"), counted from 1."""
+    ranges = []
+    for spec in specs:
+        first, _, last = spec.partition("-")
+        try:
+            line_range = (int(first), int(last or first))
+        except ValueError:
+            raise ValueError(f"Invalid line or range: {spec!r}.") from None
+        if not 1 <= line_range[0] <= line_range[1]:
+            raise ValueError(f"Invalid line or range: {spec!r}.")
+        ranges.append(line_range)
+    return ranges
+
+
+class IndexedOutputEncoder(OutputEncoder):
+    """
+    Output encoder that also writes the offset of every line to an index, and
+    optionally the totals of every line, so a result store can later read
+    any line without scanning the ones before it.
+    """
+
+    def __init__(
+        self,
+        out: BinaryIO,
+        index_out: BinaryIO,
+        totals_out: Optional[BinaryIO] = None,
+        flush_bytes: Optional[int] = None,
+    ):
+        super().__init__(out, flush_bytes)
+        self._index_out = index_out
+        self._totals_out = totals_out
+        self._offset = 0  # Bytes handed to `out` so far
+        self._index = bytearray(INDEX_ENTRY.pack(0))
+        self._totals = bytearray()
+
+    def write_results(self, results: Iterable[TaxResultDTO]):
+        if self._totals_out is not None:
+            results = list(results)
+            self._add_totals([float(result.tax) for result in results])
+        super().write_results(results)
+
+    def write_output(self, output: str):
+        if self._totals_out is not None:
+            self._add_totals([result["tax"] for result in json.loads(output)])
+        super().write_output(output)
+
+    def flush(self):
+        self._offset += len(self._buffer)
+        super().flush()
+        self._index_out.write(self._index)
+        self._index.clear()
+        self._index_out.flush()
+        if self._totals_out is not None:
+            self._totals_out.write(self._totals)
+            self._totals.clear()
+            self._totals_out.flush()
+
+    def _add_totals(self, taxes: List[float]):
+        # fsum does not depend on the order or the form of the taxes, so both
+        # results and formatted output lines give the same total.
+        self._totals += TOTALS_RECORD.pack(
+            math.fsum(taxes), sum(1 for tax in taxes if tax)
+        )
+
+    def _end_line(self):
+        self._index += INDEX_ENTRY.pack(self._offset + len(self._buffer) + 1)
+        super()._end_line()
+
+
+class ResultStore:
+    """
+    Read-only access to a results file through its index. The files are
+    memory-mapped, so reading any line or range of lines takes two index
+    lookups and a single slice, whatever the size of the file.
+    """
+
+    def __init__(self, results_path: Path):
+        self._files = []
+        self._maps = []
+        try:
+            self._results = self._map(results_path)
+            self._index = self._map(index_path(results_path))
+            totals = totals_path(results_path)
+            self._totals = self._map(totals) if totals.exists() else None
+        except OSError:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return max(len(self._index) // INDEX_ENTRY.size - 1, 0)
+
+    def read_lines(self, first: int, last: int) -> bytes:
+        """Returns the output lines `first` to `last` (from 1), with their newlines."""
+        self._check_range(first, last)
+        (start,) = INDEX_ENTRY.unpack_from(self._index, (first - 1) * INDEX_ENTRY.size)
+        (end,) = INDEX_ENTRY.unpack_from(self._index, last * INDEX_ENTRY.size)
+        return self._results[start:end]
+
+    def read_totals(self, line: int) -> Tuple[float, int]:
+        """Returns the total tax and the number of taxed sells of a line."""
+        if self._totals is None:
+            raise ValueError("The results file has no totals.")
+        self._check_range(line, line)
+        return TOTALS_RECORD.unpack_from(self._totals, (line - 1) * TOTALS_RECORD.size)
+
+    def close(self):
+        for buffer in self._maps:
+            buffer.close()
+        for file in self._files:
+            file.close()
+
+    def _check_range(self, first: int, last: int):
+        if not 1 <= first <= last <= len(self):
+            raise ValueError(
+                f"Line {last} is out of range: the file has {len(self)} lines."
+            )
+
+    def _map(self, path: Path):
+        file = open(path, "rb")
+        self._files.append(file)
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            return b""
+        self._maps.append(buffer)
+        return buffer
@@ -0,0 +1,30 @@
+# src/capital_gains_calculator/infrastructure/cli/scenarios.py
+import json
+from pathlib import Path
+from typing import Iterator
+
+from ...domain.scenarios import np
+
+
+def load_unit_costs(path: Path) -> "np.ndarray":
+    """
+    Loads the unit-cost scenarios: a `.npy` matrix, or a text file with one
+    scenario per line and one comma-separated unit cost per operation.
+    """
+    if path.suffix == ".npy":
+        return np.load(path)
+    return np.loadtxt(path, delimiter=",", ndmin=2)
+
+
+def format_scenario_taxes(taxes: "np.ndarray") -> Iterator[str]:
+    """Formats each row of a tax matrix like the output of a single line."""
+    for row in taxes.tolist():
+        yield json.dumps([{"tax": tax} for tax in row])
+
+
+def format_scenario_totals(
+    total_tax: "np.ndarray", taxable_sells: "np.ndarray"
+) -> Iterator[str]:
+    """Formats the totals of each scenario as a JSON object."""
+    for total, count in zip(total_tax.tolist(), taxable_sells.tolist()):
+        yield json.dumps({"total-tax": total, "taxable-sells": count})
@@ -0,0 +1,125 @@
+# src/capital_gains_calculator/infrastructure/cli/streaming.py
+import json
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from ...application.dtos import TaxResultDTO
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+_INLINE_WHITESPACE = " \t\r"
+
+
+class JsonArrayLineReader:
+    """
+    Reads newline-delimited JSON arrays of objects incrementally. Numbers with
+    a fraction or an exponent are decoded as Decimal, like the regular input.
+
+    The stream is consumed in fixed-size blocks and every line is exposed as an
+    iterator over its elements, so a single line never has to fit in memory.
+    Like the regular input, reading stops at the first empty line.
+    """
+
+    def __init__(self, stream: TextIO, block_size: int = DEFAULT_BLOCK_SIZE):
+        self._stream = stream
+        self._block_size = block_size
+        self._decoder = json.JSONDecoder(parse_float=Decimal)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Iterator[Dict[str, Any]]]:
+        while self._start_line():
+            elements = self._iter_elements()
+            yield elements
+            # Drains whatever the caller left unconsumed, so the next line
+            # always starts at a line boundary.
+            for _ in elements:
+                pass
+
+    def _fill(self) -> bool:
+        """Reads the next block, discarding the already consumed part of the buffer."""
+        if self._eof:
+            return False
+        block = self._stream.read(self._block_size)
+        if not block:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + block
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Returns the next non-blank character of the line ("" at end of input)."""
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in _INLINE_WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str):
+        char = self._peek()
+        if char != expected:
+            raise ValueError(
+                f"Expected {expected!r} but found {char or 'end of input'!r}"
+            )
+        self._pos += 1
+
+    def _start_line(self) -> bool:
+        """Positions the reader after the opening bracket of the next line, if any."""
+        char = self._peek()
+        if char in ("", "\n"):
+            return False
+        self._expect("[")
+        return True
+
+    def _decode_element(self) -> Dict[str, Any]:
+        if self._peek() != "{":
+            self._expect("{")
+        while True:
+            try:
+                element, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The element may be split across blocks: retry with more data,
+                # unless the rest of the line is already in the buffer.
+                if self._buffer.find("\n", self._pos) != -1 or not self._fill():
+                    raise
+                continue
+            self._pos = end
+            return element
+
+    def _iter_elements(self) -> Iterator[Dict[str, Any]]:
+        if self._peek() == "]":
+            self._pos += 1
+        else:
+            while True:
+                yield self._decode_element()
+                if self._peek() != ",":
+                    break
+                self._pos += 1
+            self._expect("]")
+
+        char = self._peek()
+        if char == "\n":
+            self._pos += 1
+        elif char:
+            self._expect("\n")
+
+
+def write_streamed_output(tax_results_dto: Iterable[TaxResultDTO], out: TextIO):
+    """
+    Writes the results as a JSON array while they are produced. The output is
+    the same as formatting the whole list with `json.dumps`.
+    """
+    out.write("[")
+    separator = ""
+    for result in tax_results_dto:
+        out.write(separator)
+        out.write(json.dumps({"tax": float(result.tax)}))
+        separator = ", "
+    out.write("]\n")
@@ -1,20 +1,117 @@
 # src/capital_gains_calculator/infrastructure/di_container.py
+from enum import Enum
+from typing import Any, Callable, Dict, Tuple
+
 from dependency_injector import containers, providers
 
-from ..application.use_cases import CalculateTaxesFromOperationsUseCase
+from ..application.use_cases import (
+    CalculateTaxesFromOperationsUseCase,
+    EvaluateTaxScenariosUseCase,
+)
+from ..domain.auto import AutoTaxCalculatorService
+from ..domain.fixed_point import FixedPointTaxCalculatorService
+from ..domain.portfolio import PortfolioTaxCalculatorService
 from ..domain.services import TaxCalculatorService
 
 
+class Engine(str, Enum):
+    """Names of the available calculation engines."""
+
+    REFERENCE = "reference"
+    FIXED_POINT = "fixed-point"
+    VECTORIZED = "vectorized"
+    AUTO = "auto"  # Picks one of the others per line
+
+
+def _vectorized_engine() -> Any:
+    # numpy is only imported when the engine is used, to keep start-up lean
+    from ..domain.vectorized import VectorizedTaxCalculatorService
+
+    return VectorizedTaxCalculatorService()
+
+
+def _scenario_calculator() -> Any:
+    from ..domain.scenarios import ScenarioTaxCalculatorService
+
+    return ScenarioTaxCalculatorService()
+
+
+# Engine registry: a factory of every engine (its class, or a function that
+# imports it on first use), by name. An engine registered here (and named in
+# `Engine`) can be selected with --engine and used by auto.
+ENGINES: Dict[str, Callable[[], Any]] = {
+    Engine.REFERENCE.value: TaxCalculatorService,
+    Engine.FIXED_POINT.value: FixedPointTaxCalculatorService,
+    Engine.VECTORIZED.value: _vectorized_engine,
+}
+
+# (minimum operations per line, engine) tiers of the auto engine, from
+# `python -m benchmarks.crossover`. The fixed-point engine was the fastest at
+# every size measured (1 to 262k operations): the vectorized engine spends
+# most of its time building its columns, so it has no tier of its own.
+AUTO_ENGINE_THRESHOLDS: Tuple[Tuple[int, str], ...] = ((0, Engine.FIXED_POINT.value),)
+
+
+def _engine_calculators(executor: providers.Provider) -> Dict[str, providers.Factory]:
+    """A calculator factory for every registered engine, by name."""
+    return {
+        name: providers.Factory(
+            PortfolioTaxCalculatorService,
+            engine_factory=providers.Object(engine_factory),
+            executor=executor,
+        )
+        for name, engine_factory in ENGINES.items()
+    }
+
+
 class AppContainer(containers.DeclarativeContainer):
     """DI Container for the Application."""
 
+    config = providers.Configuration(default={"engine": Engine.REFERENCE.value})
+
     # Domain layer
-    tax_calculator_service = providers.Factory(  # <-- Defines the service provider
-        TaxCalculatorService
+    auto_engine_thresholds = providers.Object(AUTO_ENGINE_THRESHOLDS)
+
+    # Executor used to compute the symbols of a large line in parallel
+    portfolio_executor = providers.Object(None)
+
+    # The auto engine gets the factories themselves, to pick one per line
+    auto_tax_calculator_service = providers.Factory(
+        AutoTaxCalculatorService,
+        calculator_factories=providers.Dict(
+            {
+                name: calculator.provider
+                for name, calculator in _engine_calculators(portfolio_executor).items()
+            }
+        ),
+        thresholds=auto_engine_thresholds,
+    )
+
+    portfolio_tax_calculator_service = providers.Selector(
+        config.engine,  # <-- Selects the engine by name
+        **_engine_calculators(portfolio_executor),
+        **{Engine.AUTO.value: auto_tax_calculator_service},
+    )
+
+    reference_tax_calculator_service = providers.Factory(
+        PortfolioTaxCalculatorService,
+        engine_factory=providers.Object(TaxCalculatorService),
     )
 
+    scenario_tax_calculator_service = providers.Factory(_scenario_calculator)
+
     # Application layer
     calculate_taxes_use_case = providers.Factory(
         CalculateTaxesFromOperationsUseCase,
-        tax_calculator=tax_calculator_service,  # <-- Injects the service into the use case
+        tax_calculator=portfolio_tax_calculator_service,  # <-- Injects the service into the use case
+    )
+
+    reference_use_case = providers.Factory(  # <-- Used by the differential check
+        CalculateTaxesFromOperationsUseCase,
+        tax_calculator=reference_tax_calculator_service,
+    )
+
+    evaluate_tax_scenarios_use_case = providers.Factory(
+        EvaluateTaxScenariosUseCase,
+        scenario_calculator=scenario_tax_calculator_service,
     )
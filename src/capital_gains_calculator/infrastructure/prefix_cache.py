@@ -0,0 +1,157 @@
+# src/capital_gains_calculator/infrastructure/prefix_cache.py
+import hashlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..application.dtos import PositionSnapshotDTO, TaxResultDTO
+
+DEFAULT_MAX_CHECKPOINTS = 10_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_CHECKPOINT_BYTES = 64 * 1024
+
+# Rough memory estimates: bookkeeping of an entry, a slot in its results (most
+# of them the shared zero tax) and the snapshot of one ticker.
+_ENTRY_OVERHEAD_BYTES = 300
+_RESULT_BYTES = 16
+_POSITION_BYTES = 250
+
+
+@dataclass
+class PrefixCacheStats:
+    """
+    Counters reported by the prefix cache. `hit_depths` counts the lines by
+    the number of checkpoints they resumed from, to tune the spacing.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    operations_reused: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    hit_depths: Dict[int, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    A position in a line, just after an operation: its byte offset, the
+    number of operations before it and the hash of the whole line up to it.
+    """
+
+    offset: int
+    operations: int
+    key: bytes
+
+
+@dataclass(frozen=True)
+class PrefixEntry:
+    """
+    State cached at a checkpoint: the positions reached there, and the
+    results of the operations since the previous checkpoint.
+    """
+
+    snapshot: Dict[Optional[str], PositionSnapshotDTO]
+    results: Tuple[TaxResultDTO, ...]
+
+
+class PrefixStateCache:
+    """
+    Bounded LRU cache of the state reached at checkpoints of a line, so a
+    line that starts like an earlier one resumes from the deepest checkpoint
+    they share instead of replaying the common history.
+
+    Checkpoints are cut from the bytes of the line, after the first operation
+    ending past every `checkpoint_bytes`, and each one is keyed by a hash
+    chained over the bytes before it. Lines with the same prefix, byte for
+    byte, therefore meet the same checkpoints, and only the rest of the line
+    is decoded and computed. Entries are evicted, least recently used first,
+    when either the number of checkpoints or their estimated memory goes over
+    its limit; a line refreshes its checkpoints deepest first, so the shared
+    roots are the last to go.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_CHECKPOINTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        checkpoint_bytes: int = DEFAULT_CHECKPOINT_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.checkpoint_bytes = checkpoint_bytes
+        self.stats = PrefixCacheStats()
+        self._entries: "OrderedDict[bytes, PrefixEntry]" = OrderedDict()
+
+    def checkpoints(self, line: bytes) -> List[Checkpoint]:
+        """
+        Returns the checkpoints of a line (a JSON array of flat operation
+        objects, so every "}" ends one; ticker strings may not contain braces).
+        """
+        offset = line.index(b"[") + 1
+        end = line.rindex(b"]")
+        key = b""
+        operations = 0
+        checkpoints = []
+        view = memoryview(line)
+        while True:
+            cut = line.find(b"}", offset + self.checkpoint_bytes - 1, end)
+            if cut == -1:
+                return checkpoints
+            cut += 1
+            key = hashlib.blake2b(key, digest_size=16)
+            key.update(view[offset:cut])
+            key = key.digest()
+            operations += line.count(b"}", offset, cut)
+            checkpoints.append(Checkpoint(cut, operations, key))
+            offset = cut
+
+    def resume(self, checkpoints: List[Checkpoint]) -> List[PrefixEntry]:
+        """Returns the entries of the longest run of cached leading checkpoints."""
+        entries = []
+        for checkpoint in checkpoints:
+            entry = self._entries.get(checkpoint.key)
+            if entry is None:
+                break
+            entries.append(entry)
+
+        depth = len(entries)
+        if depth:
+            self.stats.hits += 1
+            self.stats.operations_reused += checkpoints[depth - 1].operations
+            self.stats.hit_depths[depth] = self.stats.hit_depths.get(depth, 0) + 1
+        else:
+            self.stats.misses += 1
+        return entries
+
+    def record(self, checkpoints: List[Checkpoint], entries: List[PrefixEntry]):
+        """
+        Stores the entries of the checkpoints of a line, evicting the least
+        recently used entries if needed.
+        """
+        for checkpoint, entry in reversed(list(zip(checkpoints, entries))):
+            if checkpoint.key in self._entries:
+                self._entries.move_to_end(checkpoint.key)
+                continue
+            self._entries[checkpoint.key] = entry
+            self.stats.entries += 1
+            self.stats.bytes += self._size(entry)
+        while self.stats.entries > self.max_entries or (
+            self.stats.bytes > self.max_bytes and self.stats.entries > 1
+        ):
+            entry = self._entries.pop(next(iter(self._entries)))
+            self.stats.entries -= 1
+            self.stats.bytes -= self._size(entry)
+            self.stats.evictions += 1
+
+    @staticmethod
+    def _size(entry: PrefixEntry) -> int:
+        return (
+            _ENTRY_OVERHEAD_BYTES
+            + len(entry.results) * _RESULT_BYTES
+            + len(entry.snapshot) * _POSITION_BYTES
+        )
@@ -0,0 +1,115 @@
+# src/capital_gains_calculator/infrastructure/profiling.py
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from ..domain.models import Operation, TaxResult
+
+PROFILE_ENV_VAR = "CAPITAL_GAINS_PROFILE"
+
+# Stages of the CLI pipeline, in the order they run for each line.
+STAGES = ("parse", "compute", "format", "write")
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def profiling_requested() -> bool:
+    """Tells whether profiling was switched on through the environment."""
+    return os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+class StageProfiler:
+    """
+    Accumulates wall and CPU time per pipeline stage, along with line and
+    operation counters and the latency of every line. It is only created when
+    profiling is on; the regular pipeline never calls it.
+    """
+
+    def __init__(self):
+        self.wall_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.cpu_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.lines = 0
+        self.operations = 0
+        self._line_latencies = array("d")
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def add(self, stage: str, wall_seconds: float, cpu_seconds: float):
+        self.wall_seconds[stage] += wall_seconds
+        self.cpu_seconds[stage] += cpu_seconds
+
+    def add_line(self, operations: int, latency_seconds: float):
+        self.lines += 1
+        self.operations += operations
+        self._line_latencies.append(latency_seconds)
+
+    def report(self) -> Dict[str, Any]:
+        """Builds the machine-readable report of the run so far."""
+        wall_seconds = time.perf_counter() - self._started_wall
+        latencies = sorted(self._line_latencies)
+        return {
+            "lines": self.lines,
+            "operations": self.operations,
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": time.process_time() - self._started_cpu,
+            "operations_per_second": (
+                self.operations / wall_seconds if wall_seconds else 0.0
+            ),
+            "stages": {
+                stage: {
+                    "wall_seconds": self.wall_seconds[stage],
+                    "cpu_seconds": self.cpu_seconds[stage],
+                }
+                for stage in STAGES
+            },
+            "line_latency_seconds": {
+                "p50": _percentile(latencies, 50),
+                "p99": _percentile(latencies, 99),
+            },
+            "peak_rss_bytes": _peak_rss_bytes(),
+        }
+
+    def emit(self, stream: TextIO = sys.stderr):
+        """Writes the report as a single JSON line."""
+        stream.write(json.dumps({"profile": self.report()}) + "\n")
+
+
+class TimedTaxCalculator:
+    """Wraps a domain service, charging its time to the "compute" stage."""
+
+    def __init__(self, tax_calculator, profiler: StageProfiler):
+        self._tax_calculator = tax_calculator
+        self._profiler = profiler
+
+    def process(self, operations: List[Operation]) -> List[TaxResult]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        results = self._tax_calculator.process(operations)
+        self._profiler.add(
+            "compute", time.perf_counter() - wall, time.process_time() - cpu
+        )
+        return results
+
+    def iter_process(self, operations: Iterable[Operation]) -> Iterator[TaxResult]:
+        yield from self.process(list(operations))
+
+
+def _percentile(sorted_values: List[float], percent: int) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
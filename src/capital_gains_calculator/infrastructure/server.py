@@ -0,0 +1,138 @@
+# src/capital_gains_calculator/infrastructure/server.py
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .cli.parallel import init_worker, process_chunk
+from .di_container import Engine
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Requests of a single connection that may be computed ahead of the reply
+# being written. Replies are always sent in request order.
+MAX_PIPELINED_REQUESTS = 64
+
+# Longest request line accepted, in bytes.
+MAX_LINE_BYTES = 256 * 1024 * 1024
+
+
+class TaxServer:
+    """
+    Long-running server that answers newline-delimited operation lists with
+    the same output as the CLI, one reply line per request line. Like stdin,
+    an empty line ends the session.
+
+    The CPU-bound work runs in a pool of worker processes that keep a warm
+    container, and every line gets a fresh TaxCalculatorService.
+    """
+
+    def __init__(self, engine: Engine, workers: int):
+        self._engine = engine
+        self._workers = workers
+        self._executor: Optional[Executor] = None
+
+    async def serve(
+        self,
+        socket_path: Optional[Path] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ):
+        """Serves on a Unix domain socket if a path is given, else on TCP."""
+        with ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=init_worker,
+            initargs=(self._engine,),
+        ) as self._executor:
+            # Workers are started before accepting connections: a worker forked
+            # later would inherit (and keep open) the sockets of the clients.
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, process_chunk, [])
+                    for _ in range(self._workers)
+                )
+            )
+
+            if socket_path is not None:
+                server = await asyncio.start_unix_server(
+                    self._handle_connection, path=str(socket_path), limit=MAX_LINE_BYTES
+                )
+            else:
+                server = await asyncio.start_server(
+                    self._handle_connection, host=host, port=port, limit=MAX_LINE_BYTES
+                )
+            stop = asyncio.Event()
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(signal_number, stop.set)
+                except (NotImplementedError, RuntimeError):  # e.g. on Windows
+                    pass
+
+            async with server:
+                address = socket_path or f"{host}:{port}"
+                print(f"Listening on {address}", file=sys.stderr, flush=True)
+                await stop.wait()
+            if socket_path is not None and socket_path.exists():
+                os.unlink(socket_path)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        pending: asyncio.Queue = asyncio.Queue(maxsize=MAX_PIPELINED_REQUESTS)
+        tasks = {
+            asyncio.create_task(self._read_requests(reader, pending)),
+            asyncio.create_task(self._reply_in_order(pending, writer)),
+        }
+        try:
+            # Returns once every reply is written, or as soon as either side
+            # fails: a replier that cannot write (the client is gone) must not
+            # leave the reader blocked on a full queue, and the other way round.
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            while not pending.empty():
+                if (future := pending.get_nowait()) is not None:
+                    future.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+        for outcome in outcomes:
+            if isinstance(outcome, Exception) and not isinstance(
+                outcome, ConnectionError
+            ):
+                raise outcome
+
+    async def _read_requests(
+        self, reader: asyncio.StreamReader, pending: asyncio.Queue
+    ):
+        while raw_line := await reader.readline():
+            line = raw_line.decode().strip()
+            if not line:
+                break
+            await pending.put(self._submit(line))
+        await pending.put(None)
+
+    def _submit(self, line: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, process_chunk, [line])
+
+    async def _reply_in_order(
+        self, pending: asyncio.Queue, writer: asyncio.StreamWriter
+    ):
+        while (future := await pending.get()) is not None:
+            try:
+                (output,) = await future
+            except Exception as error:  # Malformed lines get an error reply.
+                output = json.dumps({"error": f"{type(error).__name__}: {error}"})
+            writer.write(output.encode() + b"\n")
+            await writer.drain()
@@ -0,0 +1,61 @@
+# src/capital_gains_calculator/infrastructure/sessions.py
+import json
+import os
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from ..application.dtos import PositionSnapshotDTO
+
+# State of one input line: the position of every ticker (None without one).
+SessionState = Dict[Optional[str], PositionSnapshotDTO]
+
+
+def format_session_state(state: SessionState) -> str:
+    """
+    Serializes the state of a line as a compact JSON array, one object per
+    ticker. Amounts are written as strings so they are restored exactly.
+    """
+    return json.dumps(
+        [
+            {
+                "ticker": ticker,
+                "total-shares": snapshot.total_shares,
+                "weighted-average-cost": str(snapshot.weighted_average_cost),
+                "accumulated-loss": str(snapshot.accumulated_loss),
+            }
+            for ticker, snapshot in state.items()
+        ],
+        separators=(",", ":"),
+    )
+
+
+def parse_session_state(text: str) -> SessionState:
+    """Reads back the state written by `format_session_state`."""
+    return {
+        position["ticker"]: PositionSnapshotDTO(
+            total_shares=position["total-shares"],
+            weighted_average_cost=Decimal(position["weighted-average-cost"]),
+            accumulated_loss=Decimal(position["accumulated-loss"]),
+        )
+        for position in json.loads(text)
+    }
+
+
+def read_session_states(path: Path) -> Iterator[SessionState]:
+    """Yields the saved state of each input line, in order."""
+    with open(path, encoding="utf-8") as file:
+        for record in file:
+            yield parse_session_state(record)
+
+
+def write_session_states(path: Path, states: Iterable[SessionState]):
+    """
+    Writes one state per line. The file is replaced only once every state is
+    written, so the same path can be resumed from and saved to in one run.
+    """
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        for state in states:
+            file.write(format_session_state(state) + "\n")
+    os.replace(temporary_path, path)
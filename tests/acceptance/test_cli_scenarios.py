@@ -2,9 +2,11 @@
 # Acceptance tests that simulate user interaction via CLI.
 
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
 
 import pytest
 
@@ -12,15 +14,30 @@ import pytest
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-def run_application(input_data: str) -> str:
-    """Runs the command-line application in a subprocess."""
-    process = subprocess.run(
-        [sys.executable, "-m", "capital_gains_calculator"],
+def run_cli(
+    *args: str,
+    input_data: Union[str, bytes] = "",
+    env: Optional[Dict[str, str]] = None,
+    python_args: Sequence[str] = (),
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    Runs the command-line application in a subprocess. Text input gives text
+    output and bytes give bytes; `env` is added to the current environment.
+    """
+    return subprocess.run(
+        [sys.executable, *python_args, "-m", "capital_gains_calculator", *args],
         input=input_data,
         capture_output=True,
-        text=True,
-        check=False,
+        text=isinstance(input_data, str),
+        check=check,
+        env={**os.environ, **(env or {})},
     )
+
+
+def run_application(input_data: str, *args: str) -> str:
+    """Runs the application and returns its stdout, printing any error."""
+    process = run_cli(*args, input_data=input_data, check=False)
     if process.stderr:
         print("Subprocess error:", process.stderr)
     return process.stdout
@@ -49,3 +66,396 @@ def test_acceptance_scenarios(case_number):
     actual_output = json.loads(actual_output_str)
 
     assert actual_output == expected_output
+
+
+def load_all_cases():
+    """Loads every fixture as a pair of (input line, expected output)."""
+    cases = []
+    for case_number in range(1, 10):
+        input_file = FIXTURES_DIR / f"case_{case_number}_input.txt"
+        output_file = FIXTURES_DIR / f"case_{case_number}_output.json"
+        cases.append(
+            (input_file.read_text().strip(), json.loads(output_file.read_text()))
+        )
+    return cases
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (),
+        ("--workers", "2", "--chunk-size", "2"),
+        ("--stream",),
+        ("--pipeline", "--queue-depth", "1"),
+        ("--engine", "fixed-point"),
+        ("--engine", "vectorized"),
+        ("--engine", "auto"),
+        ("--engine", "fixed-point", "--scan-workers", "2", "--scan-chunk-bytes", "64"),
+        ("--prefix-cache-size", "100", "--checkpoint-bytes", "64"),
+    ],
+)
+def test_each_line_is_an_independent_simulation(args):
+    """
+    Runs all fixtures as a single multi-line input. Each line must produce the
+    same output as when it runs alone, in input order, whether the lines are
+    computed sequentially, spread across worker processes, streamed, or
+    computed by another engine.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+
+    # Act
+    actual_output_str = run_application(input_data, *args)
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in actual_output_str.splitlines()]
+    assert actual_outputs == [expected for _, expected in cases]
+
+
+@pytest.mark.parametrize("args", [(), ("--workers", "2")])
+def test_memory_mapped_input_file(tmp_path, args):
+    """
+    Reads all fixtures from a file given with --input, sequentially and split
+    into byte ranges across workers. The output must stay in input order.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("\n".join(line for line, _ in cases) + "\n")
+
+    # Act
+    actual_output_str = run_application("", "--input", str(input_file), *args)
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in actual_output_str.splitlines()]
+    assert actual_outputs == [expected for _, expected in cases]
+
+
+def test_repeated_lines_are_served_from_the_cache(tmp_path):
+    """
+    Runs every fixture twice with the result cache enabled. The output must
+    not change, and a warm run from the cache file must not miss at all.
+    """
+    # Arrange
+    cases = load_all_cases() * 2
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+    cache_args = ("--cache-file", str(tmp_path / "cache.tsv"), "--cache-stats")
+
+    # Act
+    cold = run_cli(*cache_args, input_data=input_data)
+    warm = run_cli(*cache_args, input_data=input_data)
+
+    # Assert
+    expected = [expected for _, expected in cases]
+    assert [json.loads(line) for line in cold.stdout.splitlines()] == expected
+    assert warm.stdout == cold.stdout
+    assert json.loads(cold.stderr)["cache"]["hits"] == 9
+    assert json.loads(warm.stderr)["cache"]["misses"] == 0
+
+
+@pytest.mark.parametrize(
+    "args, env", [(("--profile",), {}), ((), {"CAPITAL_GAINS_PROFILE": "1"})]
+)
+def test_profile_report_is_written_to_stderr(args, env):
+    """
+    Profiling must not change the output, and must report every stage of the
+    pipeline as a JSON object on stderr.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+
+    # Act
+    process = run_cli(*args, input_data=input_data, env=env)
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in process.stdout.splitlines()]
+    assert actual_outputs == [expected for _, expected in cases]
+    report = json.loads(process.stderr)["profile"]
+    assert report["lines"] == 9
+    assert set(report["stages"]) == {"parse", "compute", "format", "write"}
+
+
+@pytest.mark.parametrize("engine", ["fixed-point", "vectorized", "auto"])
+def test_differential_check_reports_to_stderr(engine):
+    """
+    Checking every line against the reference engine must not change the
+    output, and must report the lines checked and no mismatch.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+
+    # Act
+    process = run_cli("--engine", engine, "--check-every", "2", input_data=input_data)
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in process.stdout.splitlines()]
+    assert actual_outputs == [expected for _, expected in cases]
+    report = json.loads(process.stderr)["check"]
+    assert (report["lines"], report["checked"], report["mismatches"]) == (9, 5, 0)
+
+
+@pytest.mark.parametrize(
+    "args", [(), ("--ticker-workers", "2"), ("--stream",), ("--engine", "fixed-point")]
+)
+def test_tickers_keep_separate_positions(args):
+    """
+    Interleaves two fixtures in one line, each under its own ticker. Every
+    operation must get the tax it has in its own fixture.
+    """
+    # Arrange
+    (line_a, expected_a), (line_b, expected_b) = load_all_cases()[:2]
+    operations = [
+        {**op, "ticker": ticker}
+        for pair in zip(json.loads(line_a), json.loads(line_b))
+        for op, ticker in zip(pair, ("AAA", "BBB"))
+    ]
+    expected = [tax for pair in zip(expected_a, expected_b) for tax in pair]
+
+    # Act
+    actual_output_str = run_application(json.dumps(operations) + "\n\n", *args)
+
+    # Assert
+    assert json.loads(actual_output_str) == expected
+
+
+@pytest.mark.parametrize("args", [(), ("--stream",)])
+def test_summary_writes_the_totals_of_each_line(args):
+    """
+    Each line must produce one record with the total of its expected taxes
+    and the number of sells that were taxed.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+
+    # Act
+    actual_output_str = run_application(input_data, "--summary", *args)
+
+    # Assert
+    summaries = [json.loads(line) for line in actual_output_str.splitlines()]
+    assert len(summaries) == len(cases)
+    for summary, (_, expected) in zip(summaries, cases):
+        taxes = [result["tax"] for result in expected]
+        assert summary["total-tax"] == pytest.approx(sum(taxes))
+        assert summary["taxable-sells"] == sum(1 for tax in taxes if tax)
+
+
+def test_price_scenarios_are_evaluated_in_one_run(tmp_path):
+    """
+    Evaluates the operations of a fixture under its own unit costs and under
+    a flat price path. The first scenario must give the fixture's taxes.
+    """
+    # Arrange
+    line, expected = load_all_cases()[8]
+    operations = json.loads(line)
+    own_costs = ",".join(str(op["unit-cost"]) for op in operations)
+    flat_costs = ",".join("10.00" for _ in operations)
+    prices = tmp_path / "prices.csv"
+    prices.write_text(f"{own_costs}\n{flat_costs}\n")
+
+    # Act
+    per_operation = run_application(
+        line + "\n", "scenarios", "--per-operation", str(prices)
+    )
+    totals = run_application(line + "\n", "scenarios", str(prices))
+
+    # Assert
+    assert [json.loads(row) for row in per_operation.splitlines()] == [
+        expected,
+        [{"tax": 0.0}] * len(operations),
+    ]
+    assert [json.loads(row) for row in totals.splitlines()] == [
+        {"total-tax": sum(result["tax"] for result in expected), "taxable-sells": 2},
+        {"total-tax": 0.0, "taxable-sells": 0},
+    ]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (),
+        ("--engine", "fixed-point"),
+        ("--engine", "vectorized"),
+        ("--engine", "auto"),
+        ("--pipeline",),
+    ],
+)
+def test_converted_binary_input_gives_the_same_output(args):
+    """
+    Converts all fixtures to the binary format and reads them back with
+    --input-format binary. The output must be the same as for the JSON lines.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+    binary_input = run_cli("convert", input_data=input_data.encode()).stdout
+
+    # Act
+    process = run_cli("--input-format", "binary", *args, input_data=binary_input)
+
+    # Assert
+    assert process.stdout.decode() == run_application(input_data, *args)
+
+
+def test_convert_reports_the_line_it_cannot_encode():
+    """Amounts the binary format cannot hold are a usage error, not a crash."""
+    # Arrange
+    input_data = (
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 100}]\n'
+        '[{"operation":"buy", "unit-cost":10.00, "quantity": 9223372036854775808}]\n'
+        "\n"
+    )
+
+    # Act
+    process = run_cli("convert", input_data=input_data.encode(), check=False)
+
+    # Assert
+    assert process.returncode == 2
+    assert "Line 2" in process.stderr.decode()
+
+
+@pytest.mark.parametrize("args", [(), ("--workers", "2")])
+def test_results_file_is_queried_by_line(tmp_path, args):
+    """
+    Writes the output of all fixtures to an indexed results file, then reads
+    single lines, a range and the totals back with the query command.
+    """
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+    results_file = tmp_path / "results.jsonl"
+
+    # Act
+    run_application(
+        input_data, "--results-file", str(results_file), "--results-totals", *args
+    )
+    lines = run_application("", "query", str(results_file), "9", "2-3")
+    totals = run_application("", "query", "--totals", str(results_file), "9")
+
+    # Assert
+    expected = [expected for _, expected in cases]
+    assert [json.loads(line) for line in lines.splitlines()] == [
+        expected[8],
+        expected[1],
+        expected[2],
+    ]
+    assert json.loads(totals) == {
+        "total-tax": sum(result["tax"] for result in expected[8]),
+        "taxable-sells": 2,
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--scan-workers", "2"),
+        ("--engine", "vectorized", "--scan-workers", "2"),
+        ("--stream", "--ticker-workers", "2"),
+        ("--summary", "--ticker-workers", "2"),
+        ("--stream", "--flush-bytes", "0"),
+        ("--pipeline-stats",),
+        ("--cache-stats",),
+        ("--queue-depth", "2"),
+    ],
+)
+def test_unsupported_options_are_rejected(args):
+    """Options that would be silently ignored or change the output must fail."""
+    # Act
+    process = run_cli(*args, input_data="[]\n\n", check=False)
+
+    # Assert
+    assert process.returncode == 2
+    assert process.stdout == ""
+    assert "Invalid value" in process.stderr
+
+
+def test_results_file_rewritten_without_totals_drops_the_old_ones(tmp_path):
+    """Totals of an earlier run must not be served for the new lines."""
+    # Arrange
+    results_file = tmp_path / "results.jsonl"
+    buy = '{"operation":"buy", "unit-cost":10.00, "quantity": 100}'
+    run_application(
+        f"[{buy}]\n\n", "--results-file", str(results_file), "--results-totals"
+    )
+
+    # Act
+    run_application(f"[{buy}]\n\n", "--results-file", str(results_file))
+    process = run_cli(
+        "query", "--totals", str(results_file), "1", input_data="", check=False
+    )
+
+    # Assert
+    assert process.returncode == 2
+    assert "no totals" in process.stderr
+
+
+def test_query_without_an_index_is_a_usage_error(tmp_path):
+    # Arrange
+    results_file = tmp_path / "results.jsonl"
+    results_file.write_text("[]\n")
+
+    # Act
+    process = run_cli("query", str(results_file), "1", input_data="", check=False)
+
+    # Assert
+    assert process.returncode == 2
+    assert "does not exist" in process.stderr
+
+
+def test_resumed_session_only_processes_new_operations(tmp_path):
+    """
+    Splits every fixture in two runs: the first saves its state, the second
+    resumes from it. The second run must give the taxes of the tail as if the
+    whole line had been processed.
+    """
+    # Arrange
+    cases = load_all_cases()
+    head = [json.loads(line)[:2] for line, _ in cases]
+    tail = [json.loads(line)[2:] for line, _ in cases]
+    state_file = str(tmp_path / "state.jsonl")
+
+    # Act
+    run_application(
+        "\n".join(json.dumps(ops) for ops in head) + "\n\n",
+        "--save-state",
+        state_file,
+    )
+    actual_output_str = run_application(
+        "\n".join(json.dumps(ops) for ops in tail) + "\n\n",
+        "--resume-from",
+        state_file,
+        "--save-state",
+        state_file,
+    )
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in actual_output_str.splitlines()]
+    assert actual_outputs == [expected[2:] for _, expected in cases]
+    assert len(Path(state_file).read_text().splitlines()) == len(cases)
+
+
+def test_resumed_session_keeps_the_states_of_missing_lines(tmp_path):
+    """Tests that a run with fewer lines than saved states keeps the rest."""
+    # Arrange
+    state_file = tmp_path / "state.jsonl"
+    buy = '{"operation":"buy", "unit-cost":10.00, "quantity": 100}'
+    run_application(f"[{buy}]\n[{buy}]\n[{buy}]\n\n", "--save-state", str(state_file))
+    saved_states = state_file.read_text().splitlines()
+
+    # Act
+    run_application(
+        f"[{buy}]\n\n",
+        "--resume-from",
+        str(state_file),
+        "--save-state",
+        str(state_file),
+    )
+
+    # Assert
+    states = state_file.read_text().splitlines()
+    assert len(states) == 3
+    assert states[0] != saved_states[0]
+    assert states[1:] == saved_states[1:]
@@ -0,0 +1,93 @@
+# tests/acceptance/test_server.py
+# Acceptance tests of the `serve` daemon over a Unix domain socket.
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.load_client import run_load
+
+from .test_cli_scenarios import load_all_cases
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not available"
+)
+
+
+@pytest.fixture
+def server_socket(tmp_path):
+    """Starts the server in a subprocess and yields the path of its socket."""
+    socket_path = tmp_path / "server.sock"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "capital_gains_calculator",
+            "serve",
+            "--socket",
+            str(socket_path),
+            "--workers",
+            "2",
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stderr.readline().startswith("Listening on")
+        yield socket_path
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+    assert not socket_path.exists()
+
+
+def send(socket_path, input_data: str) -> str:
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(str(socket_path))
+        client.sendall(input_data.encode())
+        with client.makefile() as replies:
+            return replies.read()
+
+
+def test_server_replies_like_the_cli(server_socket):
+    """Each request line gets the same output line as the CLI, in order."""
+    # Arrange
+    cases = load_all_cases()
+    input_data = "\n".join(line for line, _ in cases) + "\n\n"
+
+    # Act
+    output = send(server_socket, input_data)
+
+    # Assert
+    actual_outputs = [json.loads(line) for line in output.splitlines()]
+    assert actual_outputs == [expected for _, expected in cases]
+
+
+def test_malformed_line_gets_an_error_reply(server_socket):
+    # Act
+    output = send(server_socket, "not json\n[]\n\n")
+
+    # Assert
+    error, empty = output.splitlines()
+    assert "error" in json.loads(error)
+    assert json.loads(empty) == []
+
+
+def test_load_client_reports_throughput(server_socket):
+    # Act
+    report = asyncio.run(
+        run_load(server_socket, "", 0, connections=3, requests=20, operations=5)
+    )
+
+    # Assert
+    assert report["requests"] == 60
+    assert report["requests_per_second"] > 0
+    assert report["latency_p50"] <= report["latency_p99"]
@@ -0,0 +1,68 @@
+# tests/acceptance/test_startup.py
+# Import-time budget of a plain CLI run, which is paid on every invocation.
+
+from .test_cli_scenarios import run_cli
+
+# The modules a plain run imports are checked by name below; this budget only
+# catches gross regressions, so it leaves ample headroom over the ~40ms
+# measured when it was introduced for slow or busy CI machines.
+STARTUP_IMPORT_BUDGET_MS = 500
+
+FRAMEWORK_MODULES = ("typer", "click", "rich", "dependency_injector", "numpy")
+
+
+def import_times(*args: str, input_data: str = "\n") -> dict:
+    """
+    Runs the application with `-X importtime` and returns the cumulative time
+    of every imported module, nested imports included, with its depth.
+    """
+    process = run_cli(*args, input_data=input_data, python_args=("-X", "importtime"))
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented by two spaces per level.
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports[name.strip()] = (int(cumulative), depth)
+    return imports
+
+
+def test_plain_run_does_not_import_the_cli_framework():
+    """A plain run must not pay for Typer, the DI container or numpy."""
+    imported = import_times()
+
+    loaded_frameworks = [
+        name for name in imported if name.split(".")[0] in FRAMEWORK_MODULES
+    ]
+    assert loaded_frameworks == []
+
+
+def test_plain_run_import_time_is_within_budget():
+    """Fails when the imports of a plain run regress beyond the budget."""
+    imported = import_times()
+
+    package_import_ms = (
+        sum(
+            cumulative
+            for name, (cumulative, depth) in imported.items()
+            if name.startswith("capital_gains_calculator") and depth == 0
+        )
+        / 1000
+    )
+    assert package_import_ms < STARTUP_IMPORT_BUDGET_MS
+
+
+def test_binary_run_does_not_import_numpy():
+    """numpy is only imported by the engines and commands that use it."""
+    imported = import_times(
+        "--engine",
+        "fixed-point",
+        "--input-format",
+        "binary",
+        "--flush-bytes",
+        "1",
+        input_data="",
+    )
+
+    assert "numpy" not in imported
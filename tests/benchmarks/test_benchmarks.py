@@ -0,0 +1,63 @@
+# tests/benchmarks/test_benchmarks.py
+# Tests for the benchmark tooling itself (not performance tests).
+
+import json
+import random
+
+from benchmarks.generator import generate_lines, generate_operations, write_input
+from benchmarks.run import compare
+
+
+def test_generator_is_deterministic_for_a_seed():
+    assert list(generate_lines(7, 3, 50)) == list(generate_lines(7, 3, 50))
+    assert list(generate_lines(7, 3, 50)) != list(generate_lines(8, 3, 50))
+
+
+def test_generated_stream_never_sells_more_than_held():
+    """Also checks that the stream mixes exempt and taxable sells."""
+    # Arrange
+    operations = generate_operations(random.Random(1), 5000)
+
+    # Act
+    shares = 0
+    exempt_sells = taxable_sells = 0
+    for op in operations:
+        if op["operation"] == "buy":
+            shares += op["quantity"]
+            continue
+        shares -= op["quantity"]
+        assert shares >= 0
+        if op["unit-cost"] * op["quantity"] <= 20000:
+            exempt_sells += 1
+        else:
+            taxable_sells += 1
+
+    # Assert
+    assert exempt_sells > 100 and taxable_sells > 100
+
+
+def test_written_input_matches_generated_lines(tmp_path):
+    # Arrange
+    path = tmp_path / "input.txt"
+
+    # Act
+    write_input(path, seed=3, line_count=4, operations_per_line=20)
+
+    # Assert
+    lines = path.read_text().split("\n")
+    assert lines[:4] == list(generate_lines(3, 4, 20))
+    assert lines[4:] == ["", ""]
+    assert all(len(json.loads(line)) == 20 for line in lines[:4])
+
+
+def test_compare_reports_only_slowdowns_beyond_tolerance():
+    # Arrange
+    baseline = {"a": {"parse": 1.0, "execute": 1.0, "cli": 0.001}}
+    results = {"a": {"parse": 1.2, "execute": 1.5, "cli": 0.002}}
+
+    # Act
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    # Assert
+    assert len(regressions) == 1
+    assert regressions[0].startswith("a execute")
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.auto import AutoTaxCalculatorService
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.domain.models import Operation, PositionSnapshot
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.domain.services import TaxCalculatorService
+
+OPERATIONS = [
+    Operation(operation="buy", unit_cost=Decimal("10.00"), quantity=10000),
+    Operation(operation="sell", unit_cost=Decimal("20.00"), quantity=5000),
+    Operation(operation="sell", unit_cost=Decimal("5.00"), quantity=5000),
+]
+
+
+def _unavailable():
+    raise ImportError("missing optional dependency")
+
+
+def auto_service(thresholds, **extra_factories):
+    factories = {
+        "reference": lambda: PortfolioTaxCalculatorService(TaxCalculatorService),
+        "fixed-point": lambda: PortfolioTaxCalculatorService(
+            FixedPointTaxCalculatorService
+        ),
+        **extra_factories,
+    }
+    return AutoTaxCalculatorService(factories, thresholds)
+
+
+@pytest.mark.parametrize(
+    "operations, expected_engine",
+    [(OPERATIONS[:2], "reference"), (OPERATIONS, "fixed-point")],
+)
+def test_engine_is_picked_from_the_line_size(operations, expected_engine):
+    """Tests that a line uses the engine of the largest tier it reaches."""
+    # Arrange
+    service = auto_service([(0, "reference"), (3, "fixed-point")])
+
+    # Act
+    results = service.process(operations)
+
+    # Assert
+    assert service.engine == expected_engine
+    assert results == TaxCalculatorService().process(operations)
+
+
+def test_unavailable_engine_gives_way_to_the_smaller_tier():
+    """Tests that an engine that cannot be created is skipped."""
+    # Arrange
+    service = auto_service(
+        [(0, "fixed-point"), (1, "vectorized")], vectorized=_unavailable
+    )
+
+    # Act
+    service.process(OPERATIONS)
+
+    # Assert
+    assert service.engine == "fixed-point"
+
+
+def test_restored_positions_reach_the_picked_engine():
+    """Tests that a snapshot restored before the pick is applied to the engine."""
+    # Arrange
+    service = auto_service([(0, "fixed-point")])
+    snapshot = {None: PositionSnapshot(100, Decimal("10.00"), Decimal("0.00"))}
+
+    # Act
+    service.restore(snapshot)
+    service.process(OPERATIONS[1:2])
+
+    # Assert
+    assert service.snapshot()[None].total_shares == 100 - 5000
@@ -0,0 +1,42 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.fixed_point import divide
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.services import TaxCalculatorService
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator, expected",
+    [(10, 4, 2), (14, 4, 4), (11, 4, 3), (9, 4, 2), (-10, 4, -2), (7, 7, 1)],
+)
+def test_divide_rounds_half_to_even(numerator, denominator, expected):
+    """Tests that the integer division rounds like the Decimal context."""
+    assert divide(numerator, denominator) == expected
+
+
+def test_output_matches_reference_with_fractional_weighted_average():
+    """
+    Tests random operation streams whose weighted average cost is not a round
+    number of cents: the taxes, as written to the output, must be the same
+    as the Decimal engine's.
+    """
+    # Arrange
+    rng = random.Random(42)
+    operations = []
+    for _ in range(2000):
+        operation = rng.choice(["buy", "buy", "sell"])
+        unit_cost = Decimal(rng.randint(100, 5000)) / 100
+        operations.append(Operation(operation, unit_cost, rng.randint(1, 3000)))
+
+    # Act
+    expected = [float(r.tax) for r in TaxCalculatorService().process(operations)]
+    actual = [
+        float(r.tax) for r in FixedPointTaxCalculatorService().process(operations)
+    ]
+
+    # Assert
+    assert actual == expected
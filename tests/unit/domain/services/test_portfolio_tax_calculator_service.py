@@ -0,0 +1,122 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.domain.services import TaxCalculatorService
+
+
+def _random_operations(seed, count, tickers):
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        operation = rng.choice(["buy", "buy", "sell"])
+        unit_cost = Decimal(rng.randint(100, 5000)) / 100
+        operations.append(
+            Operation(operation, unit_cost, rng.randint(1, 3000), rng.choice(tickers))
+        )
+    return operations
+
+
+def test_interleaved_tickers_are_computed_independently():
+    """
+    Tests that every ticker keeps its own position: the results of an
+    interleaved line are those of each ticker's operations processed alone.
+    """
+    # Arrange
+    operations = _random_operations(7, 3000, ["AAA", "BBB", "CCC", None])
+
+    # Act
+    results = PortfolioTaxCalculatorService(TaxCalculatorService).process(operations)
+
+    # Assert
+    for ticker in ("AAA", "BBB", "CCC", None):
+        indices = [i for i, op in enumerate(operations) if op.ticker == ticker]
+        expected = TaxCalculatorService().process([operations[i] for i in indices])
+        assert [results[i] for i in indices] == expected
+
+
+def test_operations_without_ticker_are_unchanged():
+    """Tests that a line without tickers gives the single-stock results."""
+    # Arrange
+    operations = _random_operations(11, 500, [None])
+
+    # Act
+    results = PortfolioTaxCalculatorService(TaxCalculatorService).process(operations)
+
+    # Assert
+    assert results == TaxCalculatorService().process(operations)
+
+
+def test_iter_process_matches_process():
+    """Tests that streaming switches positions like the batch path."""
+    # Arrange
+    operations = _random_operations(3, 1000, ["AAA", "BBB"])
+
+    # Act
+    streamed = list(
+        PortfolioTaxCalculatorService(TaxCalculatorService).iter_process(operations)
+    )
+
+    # Assert
+    assert streamed == PortfolioTaxCalculatorService(TaxCalculatorService).process(
+        operations
+    )
+
+
+def test_parallel_symbols_match_sequential():
+    """Tests that computing the symbols in an executor gives the same results."""
+    # Arrange
+    operations = _random_operations(5, 2000, ["AAA", "BBB", "CCC"])
+    sequential = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService)
+
+    # Act
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = PortfolioTaxCalculatorService(
+            FixedPointTaxCalculatorService, executor=executor, parallel_threshold=1
+        )
+        # Two calls, so the second one starts from the stored positions.
+        actual = parallel.process(operations) + parallel.process(operations)
+
+    # Assert
+    assert actual == sequential.process(operations) + sequential.process(operations)
+
+
+def test_snapshot_restores_every_ticker():
+    """Tests that a resumed portfolio continues each ticker where it stopped."""
+    # Arrange
+    operations = _random_operations(13, 2000, ["AAA", "BBB", None])
+    history, new_operations = operations[:1500], operations[1500:]
+    expected = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService).process(
+        operations
+    )[1500:]
+    service = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService)
+    service.process(history)
+
+    # Act
+    resumed = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService)
+    resumed.restore(service.snapshot())
+    actual = resumed.process(new_operations)
+
+    # Assert
+    assert actual == expected
+
+
+def test_summary_adds_up_every_ticker():
+    """Tests that a summary totals the taxes and keeps each ticker's position."""
+    # Arrange
+    operations = _random_operations(17, 2000, ["AAA", "BBB", None])
+    reference = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService)
+    taxes = [result.tax for result in reference.process(operations)]
+
+    # Act
+    summary = PortfolioTaxCalculatorService(FixedPointTaxCalculatorService).summarize(
+        operations
+    )
+
+    # Assert
+    assert summary.total_tax == sum(taxes)
+    assert summary.taxable_sells == sum(1 for tax in taxes if tax)
+    assert summary.positions == reference.snapshot()
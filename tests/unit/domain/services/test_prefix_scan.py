@@ -0,0 +1,105 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.prefix_scan import (
+    chunk_taxes,
+    chunk_transition,
+    LossTransition,
+    resolve_start_states,
+    share_delta,
+)
+
+
+def random_operations(rng, count):
+    """Operations that often sell the whole position, so chunks see resets."""
+    operations = []
+    shares = 0
+    for _ in range(count):
+        unit_cost = Decimal(rng.randint(100, 5000)) / 100
+        if shares and rng.random() < 0.5:
+            quantity = shares if rng.random() < 0.3 else rng.randint(1, shares)
+            operations.append(Operation("sell", unit_cost, quantity))
+            shares -= quantity
+        else:
+            quantity = rng.randint(1, 3000)
+            operations.append(Operation("buy", unit_cost, quantity))
+            shares += quantity
+    return operations
+
+
+def scan(operations, cuts):
+    """Runs the three passes of the scan over the chunks between `cuts`."""
+    bounds = [0, *cuts, len(operations)]
+    chunks = [operations[a:b] for a, b in zip(bounds, bounds[1:])]
+    start_shares = []
+    shares = 0
+    for chunk in chunks:
+        start_shares.append(shares)
+        shares += share_delta(chunk)
+    transitions = [chunk_transition(c, s) for c, s in zip(chunks, start_shares)]
+    taxes = []
+    for chunk, state in zip(chunks, resolve_start_states(transitions)):
+        count, taxed_positions, scaled_taxes = chunk_taxes(chunk, state)
+        chunk_results = [None] * count
+        for position, tax in zip(taxed_positions, scaled_taxes):
+            chunk_results[position] = tax
+        taxes.extend(chunk_results)
+    return taxes
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_scan_matches_the_sequential_engine(seed):
+    """
+    Tests that splitting a line anywhere gives exactly the scaled taxes of
+    the fixed-point engine run over the whole line.
+    """
+    # Arrange
+    rng = random.Random(seed)
+    operations = random_operations(rng, 500)
+    cuts = sorted(rng.sample(range(1, len(operations)), rng.randint(1, 12)))
+
+    # Act
+    actual = scan(operations, cuts)
+
+    # Assert
+    expected = list(FixedPointTaxCalculatorService().iter_scaled_taxes(operations))
+    assert actual == expected
+
+
+def test_chunk_without_reset_is_replayed():
+    """Tests that a chunk that never empties the position depends on its start."""
+    # Arrange
+    operations = [
+        Operation("buy", Decimal("10.00"), 100),
+        Operation("sell", Decimal("20.00"), 50),
+    ]
+
+    # Act
+    transition = chunk_transition(operations, 10)
+
+    # Assert
+    assert transition.reset_weighted_average_cost is None
+    assert len(transition.replayed) == 2
+    assert transition.share_delta == 50
+
+
+def test_loss_transitions_compose_associatively():
+    # Arrange
+    rng = random.Random(7)
+    transitions = [
+        LossTransition(rng.randint(-1000, 1000), rng.randint(0, 500)) for _ in range(3)
+    ]
+    first, second, third = transitions
+
+    # Act
+    left = first.then(second).then(third)
+    right = first.then(second.then(third))
+
+    # Assert
+    assert left == right
+    for loss in range(0, 2000, 37):
+        assert left.apply(loss) == third.apply(second.apply(first.apply(loss)))
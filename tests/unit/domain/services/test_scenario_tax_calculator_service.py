@@ -0,0 +1,93 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.domain.services import TaxCalculatorService
+
+np = pytest.importorskip("numpy")
+
+from capital_gains_calculator.domain.scenarios import (  # noqa: E402
+    ScenarioTaxCalculatorService,
+)
+
+
+def random_template(seed, count, tickers):
+    rng = random.Random(seed)
+    return [
+        Operation(
+            rng.choice(["buy", "buy", "sell"]),
+            Decimal("0.00"),
+            rng.randint(1, 3000),
+            rng.choice(tickers),
+        )
+        for _ in range(count)
+    ]
+
+
+def random_unit_costs(seed, scenarios, count):
+    cents = np.random.default_rng(seed).integers(100, 5000, (scenarios, count))
+    return cents / 100
+
+
+def reference_taxes(template, unit_costs):
+    """Runs the Decimal engine once per scenario."""
+    taxes = []
+    for row in unit_costs.tolist():
+        operations = [
+            Operation(op.operation, Decimal(f"{cost:.2f}"), op.quantity, op.ticker)
+            for op, cost in zip(template, row)
+        ]
+        results = PortfolioTaxCalculatorService(TaxCalculatorService).process(
+            operations
+        )
+        taxes.append([float(result.tax) for result in results])
+    return np.array(taxes)
+
+
+@pytest.mark.parametrize("tickers", [[None], ["AAA", "BBB", None]])
+def test_every_scenario_matches_the_reference_engine(tickers):
+    """
+    Tests the tax matrix, including short positions and several tickers,
+    against the Decimal engine run on each price path (up to float rounding).
+    """
+    # Arrange
+    template = random_template(1, 400, tickers)
+    unit_costs = random_unit_costs(2, 50, len(template))
+
+    # Act
+    taxes = ScenarioTaxCalculatorService().process(template, unit_costs)
+
+    # Assert
+    assert taxes.shape == unit_costs.shape
+    np.testing.assert_allclose(
+        taxes, reference_taxes(template, unit_costs), rtol=1e-9, atol=1e-6
+    )
+
+
+def test_summary_totals_each_scenario():
+    """Tests that the totals are the row sums and counts of the tax matrix."""
+    # Arrange
+    template = random_template(3, 300, [None])
+    unit_costs = random_unit_costs(4, 30, len(template))
+    service = ScenarioTaxCalculatorService()
+
+    # Act
+    total_tax, taxable_sells = service.summarize(template, unit_costs)
+
+    # Assert
+    taxes = service.process(template, unit_costs)
+    np.testing.assert_allclose(total_tax, taxes.sum(axis=1))
+    assert taxable_sells.tolist() == np.count_nonzero(taxes, axis=1).tolist()
+
+
+def test_scenarios_need_one_unit_cost_per_operation():
+    """Tests that a matrix with the wrong number of columns is rejected."""
+    # Arrange
+    template = random_template(5, 10, [None])
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        ScenarioTaxCalculatorService().process(template, np.ones((3, 9)))
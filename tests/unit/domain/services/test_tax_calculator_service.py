@@ -1,11 +1,31 @@
 from decimal import Decimal
 
-# These imports will fail because the domain files have not been created yet
+import pytest
+
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
 from capital_gains_calculator.domain.models import Operation, TaxResult
 from capital_gains_calculator.domain.services import TaxCalculatorService
+from capital_gains_calculator.domain.vectorized import np
+from capital_gains_calculator.domain.vectorized import VectorizedTaxCalculatorService
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(TaxCalculatorService, id="reference"),
+        pytest.param(FixedPointTaxCalculatorService, id="fixed-point"),
+        pytest.param(
+            VectorizedTaxCalculatorService,
+            id="vectorized",
+            marks=pytest.mark.skipif(np is None, reason="numpy is not installed"),
+        ),
+    ]
+)
+def service(request):
+    """Every scenario must produce the same taxes on every engine."""
+    return request.param()
 
 
-def test_calculate_taxes_for_exempt_operations():
+def test_calculate_taxes_for_exempt_operations(service):
     """
     Tests Case #1 scenario: one purchase followed by two sales,
     all exempt from tax.
@@ -22,8 +42,6 @@ def test_calculate_taxes_for_exempt_operations():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("0.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -31,7 +49,7 @@ def test_calculate_taxes_for_exempt_operations():
     assert actual_taxes == expected_taxes
 
 
-def test_calculate_tax_for_profitable_sale_above_exemption_limit():
+def test_calculate_tax_for_profitable_sale_above_exemption_limit(service):
     """
     Tests tax calculation for a single sale with profit
     and total value above the exemption limit of 20,000 BRL.
@@ -49,8 +67,6 @@ def test_calculate_tax_for_profitable_sale_above_exemption_limit():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("10000.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -58,7 +74,7 @@ def test_calculate_tax_for_profitable_sale_above_exemption_limit():
     assert actual_taxes == expected_taxes
 
 
-def test_should_deduct_previous_losses_from_current_profit():
+def test_should_deduct_previous_losses_from_current_profit(service):
     """
     Tests deduction of accumulated losses from future profits.
     Scenario:
@@ -78,8 +94,6 @@ def test_should_deduct_previous_losses_from_current_profit():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("1000.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -87,7 +101,7 @@ def test_should_deduct_previous_losses_from_current_profit():
     assert actual_taxes == expected_taxes
 
 
-def test_wac_is_calculated_correctly_with_multiple_buys():
+def test_wac_is_calculated_correctly_with_multiple_buys(service):
     """
     Tests Weighted Average Cost (WAC) calculation with
     multiple purchases, as in Case #4.
@@ -105,8 +119,6 @@ def test_wac_is_calculated_correctly_with_multiple_buys():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("0.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -114,7 +126,7 @@ def test_wac_is_calculated_correctly_with_multiple_buys():
     assert actual_taxes == expected_taxes
 
 
-def test_scenario_with_zero_profit_sale_followed_by_profitable_sale():
+def test_scenario_with_zero_profit_sale_followed_by_profitable_sale(service):
     """
     Tests Case #5 scenario: Multiple purchases, one sale with no profit,
     and a final profitable sale, ensuring service state
@@ -133,8 +145,6 @@ def test_scenario_with_zero_profit_sale_followed_by_profitable_sale():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("10000.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -142,7 +152,7 @@ def test_scenario_with_zero_profit_sale_followed_by_profitable_sale():
     assert actual_taxes == expected_taxes
 
 
-def test_loss_from_exempt_sale_is_accumulated_and_used():
+def test_loss_from_exempt_sale_is_accumulated_and_used(service):
     """
     Tests Case #6 scenario, where a loss generated in an
     exempt sale (total value <= 20k) is accumulated and used to
@@ -167,8 +177,6 @@ def test_loss_from_exempt_sale_is_accumulated_and_used():
         TaxResult(tax=Decimal("0.00")),
         TaxResult(tax=Decimal("3000.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -176,7 +184,7 @@ def test_loss_from_exempt_sale_is_accumulated_and_used():
     assert actual_taxes == expected_taxes
 
 
-def test_full_lifecycle_with_stock_reset_from_case_7():
+def test_full_lifecycle_with_stock_reset_from_case_7(service):
     """
     Tests the full scenario of Case #7, which includes resetting the
     stock position and then starting a new buy and sell cycle,
@@ -209,8 +217,6 @@ def test_full_lifecycle_with_stock_reset_from_case_7():
         TaxResult(tax=Decimal("3700.00")),  # sell deducts loss and profits
         TaxResult(tax=Decimal("0.00")),  # sell with profit but exempt
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
@@ -218,7 +224,7 @@ def test_full_lifecycle_with_stock_reset_from_case_7():
     assert actual_taxes == expected_taxes
 
 
-def test_wac_resets_after_selling_all_shares():
+def test_wac_resets_after_selling_all_shares(service):
     """
     Tests Case #8 scenario, ensuring that the Weighted Average Cost
     resets after all shares are sold.
@@ -235,7 +241,6 @@ def test_wac_resets_after_selling_all_shares():
     ]
 
     # Process the first part
-    service = TaxCalculatorService()
     service.process(operations_part1)
 
     # Act: Process the second part, which should operate with a new WAC of 20.00
@@ -252,7 +257,7 @@ def test_wac_resets_after_selling_all_shares():
     assert actual_taxes == expected_taxes
 
 
-def test_complex_scenario_from_case_9_with_all_rules():
+def test_complex_scenario_from_case_9_with_all_rules(service):
     """
     Tests the full scenario of Case #9, which involves interaction of
     all business rules:
@@ -283,10 +288,92 @@ def test_complex_scenario_from_case_9_with_all_rules():
         TaxResult(tax=Decimal("1000.00")),
         TaxResult(tax=Decimal("2400.00")),
     ]
-    service = TaxCalculatorService()
-
     # Act
     actual_taxes = service.process(operations)
 
     # Assert
     assert actual_taxes == expected_taxes
+
+
+def test_resuming_from_a_snapshot_only_needs_the_new_operations(service):
+    """
+    Tests that a calculation restored from a snapshot, in a fresh service,
+    gives the same taxes for the new operations as replaying the history.
+    """
+    # Arrange
+    history = [
+        Operation(operation="buy", unit_cost=Decimal("10.00"), quantity=10000),
+        Operation(operation="sell", unit_cost=Decimal("2.00"), quantity=5000),
+        Operation(operation="buy", unit_cost=Decimal("20.00"), quantity=3),
+    ]
+    new_operations = [
+        Operation(operation="sell", unit_cost=Decimal("20.00"), quantity=2000),
+        Operation(operation="sell", unit_cost=Decimal("25.00"), quantity=1000),
+    ]
+    expected_taxes = type(service)().process(history + new_operations)[3:]
+    service.process(history)
+
+    # Act
+    resumed = type(service)()
+    resumed.restore(service.snapshot())
+    actual_taxes = resumed.process(new_operations)
+
+    # Assert
+    assert actual_taxes == expected_taxes
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        # Sold at exactly the weighted average cost, 29.92, for 170723.52
+        [
+            Operation(operation="buy", unit_cost=Decimal("25.07"), quantity=2853),
+            Operation(operation="buy", unit_cost=Decimal("34.77"), quantity=2853),
+            Operation(operation="sell", unit_cost=Decimal("29.92"), quantity=5706),
+        ],
+        # A profit that exactly offsets the loss accumulated before it
+        [
+            Operation(operation="buy", unit_cost=Decimal("25.07"), quantity=2853),
+            Operation(operation="buy", unit_cost=Decimal("34.77"), quantity=2853),
+            Operation(operation="sell", unit_cost=Decimal("19.92"), quantity=2853),
+            Operation(operation="sell", unit_cost=Decimal("39.92"), quantity=2853),
+        ],
+    ],
+)
+def test_sales_without_net_profit_pay_no_tax(service, operations):
+    """
+    Tests that a sale with no net profit pays no tax and counts as no taxed
+    sell, without rounding noise from the weighted average.
+    """
+    # Act
+    actual_taxes = service.process(operations)
+    summary = type(service)().summarize(operations)
+
+    # Assert
+    assert actual_taxes == [TaxResult(tax=Decimal("0.00"))] * len(operations)
+    assert summary.taxable_sells == 0
+
+
+def test_summary_matches_the_taxes_of_every_operation(service):
+    """
+    Tests that a summary gives the total and the number of taxed sells of
+    the per-operation taxes, and the position those operations end in.
+    """
+    # Arrange
+    operations = [
+        Operation(operation="buy", unit_cost=Decimal("10.00"), quantity=10000),
+        Operation(operation="sell", unit_cost=Decimal("2.00"), quantity=5000),
+        Operation(operation="sell", unit_cost=Decimal("20.00"), quantity=2000),
+        Operation(operation="buy", unit_cost=Decimal("20.00"), quantity=1000),
+        Operation(operation="sell", unit_cost=Decimal("25.00"), quantity=1000),
+    ]
+    reference = type(service)()
+    taxes = [result.tax for result in reference.process(operations)]
+
+    # Act
+    summary = service.summarize(operations)
+
+    # Assert
+    assert summary.total_tax == sum(taxes)
+    assert summary.taxable_sells == sum(1 for tax in taxes if tax)
+    assert summary.positions == {None: reference.snapshot()}
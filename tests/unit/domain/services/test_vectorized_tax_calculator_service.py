@@ -0,0 +1,118 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.services import TaxCalculatorService
+
+np = pytest.importorskip("numpy")
+
+from capital_gains_calculator.domain.vectorized import (  # noqa: E402
+    VectorizedTaxCalculatorService,
+)
+
+
+def random_operations(seed, count, sell_weight):
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        operation = "sell" if rng.random() < sell_weight else "buy"
+        unit_cost = Decimal(rng.randint(100, 5000)) / 100
+        operations.append(Operation(operation, unit_cost, rng.randint(1, 3000)))
+    return operations
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("sell_weight", [0.2, 0.5, 0.8])
+def test_taxes_match_reference_on_random_streams(seed, sell_weight):
+    """
+    Tests long random streams, including short positions that fall back to the
+    sequential path, against the Decimal engine (up to float rounding).
+    """
+    # Arrange
+    operations = random_operations(seed, 3000, sell_weight)
+
+    # Act
+    expected = [float(r.tax) for r in TaxCalculatorService().process(operations)]
+    actual = [
+        float(r.tax) for r in VectorizedTaxCalculatorService().process(operations)
+    ]
+
+    # Assert
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+def test_state_carries_over_between_batches():
+    """Tests that splitting a stream into batches does not change the taxes."""
+    # Arrange
+    operations = random_operations(7, 1000, 0.3)
+    service = VectorizedTaxCalculatorService()
+
+    # Act
+    expected = [
+        float(r.tax) for r in VectorizedTaxCalculatorService().process(operations)
+    ]
+    actual = [
+        float(r.tax)
+        for start in range(0, len(operations), 97)
+        for r in service.process(operations[start : start + 97])
+    ]
+
+    # Assert
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+def test_compute_taxes_from_columns():
+    """Tests the columnar interface with the Case #2 operations."""
+    # Arrange
+    is_sell = np.array([False, True, True])
+    unit_cost_cents = np.array([1000, 2000, 500])
+    quantity = np.array([10000, 5000, 5000])
+
+    # Act
+    taxes = VectorizedTaxCalculatorService().compute_taxes(
+        is_sell, unit_cost_cents, quantity
+    )
+
+    # Assert
+    assert taxes.tolist() == [0.0, 10000.0, 0.0]
+
+
+def test_fractions_of_a_cent_are_computed_with_decimals():
+    """Tests that a line the cents columns cannot hold matches the reference."""
+    # Arrange
+    operations = [
+        Operation("buy", Decimal("0.005"), 10**7),
+        Operation("sell", Decimal("0.0075"), 10**7),
+        Operation("buy", Decimal("10.00"), 100),
+    ]
+    service = VectorizedTaxCalculatorService()
+    reference = TaxCalculatorService()
+
+    # Act
+    actual = service.process(operations)
+
+    # Assert
+    assert actual == reference.process(operations)
+    assert service.snapshot() == reference.snapshot()
+
+
+def test_amounts_past_int64_match_reference():
+    """Tests costs whose cents times quantity do not fit in int64 columns."""
+    # Arrange
+    operations = [
+        Operation("buy", Decimal("900000.00"), 10**13),
+        Operation("sell", Decimal("1000000.00"), 10**13),
+        Operation("sell", Decimal("10.00"), 1),
+    ]
+
+    # Act
+    expected = [float(r.tax) for r in TaxCalculatorService().process(operations)]
+    actual = [
+        float(r.tax) for r in VectorizedTaxCalculatorService().process(operations)
+    ]
+
+    # Assert
+    assert actual == pytest.approx(expected, rel=1e-9)
+    assert actual[1] > 0
@@ -0,0 +1,130 @@
+import io
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.services import TaxCalculatorService
+from capital_gains_calculator.infrastructure.cli.binary_format import (
+    compute_records,
+    encode_line,
+    HEADER,
+    read_binary_lines,
+    RECORD,
+)
+from capital_gains_calculator.infrastructure.di_container import Engine
+
+
+def random_operations(seed, count):
+    rng = random.Random(seed)
+    return [
+        Operation(
+            rng.choice(["buy", "buy", "sell"]),
+            Decimal(rng.randint(100, 5000)) / 100,
+            rng.randint(1, 3000),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_lines_are_read_back_with_the_same_results():
+    # Arrange
+    lines = [random_operations(seed, 500) for seed in range(3)] + [[]]
+    stream = io.BytesIO(b"".join(encode_line(line) for line in lines))
+
+    # Act
+    results = [compute_records(records) for records in read_binary_lines(stream)]
+
+    # Assert
+    assert results == [FixedPointTaxCalculatorService().process(line) for line in lines]
+
+
+def test_records_are_fixed_width():
+    # Act
+    encoded = encode_line(
+        [
+            Operation("buy", Decimal("10.00"), 100),
+            Operation("sell", Decimal("15.5"), 50),
+        ]
+    )
+
+    # Assert
+    assert encoded == (
+        HEADER.pack(2) + RECORD.pack(0, 1000, 100) + RECORD.pack(1, 1550, 50)
+    )
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        Operation("buy", Decimal("10.001"), 100),
+        Operation("buy", Decimal("10.00"), 100, ticker="AAA"),
+        Operation("buy", Decimal("10.00"), 2**63),
+        Operation("buy", Decimal(2**62), 100),
+        Operation("buy", Decimal("10.00"), Decimal("1.5")),
+    ],
+)
+def test_operations_the_format_cannot_hold_are_rejected(operation):
+    with pytest.raises(ValueError):
+        encode_line([operation])
+
+
+def test_truncated_input_is_rejected():
+    # Arrange
+    encoded = encode_line(random_operations(0, 10))
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="Truncated"):
+        list(read_binary_lines(io.BytesIO(encoded[:-1])))
+
+
+def test_unknown_operation_codes_are_rejected():
+    # Arrange
+    encoded = HEADER.pack(2) + RECORD.pack(0, 1000, 100) + RECORD.pack(2, 1000, 100)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="operation code 2"):
+        list(read_binary_lines(io.BytesIO(encoded)))
+
+
+def test_reference_engine_computes_the_records_as_operations():
+    # Arrange
+    operations = random_operations(2, 500)
+    records = encode_line(operations)[HEADER.size :]
+
+    # Act
+    results = compute_records(records, Engine.REFERENCE)
+
+    # Assert
+    assert results == TaxCalculatorService().process(operations)
+
+
+def test_vectorized_engine_reads_the_records_as_columns():
+    # Arrange
+    pytest.importorskip("numpy")
+    from capital_gains_calculator.domain.vectorized import (
+        VectorizedTaxCalculatorService,
+    )
+
+    operations = random_operations(1, 500)
+    records = encode_line(operations)[HEADER.size :]
+
+    # Act
+    results = compute_records(records, Engine.VECTORIZED)
+
+    # Assert
+    assert results == VectorizedTaxCalculatorService().process(operations)
+
+
+def test_auto_engine_computes_the_records_like_the_engine_of_its_tier():
+    # Arrange
+    operations = random_operations(3, 500)
+    records = encode_line(operations)[HEADER.size :]
+
+    # Act
+    results = compute_records(records, Engine.AUTO)
+
+    # Assert
+    assert results == compute_records(records, Engine.FIXED_POINT)
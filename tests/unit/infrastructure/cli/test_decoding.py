@@ -0,0 +1,41 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.application.dtos import OperationDTO
+from capital_gains_calculator.infrastructure.cli.decoding import decode_operations
+from capital_gains_calculator.infrastructure.cli.processing import parse_line
+
+
+def test_operations_are_decoded_from_the_source_digits():
+    """Tests that costs keep every digit, which a float round trip would lose."""
+    # Arrange
+    line = (
+        '[{"operation":"buy", "unit-cost":10.00000000000000000001, "quantity":100},'
+        ' {"operation":"sell", "unit-cost":15, "quantity":50, "ticker":"AAA"}]'
+    )
+
+    # Act
+    operations = decode_operations(line.encode())
+
+    # Assert
+    assert operations == [
+        OperationDTO("buy", Decimal("10.00000000000000000001"), 100),
+        OperationDTO("sell", Decimal("15"), 50, "AAA"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line", ['[{"operation":"buy", "quantity":1}]', '{"operation":"buy"}', "[1]"]
+)
+def test_other_shapes_fall_back_to_the_generic_decoder(line):
+    """Tests that valid JSON of another shape is left to the generic path."""
+    assert decode_operations(line) is None
+    with pytest.raises((KeyError, TypeError)):
+        parse_line(line)
+
+
+def test_malformed_json_raises_a_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        parse_line('[{"operation":"buy", "unit-cost":10.00')
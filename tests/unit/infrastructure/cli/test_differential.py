@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+from capital_gains_calculator.application.dtos import OperationDTO, TaxResultDTO
+from capital_gains_calculator.application.use_cases import (
+    CalculateTaxesFromOperationsUseCase,
+)
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.domain.services import TaxCalculatorService
+from capital_gains_calculator.infrastructure.cli import differential
+from capital_gains_calculator.infrastructure.cli.differential import (
+    DifferentialCheck,
+    ENGINE_TOLERANCES,
+    engine_tolerance,
+)
+from capital_gains_calculator.infrastructure.di_container import Engine
+
+OPERATIONS = [
+    OperationDTO(operation="buy", unit_cost=Decimal("10.00"), quantity=10000),
+    OperationDTO(operation="sell", unit_cost=Decimal("20.00"), quantity=5000),
+]
+
+
+def reference_use_case():
+    return CalculateTaxesFromOperationsUseCase(
+        PortfolioTaxCalculatorService(TaxCalculatorService)
+    )
+
+
+def test_sampled_lines_are_compared_with_the_reference():
+    """Tests that only one line out of `every` is checked, and mismatches counted."""
+    # Arrange
+    check = DifferentialCheck(reference_use_case, every=2)
+    correct = reference_use_case().execute(OPERATIONS)
+    wrong = [correct[0], TaxResultDTO(tax=Decimal("10000.01"))]
+
+    # Act
+    for results in (correct, wrong, wrong, correct, wrong):
+        check.check(OPERATIONS, results)
+
+    # Assert
+    assert check.stats.to_dict() == {
+        "lines": 5,
+        "checked": 3,
+        "mismatches": 2,
+        "mismatched_lines": [3, 5],
+    }
+
+
+def test_any_byte_difference_is_a_mismatch():
+    """Tests that without a tolerance the output must be byte-identical."""
+    # Arrange
+    check = DifferentialCheck(reference_use_case, every=1)
+    correct = reference_use_case().execute(OPERATIONS)
+    rounded = [correct[0], TaxResultDTO(tax=correct[1].tax + Decimal("1e-9"))]
+
+    # Act
+    check.check(OPERATIONS, rounded)
+
+    # Assert
+    assert check.stats.mismatches == 1
+
+
+def test_float_rounding_is_accepted_with_a_tolerance():
+    """Tests that an engine with a tolerance may differ in the last digits."""
+    # Arrange
+    check = DifferentialCheck(
+        reference_use_case, every=1, tolerance=ENGINE_TOLERANCES[Engine.VECTORIZED]
+    )
+    correct = reference_use_case().execute(OPERATIONS)
+    rounded = [correct[0], TaxResultDTO(tax=correct[1].tax + Decimal("1e-9"))]
+    wrong = [correct[0], TaxResultDTO(tax=correct[1].tax + Decimal("0.01"))]
+
+    # Act
+    check.check(OPERATIONS, rounded)
+    check.check(OPERATIONS, wrong)
+
+    # Assert
+    assert check.stats.mismatches == 1
+
+
+def test_a_tax_on_an_untaxed_sale_is_a_mismatch_with_a_tolerance():
+    """Tests that the tolerance never hides a tax the reference does not charge."""
+    # Arrange
+    check = DifferentialCheck(
+        reference_use_case, every=1, tolerance=ENGINE_TOLERANCES[Engine.VECTORIZED]
+    )
+    correct = reference_use_case().execute(OPERATIONS)
+    taxed_buy = [TaxResultDTO(tax=Decimal("1e-7")), correct[1]]
+
+    # Act
+    check.check(OPERATIONS, taxed_buy)
+
+    # Assert
+    assert check.stats.mismatches == 1
+
+
+def test_auto_engine_gets_the_tolerance_of_its_tiers(monkeypatch):
+    """Tests that auto is compared as floats only when a tier may pick a float engine."""
+    # Arrange
+    fixed_point_only = ((0, Engine.FIXED_POINT.value),)
+    with_vectorized = fixed_point_only + ((1000, Engine.VECTORIZED.value),)
+
+    # Act
+    monkeypatch.setattr(differential, "AUTO_ENGINE_THRESHOLDS", fixed_point_only)
+    exact = engine_tolerance(Engine.AUTO)
+    monkeypatch.setattr(differential, "AUTO_ENGINE_THRESHOLDS", with_vectorized)
+    tolerant = engine_tolerance(Engine.AUTO)
+
+    # Assert
+    assert exact is None
+    assert tolerant == ENGINE_TOLERANCES[Engine.VECTORIZED]
@@ -0,0 +1,53 @@
+import io
+import json
+from decimal import Decimal
+
+from capital_gains_calculator.application.dtos import TaxResultDTO
+from capital_gains_calculator.domain.services import ZERO_TAX
+from capital_gains_calculator.infrastructure.cli.encoding import (
+    encode_results,
+    OutputEncoder,
+)
+
+
+def test_output_is_byte_identical_to_json_dumps():
+    """Tests the encoding of shared zeros, repeated and fractional taxes."""
+    # Arrange
+    results = [
+        ZERO_TAX,
+        TaxResultDTO(tax=Decimal("0.00")),
+        TaxResultDTO(tax=Decimal("1000.00")),
+        TaxResultDTO(tax=Decimal("1000.00")),
+        TaxResultDTO(tax=Decimal("0.123456789012345678901234567")),
+    ]
+    expected = json.dumps([{"tax": float(result.tax)} for result in results])
+
+    # Act & Assert
+    assert encode_results(results) == expected.encode()
+    assert encode_results([]) == b"[]"
+
+
+def test_lines_are_written_in_batches():
+    # Arrange
+    out = io.BytesIO()
+    encoder = OutputEncoder(out, flush_bytes=64)
+
+    # Act
+    encoder.write_results([ZERO_TAX])
+    buffered = out.getvalue()
+    for _ in range(5):
+        encoder.write_output("[]")
+    with encoder:
+        encoder.write_results([ZERO_TAX])
+
+    # Assert
+    assert buffered == b""
+    assert out.getvalue() == b'[{"tax": 0.0}]\n' + b"[]\n" * 5 + b'[{"tax": 0.0}]\n'
+
+
+def test_every_line_is_written_at_once_without_batching():
+    out = io.BytesIO()
+
+    OutputEncoder(out, flush_bytes=0).write_output("[]")
+
+    assert out.getvalue() == b"[]\n"
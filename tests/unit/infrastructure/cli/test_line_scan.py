@@ -0,0 +1,84 @@
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from capital_gains_calculator.domain.fixed_point import FixedPointTaxCalculatorService
+from capital_gains_calculator.infrastructure.cli.line_scan import (
+    LineScanner,
+    share_delta_task,
+    split_operations,
+)
+from capital_gains_calculator.infrastructure.cli.processing import parse_line
+
+
+def random_line(rng, count):
+    operations = []
+    shares = 0
+    for _ in range(count):
+        unit_cost = rng.randint(100, 5000) / 100
+        if shares and rng.random() < 0.5:
+            quantity = shares if rng.random() < 0.3 else rng.randint(1, shares)
+            operations.append(
+                {"operation": "sell", "unit-cost": unit_cost, "quantity": quantity}
+            )
+            shares -= quantity
+        else:
+            quantity = rng.randint(1, 3000)
+            operations.append(
+                {"operation": "buy", "unit-cost": unit_cost, "quantity": quantity}
+            )
+            shares += quantity
+    return json.dumps(operations).encode()
+
+
+LINE = random_line(random.Random(3), 2000)
+
+
+def test_slices_hold_whole_operations():
+    # Act
+    chunks = split_operations(LINE, 1000)
+
+    # Assert
+    assert len(chunks) > 1
+    assert parse_line(b"[" + b",".join(chunks) + b"]") == parse_line(LINE)
+
+
+def test_share_delta_reads_the_slice_without_decoding_it():
+    """Tests that the byte-level first pass agrees with the decoded operations."""
+    # Arrange
+    chunk = b'{"operation": "buy", "unit-cost": 10.00, "quantity": 100},' + (
+        b'{"quantity": 40, "operation": "sell", "unit-cost": 20.00}'
+    )
+
+    # Act
+    delta = share_delta_task(chunk)
+
+    # Assert
+    assert delta == 60
+
+
+def test_scanned_line_matches_the_sequential_engine():
+    # Act
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = LineScanner(executor, chunk_bytes=1000).process(LINE)
+
+    # Assert
+    expected = FixedPointTaxCalculatorService().process(parse_line(LINE))
+    assert results == expected
+
+
+def test_short_and_tickered_lines_are_not_scanned():
+    # Arrange
+    tickered = b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 100, ' + (
+        b'"ticker": "AAA"}' + b" " * 100 + b"]"
+    )
+
+    # Act
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scanner = LineScanner(executor, chunk_bytes=10)
+        short = LineScanner(executor).process(LINE)
+        with_ticker = scanner.process(tickered)
+
+    # Assert
+    assert short is None
+    assert with_ticker is None
@@ -0,0 +1,55 @@
+import pytest
+
+from capital_gains_calculator.infrastructure.cli.mapped_input import (
+    iter_mapped_lines,
+    map_file,
+    read_range,
+    split_byte_ranges,
+)
+
+
+@pytest.mark.parametrize("range_bytes", [1, 5, 11, 1024])
+def test_ranges_end_at_newlines_and_cover_the_buffer(range_bytes):
+    """Tests that no line is cut in two, whatever the range size."""
+    # Arrange
+    buffer = b"[1]\n[22,2]\n[333]\n\n[4]"
+
+    # Act
+    ranges = list(split_byte_ranges(buffer, range_bytes))
+
+    # Assert
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(buffer)
+    assert all(
+        end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:])
+    )
+    assert all(buffer[end - 1 : end] == b"\n" for _, end in ranges[:-1])
+
+
+def test_range_reading_stops_at_the_first_empty_line():
+    # Arrange
+    buffer = b" [1] \n[2]\r\n  \n[3]\n"
+
+    # Act
+    lines, ended = read_range(buffer, 0, len(buffer))
+
+    # Assert
+    assert (lines, ended) == ([b"[1]", b"[2]"], True)
+    assert read_range(buffer, 0, 11) == ([b"[1]", b"[2]"], False)
+
+
+def test_mapped_file_lines_match_the_text_reader(tmp_path):
+    # Arrange
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"[1]\n[2]\n[3]")
+    empty_path = tmp_path / "empty.txt"
+    empty_path.write_bytes(b"")
+
+    # Act
+    with map_file(path) as buffer:
+        lines = list(iter_mapped_lines(buffer))
+    with map_file(empty_path) as buffer:
+        empty_lines = list(iter_mapped_lines(buffer))
+
+    # Assert
+    assert lines == [b"[1]", b"[2]", b"[3]"]
+    assert empty_lines == []
@@ -0,0 +1,62 @@
+import pytest
+
+from capital_gains_calculator.infrastructure.cli.modes import (
+    MODES,
+    OPTION_REQUIREMENTS,
+    select_mode,
+)
+from capital_gains_calculator.infrastructure.di_container import Engine
+
+
+@pytest.mark.parametrize(
+    "options, mode",
+    [
+        ([], None),
+        (["--input", "--pipeline", "--results-file"], None),
+        (["--stream", "--summary"], "--stream"),
+        (["--summary", "--pipeline"], "--summary"),
+        (["--resume-from", "--save-state"], "--resume-from"),
+        (["--workers", "--chunk-size", "--input"], "--workers"),
+    ],
+)
+def test_supported_options_select_their_mode(options, mode):
+    """Tests that a run is in the first mode given, with its supported options."""
+    assert select_mode(options, Engine.REFERENCE).option == mode
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        (["--stream", "--ticker-workers"], "--ticker-workers cannot be combined"),
+        (["--summary", "--ticker-workers"], "--ticker-workers cannot be combined"),
+        (["--stream", "--flush-bytes"], "--flush-bytes cannot be combined"),
+        (["--pipeline-stats"], "--pipeline-stats requires --pipeline"),
+        (["--cache-stats"], "--cache-stats requires --cache-size"),
+        (["--prefix-cache-stats"], "--prefix-cache-stats requires"),
+        (["--workers", "--stream"], "--workers cannot be combined with --stream"),
+    ],
+)
+def test_unsupported_options_are_rejected(options, message):
+    """Tests that options a mode would ignore raise instead."""
+    with pytest.raises(ValueError, match=message):
+        select_mode(options, Engine.REFERENCE)
+
+
+def test_engines_are_checked_against_the_mode():
+    """Tests that a mode restricted to some engines rejects the others."""
+    with pytest.raises(ValueError, match="--engine reference cannot be combined"):
+        select_mode(["--scan-workers"], Engine.REFERENCE)
+
+    assert select_mode(["--scan-workers"], Engine.FIXED_POINT).option == (
+        "--scan-workers"
+    )
+
+
+def test_every_tuning_option_is_supported_with_the_option_it_tunes():
+    """Tests that the table is consistent: a tuning option is never orphaned."""
+    for option, required in OPTION_REQUIREMENTS.items():
+        assert any(
+            option in mode.options
+            for mode in MODES
+            if required in mode.options or required == mode.option
+        )
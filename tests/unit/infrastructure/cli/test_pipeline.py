@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+
+from capital_gains_calculator.infrastructure.cli.pipeline import (
+    LinePipeline,
+    MAX_BATCH_LINES,
+)
+
+
+def test_outputs_are_written_in_input_order():
+    # Arrange
+    pipeline = LinePipeline(input_depth=2, output_depth=2)
+    written = []
+
+    # Act
+    pipeline.run(range(1000), lambda line: line * 2, written.append)
+
+    # Assert
+    assert written == [line * 2 for line in range(1000)]
+    assert pipeline.stats.lines == 1000
+    assert pipeline.stats.input_queue_max_depth <= 2
+
+
+def test_reading_waits_while_the_writer_falls_behind():
+    """
+    Tests the backpressure: the reader never runs further ahead of the
+    writer than the queues (and the batch being built) can hold.
+    """
+    # Arrange
+    pipeline = LinePipeline(input_depth=1, output_depth=1)
+    read = []
+    lead = []
+
+    def lines():
+        for line in itertools.count():
+            if line == 2000:
+                return
+            read.append(line)
+            yield line
+
+    # Act
+    pipeline.run(lines(), lambda line: line, lambda line: lead.append(len(read) - line))
+
+    # Assert
+    assert max(lead) <= 5 * MAX_BATCH_LINES
+
+
+def test_outputs_before_an_error_are_written_and_the_error_is_raised():
+    # Arrange
+    written = []
+
+    def compute(line):
+        if line == 3:
+            raise ValueError("malformed line")
+        return line
+
+    # Act
+    with pytest.raises(ValueError, match="malformed line"):
+        LinePipeline(input_depth=1, output_depth=1).run(
+            iter([0, 1, 2, 3, 4]), compute, written.append
+        )
+
+    # Assert
+    assert written == [0, 1, 2]
@@ -0,0 +1,76 @@
+import json
+from decimal import Decimal
+
+from capital_gains_calculator.application.dtos import (
+    PositionSnapshotDTO,
+    TaxSummaryDTO,
+)
+from capital_gains_calculator.application.use_cases import (
+    CalculateTaxesFromOperationsUseCase,
+)
+from capital_gains_calculator.domain.portfolio import PortfolioTaxCalculatorService
+from capital_gains_calculator.domain.services import TaxCalculatorService
+from capital_gains_calculator.infrastructure.cli.processing import (
+    format_summary,
+    parse_line,
+    process_line_from_prefix,
+)
+from capital_gains_calculator.infrastructure.prefix_cache import PrefixStateCache
+
+
+def new_use_case():
+    return CalculateTaxesFromOperationsUseCase(
+        PortfolioTaxCalculatorService(TaxCalculatorService)
+    )
+
+
+def test_summary_inlines_the_position_without_ticker():
+    """Tests that only the stocks with a ticker are listed under "positions"."""
+    # Arrange
+    summary = TaxSummaryDTO(
+        total_tax=Decimal("3400.00"),
+        taxable_sells=2,
+        positions={
+            None: PositionSnapshotDTO(5, Decimal("16.67"), Decimal("0.00")),
+            "AAA": PositionSnapshotDTO(0, Decimal("10.00"), Decimal("250.50")),
+        },
+    )
+
+    # Act
+    record = json.loads(format_summary(summary))
+
+    # Assert
+    assert record == {
+        "total-tax": 3400.0,
+        "taxable-sells": 2,
+        "total-shares": 5,
+        "weighted-average-cost": 16.67,
+        "accumulated-loss": 0.0,
+        "positions": {
+            "AAA": {
+                "total-shares": 0,
+                "weighted-average-cost": 10.0,
+                "accumulated-loss": 250.5,
+            }
+        },
+    }
+
+
+def test_line_resumed_from_a_prefix_has_the_results_of_the_whole_line():
+    # Arrange
+    cache = PrefixStateCache(checkpoint_bytes=50)
+    base = [
+        {"operation": "buy", "unit-cost": 10.00, "quantity": 10000},
+        {"operation": "sell", "unit-cost": 20.00, "quantity": 5000},
+        {"operation": "buy", "unit-cost": 25.00, "quantity": 5000},
+        {"operation": "sell", "unit-cost": 5.00, "quantity": 2000},
+    ]
+    tail = [{"operation": "sell", "unit-cost": 30.00, "quantity": 8000}]
+    lines = [json.dumps(base), json.dumps(base + tail)]
+
+    # Act
+    results = [process_line_from_prefix(line, new_use_case, cache) for line in lines]
+
+    # Assert
+    assert results == [new_use_case().execute(parse_line(line)) for line in lines]
+    assert cache.stats.hit_depths == {4: 1}
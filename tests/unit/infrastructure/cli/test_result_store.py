@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.application.dtos import TaxResultDTO
+from capital_gains_calculator.domain.services import ZERO_TAX
+from capital_gains_calculator.infrastructure.cli.result_store import (
+    index_path,
+    IndexedOutputEncoder,
+    parse_line_ranges,
+    ResultStore,
+    totals_path,
+)
+
+LINES = [
+    [ZERO_TAX, TaxResultDTO(tax=Decimal("10000.00")), ZERO_TAX],
+    [],
+    [TaxResultDTO(tax=Decimal("1000.00")), TaxResultDTO(tax=Decimal("2400.00"))],
+]
+
+
+def write_store(path, totals=True):
+    with open(path, "wb") as out, open(index_path(path), "wb") as index_out:
+        totals_out = open(totals_path(path), "wb") if totals else None
+        # Small batches, so lines are indexed across several flushes.
+        encoder = IndexedOutputEncoder(out, index_out, totals_out, flush_bytes=10)
+        with encoder:
+            encoder.write_results(LINES[0])
+            encoder.write_output("[]")  # Already formatted, as from the worker pool
+            encoder.write_results(iter(LINES[2]))
+        if totals_out is not None:
+            totals_out.close()
+
+
+def test_any_line_or_range_is_read_through_the_index(tmp_path):
+    # Arrange
+    path = tmp_path / "results.jsonl"
+    write_store(path)
+    lines = path.read_bytes().splitlines(keepends=True)
+
+    # Act
+    with ResultStore(path) as store:
+        count = len(store)
+        last = store.read_lines(3, 3)
+        middle = store.read_lines(2, 3)
+
+    # Assert
+    assert count == 3
+    assert last == lines[2] == b'[{"tax": 1000.0}, {"tax": 2400.0}]\n'
+    assert middle == lines[1] + lines[2]
+
+
+def test_totals_are_kept_per_line(tmp_path):
+    # Arrange
+    path = tmp_path / "results.jsonl"
+    write_store(path)
+
+    # Act
+    with ResultStore(path) as store:
+        totals = [store.read_totals(line) for line in range(1, 4)]
+
+    # Assert
+    assert totals == [(10000.0, 1), (0.0, 0), (3400.0, 2)]
+
+
+def test_lines_out_of_range_and_missing_totals_are_rejected(tmp_path):
+    # Arrange
+    path = tmp_path / "results.jsonl"
+    write_store(path, totals=False)
+
+    # Act / Assert
+    with ResultStore(path) as store:
+        with pytest.raises(ValueError, match="out of range"):
+            store.read_lines(2, 4)
+        with pytest.raises(ValueError, match="no totals"):
+            store.read_totals(1)
+
+
+def test_line_ranges_are_parsed():
+    assert parse_line_ranges(["7", "10-20"]) == [(7, 7), (10, 20)]
+    for spec in ["0", "5-3", "a"]:
+        with pytest.raises(ValueError):
+            parse_line_ranges([spec])
@@ -0,0 +1,85 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from capital_gains_calculator.application.dtos import TaxResultDTO
+from capital_gains_calculator.infrastructure.cli.streaming import (
+    JsonArrayLineReader,
+    write_streamed_output,
+)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 64 * 1024])
+def test_reader_yields_the_elements_of_each_line(block_size):
+    """
+    Tests that lines are split into their elements regardless of how the
+    blocks read from the stream cut through them, and that reading stops at
+    the first empty line.
+    """
+    # Arrange
+    lines = [
+        '[{"operation":"buy", "unit-cost":10.00, "quantity":100}]',
+        "[]",
+        '[{"operation":"buy", "unit-cost":10.00, "quantity":100},'
+        ' {"operation":"sell", "unit-cost":15.50, "quantity":50}]',
+    ]
+    stream = io.StringIO("\n".join(lines) + "\n\n" + "[{}]\n")
+
+    # Act
+    actual = [list(ops) for ops in JsonArrayLineReader(stream, block_size)]
+
+    # Assert
+    assert actual == [json.loads(line, parse_float=Decimal) for line in lines]
+
+
+def test_reader_decodes_fractions_from_their_digits():
+    """Tests that costs keep their source digits instead of a float's."""
+    # Arrange
+    stream = io.StringIO('[{"unit-cost": 0.1, "quantity": 3}]\n')
+
+    # Act
+    (operations,) = [list(ops) for ops in JsonArrayLineReader(stream)]
+
+    # Assert
+    assert operations == [{"unit-cost": Decimal("0.1"), "quantity": 3}]
+    assert str(operations[0]["unit-cost"]) == "0.1"
+
+
+def test_reader_skips_elements_left_unconsumed():
+    """Tests that a partially consumed line does not leak into the next one."""
+    # Arrange
+    stream = io.StringIO('[{"a": 1}, {"a": 2}]\n[{"a": 3}]\n')
+
+    # Act
+    first_elements = [next(iter(ops)) for ops in JsonArrayLineReader(stream, 4)]
+
+    # Assert
+    assert first_elements == [{"a": 1}, {"a": 3}]
+
+
+@pytest.mark.parametrize("line", ['{"a": 1}', '[{"a": 1} {"a": 2}]', '[{"a": 1'])
+def test_reader_rejects_malformed_lines(line):
+    """Tests that malformed input raises instead of being silently dropped."""
+    # Arrange
+    stream = io.StringIO(line + "\n")
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        for ops in JsonArrayLineReader(stream, 2):
+            list(ops)
+
+
+@pytest.mark.parametrize("taxes", [[], ["0.00"], ["0.00", "1000.00", "2400.50"]])
+def test_streamed_output_matches_json_dumps(taxes):
+    """Tests that the streamed output is byte-identical to the regular output."""
+    # Arrange
+    results = (TaxResultDTO(tax=tax) for tax in taxes)
+    out = io.StringIO()
+
+    # Act
+    write_streamed_output(results, out)
+
+    # Assert
+    assert out.getvalue() == json.dumps([{"tax": float(tax)} for tax in taxes]) + "\n"
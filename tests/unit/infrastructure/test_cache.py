@@ -0,0 +1,94 @@
+from capital_gains_calculator.infrastructure.cache import LineResultCache
+
+
+def test_key_ignores_whitespace_differences():
+    """Tests that lines differing only in whitespace share a cache entry."""
+    cache = LineResultCache()
+
+    assert cache.key('[{"operation":"buy", "quantity":1}]') == cache.key(
+        ' [{"operation": "buy","quantity": 1}] '
+    )
+    assert cache.key("[1]") != LineResultCache(namespace="other").key("[1]")
+
+
+def test_whitespace_inside_strings_is_kept():
+    """Tests that tickers differing only in spaces do not share an entry."""
+    cache = LineResultCache()
+
+    assert cache.key('[{"ticker": "A B"}]') != cache.key('[{"ticker": "AB"}]')
+    assert cache.key('[{"ticker": "A\\" B"}]') != cache.key('[{"ticker": "A\\"B"}]')
+    assert cache.key('[{"ticker": "A\\" B"} ]') == cache.key('[{"ticker":"A\\" B"}]')
+
+
+def test_hits_and_misses_are_counted():
+    # Arrange
+    cache = LineResultCache()
+    key = cache.key("[1]")
+
+    # Act
+    first = cache.get(key)
+    cache.put(key, "[]")
+    second = cache.get(key)
+
+    # Assert
+    assert (first, second) == (None, "[]")
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    # Arrange
+    cache = LineResultCache(max_entries=2)
+    keys = [cache.key(f"[{i}]") for i in range(3)]
+
+    # Act
+    cache.put(keys[0], "a")
+    cache.put(keys[1], "b")
+    cache.get(keys[0])
+    cache.put(keys[2], "c")
+
+    # Assert
+    assert [cache.get(key) for key in keys] == ["a", None, "c"]
+    assert (cache.stats.entries, cache.stats.evictions) == (2, 1)
+
+
+def test_entries_are_evicted_by_memory():
+    # Arrange
+    cache = LineResultCache(max_bytes=1000)
+
+    # Act
+    for i in range(10):
+        cache.put(cache.key(f"[{i}]"), "x" * 300)
+
+    # Assert
+    assert cache.stats.bytes <= 1000
+    assert cache.stats.entries == 2
+    assert cache.stats.evictions == 8
+
+
+def test_entries_persist_to_file(tmp_path):
+    # Arrange
+    path = tmp_path / "cache.tsv"
+    cache = LineResultCache(path=path)
+    cache.put(cache.key("[1]"), '[{"tax": 0.0}]')
+    cache.put(cache.key("[2]"), '[{"tax": 10.0}]')
+
+    # Act
+    cache.save()
+    warm_cache = LineResultCache(max_entries=1, path=path)
+
+    # Assert
+    assert warm_cache.get(warm_cache.key("[1]")) is None
+    assert warm_cache.get(warm_cache.key("[2]")) == '[{"tax": 10.0}]'
+
+
+def test_cache_file_of_another_version_is_ignored(tmp_path):
+    # Arrange
+    path = tmp_path / "cache.tsv"
+    key = LineResultCache().key("[1]")
+    path.write_text(f'{key.hex()}\t[{{"tax": 99.0}}]\n')  # No version header
+
+    # Act
+    cache = LineResultCache(path=path)
+
+    # Assert
+    assert cache.get(key) is None
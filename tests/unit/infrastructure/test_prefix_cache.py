@@ -0,0 +1,71 @@
+import json
+
+from capital_gains_calculator.application.dtos import PositionSnapshotDTO
+from capital_gains_calculator.infrastructure.prefix_cache import (
+    PrefixEntry,
+    PrefixStateCache,
+)
+
+
+def line_of(*quantities):
+    return json.dumps(
+        [
+            {"operation": "buy", "unit-cost": 10.00, "quantity": quantity}
+            for quantity in quantities
+        ]
+    ).encode()
+
+
+def entries_for(checkpoints):
+    return [
+        PrefixEntry({None: PositionSnapshotDTO(checkpoint.operations)}, ())
+        for checkpoint in checkpoints
+    ]
+
+
+def test_lines_with_a_common_prefix_share_its_checkpoints():
+    # Arrange
+    cache = PrefixStateCache(checkpoint_bytes=1)
+
+    # Act
+    first = cache.checkpoints(line_of(1, 2, 3, 4, 5, 6))
+    second = cache.checkpoints(line_of(1, 2, 3, 4, 9, 9))
+
+    # Assert
+    assert [c.operations for c in first] == [1, 2, 3, 4, 5, 6]
+    assert first[:4] == second[:4]
+    assert first[4].key != second[4].key
+
+
+def test_hit_depth_is_reported():
+    # Arrange
+    cache = PrefixStateCache(checkpoint_bytes=1)
+    first = cache.checkpoints(line_of(1, 2, 3, 4))
+    second = cache.checkpoints(line_of(1, 2, 3, 9))
+
+    # Act
+    missed = cache.resume(first)
+    cache.record(first, entries_for(first))
+    resumed = cache.resume(second)
+
+    # Assert
+    assert missed == []
+    assert resumed == entries_for(first[:3])
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.operations_reused == 3
+    assert cache.stats.hit_depths == {3: 1}
+
+
+def test_deepest_checkpoints_are_evicted_first():
+    """Tests that eviction keeps the shared start of the lines resumable."""
+    # Arrange
+    cache = PrefixStateCache(max_entries=3, checkpoint_bytes=1)
+    checkpoints = cache.checkpoints(line_of(1, 2, 3, 4, 5))
+
+    # Act
+    cache.record(checkpoints, entries_for(checkpoints))
+    resumed = cache.resume(checkpoints)
+
+    # Assert
+    assert resumed == entries_for(checkpoints[:3])
+    assert (cache.stats.entries, cache.stats.evictions) == (3, 2)
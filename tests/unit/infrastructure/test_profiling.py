@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from capital_gains_calculator.domain.models import Operation
+from capital_gains_calculator.domain.services import TaxCalculatorService
+from capital_gains_calculator.infrastructure.profiling import (
+    STAGES,
+    StageProfiler,
+    TimedTaxCalculator,
+)
+
+
+def test_report_counts_lines_and_latency_percentiles():
+    # Arrange
+    profiler = StageProfiler()
+    for latency in range(1, 101):
+        profiler.add_line(operations=2, latency_seconds=latency / 1000)
+    profiler.add("parse", 0.5, 0.25)
+
+    # Act
+    report = profiler.report()
+
+    # Assert
+    assert (report["lines"], report["operations"]) == (100, 200)
+    assert report["line_latency_seconds"] == {"p50": 0.05, "p99": 0.099}
+    assert report["stages"]["parse"] == {"wall_seconds": 0.5, "cpu_seconds": 0.25}
+    assert set(report["stages"]) == set(STAGES)
+
+
+def test_timed_tax_calculator_charges_the_compute_stage():
+    # Arrange
+    profiler = StageProfiler()
+    calculator = TimedTaxCalculator(TaxCalculatorService(), profiler)
+    operations = [Operation("buy", Decimal("10.00"), 100)] * 1000
+
+    # Act
+    results = calculator.process(operations)
+
+    # Assert
+    assert len(results) == 1000
+    assert profiler.wall_seconds["compute"] > 0
@@ -0,0 +1,52 @@
+import asyncio
+
+from capital_gains_calculator.infrastructure.di_container import Engine
+from capital_gains_calculator.infrastructure.server import (
+    MAX_PIPELINED_REQUESTS,
+    TaxServer,
+)
+
+
+class DisconnectedWriter:
+    """Stream writer of a client that went away: every drain fails."""
+
+    def __init__(self):
+        self.closed = False
+
+    def write(self, data: bytes):
+        pass
+
+    async def drain(self):
+        raise ConnectionResetError("Connection lost")
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+def test_client_disconnect_ends_the_connection(monkeypatch):
+    """Tests that a failed reply stops the reader instead of blocking it."""
+
+    # Arrange
+    def submit(self, line):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(("[]",))
+        return future
+
+    monkeypatch.setattr(TaxServer, "_submit", submit)
+    server = TaxServer(Engine.FIXED_POINT, workers=1)
+    writer = DisconnectedWriter()
+
+    async def handle():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"[]\n" * (MAX_PIPELINED_REQUESTS * 4))
+        reader.feed_eof()
+        await asyncio.wait_for(server._handle_connection(reader, writer), 5)
+
+    # Act
+    asyncio.run(handle())
+
+    # Assert
+    assert writer.closed
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from capital_gains_calculator.domain.models import PositionSnapshot
+from capital_gains_calculator.infrastructure.sessions import (
+    format_session_state,
+    parse_session_state,
+    read_session_states,
+    write_session_states,
+)
+
+
+def test_state_round_trips_exactly():
+    """Tests that amounts keep every digit through the file format."""
+    state = {
+        None: PositionSnapshot(
+            5, Decimal("10.3333333333333333333333333333"), Decimal(0)
+        ),
+        "AAA": PositionSnapshot(0, Decimal("0.00"), Decimal("1234.56")),
+    }
+
+    assert parse_session_state(format_session_state(state)) == state
+
+
+def test_states_are_written_one_line_each(tmp_path):
+    # Arrange
+    path = tmp_path / "state.jsonl"
+    states = [{None: PositionSnapshot()}, {"AAA": PositionSnapshot(1)}]
+
+    # Act
+    write_session_states(path, states)
+
+    # Assert
+    assert len(path.read_text().splitlines()) == 2
+    assert list(read_session_states(path)) == states